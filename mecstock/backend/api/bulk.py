@@ -0,0 +1,103 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from core.versioning import bump_version
+
+MAX_BULK_ROWS = 1000
+
+
+class BulkMixin:
+    """
+    Adiciona ``POST <recurso>/bulk/`` a um ModelViewSet.
+
+    O corpo é ``{"upserts": [...], "deletes": [ids]}``. Linhas de ``upserts`` com a
+    chave primária são atualizações parciais; sem ela, são criações. Todas as linhas
+    são validadas antes de qualquer escrita: se alguma falhar, nada é gravado e a
+    resposta 400 traz o resultado de cada linha. Caso contrário tudo é aplicado em uma
+    transação com bulk_create, bulk_update e um único DELETE.
+    """
+
+    def bulk_created(self, objs):
+        """Chamado dentro da transação com os objetos recém-criados; as subclasses podem sobrescrever."""
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        upserts = request.data.get('upserts', [])
+        deletes = request.data.get('deletes', [])
+        if not isinstance(upserts, list) or not isinstance(deletes, list):
+            return Response({"error": "upserts e deletes devem ser listas"}, status=status.HTTP_400_BAD_REQUEST)
+        if not all(isinstance(row, dict) for row in upserts):
+            return Response({"error": "Cada item de upserts deve ser um objeto"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(upserts) + len(deletes) > MAX_BULK_ROWS:
+            return Response(
+                {"error": f"No máximo {MAX_BULK_ROWS} linhas por requisição"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        model = self.get_queryset().model
+        pk_name = model._meta.pk.name
+        try:
+            deletes = [model._meta.pk.to_python(pk) for pk in deletes]
+            upsert_pks = [model._meta.pk.to_python(row.get(pk_name)) for row in upserts]
+        except DjangoValidationError:
+            return Response({"error": "IDs inválidos em upserts ou deletes"}, status=status.HTTP_400_BAD_REQUEST)
+        existing = model.objects.in_bulk([pk for pk in upsert_pks if pk is not None])
+
+        auto_now_fields = [field for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        results, to_create, to_update, update_fields = [], [], [], set()
+        for index, (row, pk) in enumerate(zip(upserts, upsert_pks)):
+            instance = existing.get(pk) if pk is not None else None
+            if pk is not None and instance is None:
+                results.append({"index": index, "op": "update", "id": pk, "status": "error",
+                                "errors": {pk_name: ["Registro não encontrado."]}})
+                continue
+
+            serializer = self.get_serializer(instance, data=row, partial=instance is not None)
+            if not serializer.is_valid():
+                results.append({"index": index, "op": "update" if instance else "create", "id": pk,
+                                "status": "error", "errors": serializer.errors})
+                continue
+
+            if instance is None:
+                to_create.append((index, model(**serializer.validated_data)))
+                results.append({"index": index, "op": "create", "id": None, "status": "ok"})
+            else:
+                for field, value in serializer.validated_data.items():
+                    setattr(instance, field, value)
+                update_fields.update(serializer.validated_data)
+                # bulk_update não chama pre_save, então campos auto_now precisam ser preenchidos aqui
+                for field in auto_now_fields:
+                    field.pre_save(instance, add=False)
+                    update_fields.add(field.name)
+                to_update.append(instance)
+                results.append({"index": index, "op": "update", "id": pk, "status": "ok"})
+
+        delete_ids = set(model.objects.filter(pk__in=deletes).values_list('pk', flat=True))
+        for pk in deletes:
+            found = pk in delete_ids
+            results.append({"op": "delete", "id": pk, "status": "ok" if found else "error",
+                            **({} if found else {"errors": {pk_name: ["Registro não encontrado."]}})})
+
+        if any(result["status"] == "error" for result in results):
+            return Response({"applied": False, "results": results}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with transaction.atomic():
+                created = model.objects.bulk_create([obj for _, obj in to_create])
+                self.bulk_created(created)
+                if to_update:
+                    model.objects.bulk_update(to_update, sorted(update_fields))
+                if delete_ids:
+                    model.objects.filter(pk__in=delete_ids).delete()
+                # bulk_create/bulk_update não disparam post_save; invalida os ETags do recurso aqui
+                bump_version(model)
+        except IntegrityError as e:
+            return Response({"applied": False, "error": f"Erro de integridade: {e}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        for (index, _), obj in zip(to_create, created):
+            results[index]["id"] = obj.pk
+        return Response({"applied": True, "results": results})
@@ -0,0 +1,88 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .conditional import ConditionalGetMixin
+
+HITS_KEY = 'api-cache:hits'
+MISSES_KEY = 'api-cache:misses'
+# Os contadores ficam no processo e vão para o cache compartilhado a cada tantas
+# requisições, para não somar duas idas ao cache a cada resposta
+STATS_FLUSH_EVERY = 100
+
+_pendentes = {HITS_KEY: 0, MISSES_KEY: 0}
+_pendentes_lock = threading.Lock()
+
+
+def _flush():
+    with _pendentes_lock:
+        contagens = dict(_pendentes)
+        _pendentes.update({key: 0 for key in _pendentes})
+    for key, quantidade in contagens.items():
+        if not quantidade:
+            continue
+        # add() cria o contador sem sobrescrever; incr() é atômico no Redis
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key, quantidade)
+        except ValueError:
+            # O contador foi despejado entre o add() e o incr()
+            cache.add(key, quantidade, timeout=None)
+
+
+def _count(key):
+    with _pendentes_lock:
+        _pendentes[key] += 1
+        cheio = sum(_pendentes.values()) >= STATS_FLUSH_EVERY
+    if cheio:
+        _flush()
+
+
+def cache_stats():
+    """Totais de todos os processos; os deste processo são enviados antes da leitura."""
+    _flush()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'backend': settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1],
+        'ttl': getattr(settings, 'API_CACHE_TTL', 300),
+        'hits': hits,
+        'misses': misses,
+        'taxa_acerto': round(hits / total, 4) if total else 0.0,
+    }
+
+
+def reset_cache_stats():
+    with _pendentes_lock:
+        _pendentes.update({key: 0 for key in _pendentes})
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+class CachedResponseMixin(ConditionalGetMixin):
+    """
+    Guarda no cache compartilhado (``CACHES['default']``) o payload serializado das
+    listagens e detalhes, além de responder com ETag/304.
+
+    A chave é o próprio ETag, que já combina as versões dos recursos de que a resposta
+    depende, a URL com os parâmetros e o Accept. Os sinais de post_save/post_delete
+    (e ``bump_version`` nas gravações em lote) incrementam a versão, então qualquer
+    alteração faz as próximas requisições usarem uma chave nova; as entradas antigas
+    deixam de ser lidas e saem pelo TTL (API_CACHE_TTL) ou pelo LRU do backend.
+    """
+
+    def _respond(self, request, handler, etag, *args, **kwargs):
+        key = 'api-cache:' + etag.strip('"')
+        data = cache.get(key)
+        if data is not None:
+            _count(HITS_KEY)
+            return Response(data)
+
+        _count(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            # ReturnDict/ReturnList são serializados como dict/list, sem o serializer
+            cache.set(key, response.data, getattr(settings, 'API_CACHE_TTL', 300))
+        return response
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+DEFAULT_FEED_LIMIT = 500
+
+
+def _parse_position(timestamp, pk):
+    return datetime.fromisoformat(timestamp), int(pk)
+
+
+def parse_cursor(value):
+    """
+    Lê o cursor ``<timestamp>|<pk>|<timestamp>|<pk>`` devolvido pelo feed: a posição
+    nas linhas alteradas e a posição nas remoções, cada uma podendo vir vazia. O
+    formato antigo ``<timestamp>|<pk>`` ainda é aceito. None quando ausente.
+    """
+    if not value:
+        return None
+    partes = value.split('|')
+    try:
+        if len(partes) == 2:
+            linhas = _parse_position(*partes)
+            return linhas, (linhas[0], 0)
+        if len(partes) == 4:
+            return tuple(_parse_position(*partes[i:i + 2]) if partes[i] else None for i in (0, 2))
+    except ValueError:
+        pass
+    raise ValidationError({"error": f"Cursor inválido: {value}"})
+
+
+def _format_position(position):
+    return f"{position[0].isoformat()}|{position[1]}" if position else "|"
+
+
+def _after(queryset, timestamp_field, position):
+    if position is None:
+        return queryset
+    timestamp, pk = position
+    return queryset.filter(Q(**{f'{timestamp_field}__gt': timestamp}) | Q(**{timestamp_field: timestamp, 'pk__gt': pk}))
+
+
+def _page(queryset, timestamp_field, position, limit, horizon):
+    """
+    Próxima página depois de ``position`` e a nova posição. A posição só avança sobre
+    linhas anteriores a ``horizon``; as mais recentes voltam na próxima consulta, porque
+    uma transação ainda aberta pode confirmar depois uma linha com timestamp menor.
+    """
+    rows = list(_after(queryset.order_by(timestamp_field, 'pk'), timestamp_field, position)[:limit + 1])
+    mais = len(rows) > limit
+    rows = rows[:limit]
+    stable = [row for row in rows if getattr(row, timestamp_field) <= horizon]
+    if stable:
+        position = (getattr(stable[-1], timestamp_field), stable[-1].pk)
+    # Página cheia só de linhas recentes: o cursor não anda, a próxima consulta espera o horizonte
+    return rows, position, mais and bool(stable)
+
+
+def build_change_feed(queryset, serialize, tombstones, cursor, limit=DEFAULT_FEED_LIMIT,
+                      timestamp_field='atualizado_em', tombstone_field='excluido_em', tombstone_id='pk'):
+    """
+    Retorna as linhas alteradas e os ids removidos depois de ``cursor``.
+
+    Linhas e remoções são percorridas cada uma na ordem ``(timestamp, pk)`` usando o
+    índice correspondente, com cursores independentes e o mesmo ``limit``, então cada
+    chamada custa proporcional ao que mudou e não ao tamanho da tabela.
+
+    O timestamp é o do relógio da aplicação na gravação, não o do commit: uma transação
+    lenta pode confirmar uma linha "no passado". Por isso os cursores só avançam até
+    ``agora - CHANGE_FEED_LAG_SECONDS`` (maior que a duração de uma transação) e as
+    linhas mais novas que isso são reenviadas até passarem do horizonte; o cliente
+    aplica as linhas por pk e não se importa com a repetição.
+
+    Sem cursor o feed começa do início, o que serve como carga inicial. ``serialize``
+    recebe a lista de linhas e devolve os dados da resposta; ``mais`` indica que há
+    outra página a buscar com o cursor devolvido.
+    """
+    horizon = timezone.now() - timedelta(seconds=getattr(settings, 'CHANGE_FEED_LAG_SECONDS', 60))
+    if cursor is None:
+        row_position = None
+        # Na carga inicial não há nada local a remover: começa depois da última remoção estável
+        ultima = (tombstones.filter(**{f'{tombstone_field}__lte': horizon})
+                  .order_by(f'-{tombstone_field}', '-pk').values_list(tombstone_field, 'pk').first())
+        tombstone_position = tuple(ultima) if ultima else None
+    else:
+        row_position, tombstone_position = cursor
+
+    rows, row_position, mais_linhas = _page(queryset, timestamp_field, row_position, limit, horizon)
+    removidos, tombstone_position, mais_removidos = _page(tombstones, tombstone_field, tombstone_position,
+                                                         limit, horizon)
+
+    return {
+        "alterados": serialize(rows),
+        "removidos": sorted({getattr(removido, tombstone_id) for removido in removidos}),
+        "cursor": f"{_format_position(row_position)}|{_format_position(tombstone_position)}",
+        "mais": mais_linhas or mais_removidos,
+    }
@@ -0,0 +1,52 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+
+from core.versioning import get_versions
+
+
+class ConditionalGetMixin:
+    """
+    ETag nas listagens e detalhes de um recurso.
+
+    O ETag é derivado do contador de versão do model (incrementado por sinais a cada
+    gravação ou exclusão), da URL completa e do Accept, então pode ser calculado com
+    uma única consulta pela chave primária de ``VersaoRecurso``. Quando o cliente envia
+    ``If-None-Match`` ainda válido a resposta é 304, sem montar o queryset nem
+    serializar nada.
+
+    Não há Last-Modified: a resolução de um segundo do HTTP-date faria uma gravação no
+    mesmo segundo da leitura responder 304 a ``If-Modified-Since`` com dados velhos.
+
+    Views cuja resposta inclui outros recursos (``?expand=``) listam os models
+    correspondentes em ``get_cache_dependencies``.
+    """
+
+    def get_cache_dependencies(self):
+        return [self.queryset.model]
+
+    def _etag(self, request, dependencies=None, extra=''):
+        versoes = get_versions(dependencies or self.get_cache_dependencies())
+        marcas = ','.join(f"{versao}@{atualizado_em.timestamp() if atualizado_em else ''}"
+                          for versao, atualizado_em in versoes)
+        raw = f"{marcas}:{request.build_absolute_uri()}:{request.META.get('HTTP_ACCEPT', '')}{extra}"
+        return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+    def _respond(self, request, handler, etag, *args, **kwargs):
+        return handler(request, *args, **kwargs)
+
+    def _conditional(self, request, handler, *args, **kwargs):
+        etag = self._etag(request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        response = self._respond(request, handler, etag, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, super().retrieve, *args, **kwargs)
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from core.models import Carro, Cliente, Servico
+
+PAID_STATUS = 'Pago'
+
+
+def build_dashboard_summary(today=None):
+    """
+    Calcula todos os indicadores do dashboard com agregações no banco.
+
+    O custo depende do número de grupos (status, semanas, meses, mecânicos) e não do
+    histórico de serviços, já que nenhuma linha individual é trazida para o Python
+    além das pequenas listas de pendentes e recentes.
+    """
+    today = today or timezone.localdate()
+    week_ago = today - timedelta(days=7)
+    twelve_weeks_ago = today - timedelta(weeks=12)
+    twelve_months_ago = (today.replace(day=1) - timedelta(days=365)).replace(day=1)
+
+    servicos = Servico.objects.all()
+    paid = Q(pagamento__status=PAID_STATUS)
+
+    totals = servicos.aggregate(
+        total_servicos=Count('pk'),
+        servicos_semana=Count('pk', filter=Q(data_entrada__gt=week_ago)),
+        servicos_pendentes=Count('pk', filter=Q(status_atual__in=Servico.ACTIVE_STATUSES)),
+        receita_total=Sum('pagamento__valor_final', filter=paid),
+    )
+
+    por_status = list(
+        servicos.values('status_atual').annotate(total=Count('pk')).order_by('status_atual')
+    )
+
+    por_semana = [
+        {'semana': row['semana'], 'total': row['total']}
+        for row in servicos.filter(data_entrada__gte=twelve_weeks_ago)
+        .annotate(semana=TruncWeek('data_entrada'))
+        .values('semana')
+        .annotate(total=Count('pk'))
+        .order_by('semana')
+    ]
+
+    por_mecanico = list(
+        servicos.values('mecanico_id', 'mecanico__nome')
+        .annotate(
+            total=Count('pk'),
+            concluidos=Count('pk', filter=Q(status_atual__in=Servico.COMPLETED_STATUSES)),
+        )
+        .order_by('-total')
+    )
+
+    receita_mensal = list(
+        servicos.filter(paid, data_entrada__gte=twelve_months_ago)
+        .annotate(mes=TruncMonth('data_entrada'))
+        .values('mes')
+        .annotate(receita=Sum('pagamento__valor_final'))
+        .order_by('mes')
+    )
+
+    receita_diaria = list(
+        servicos.filter(paid, data_saida__gt=week_ago, data_saida__lte=today)
+        .values('data_saida')
+        .annotate(receita=Sum('pagamento__valor_final'))
+        .order_by('data_saida')
+    )
+
+    card_fields = ('servico_ID', 'cliente__nome', 'status_atual', 'orcamento', 'data_entrada')
+    pendentes = list(
+        servicos.filter(status_atual__in=Servico.ACTIVE_STATUSES)
+        .order_by('-data_entrada', '-pk')
+        .values(*card_fields)[:5]
+    )
+    recentes = list(
+        servicos.filter(data_entrada__gt=week_ago)
+        .order_by('-data_entrada', '-pk')
+        .values(*card_fields)[:10]
+    )
+
+    return {
+        **totals,
+        'receita_total': totals['receita_total'] or 0,
+        'total_clientes': Cliente.objects.count(),
+        'total_carros': Carro.objects.count(),
+        'por_status': por_status,
+        'por_semana': por_semana,
+        'por_mecanico': por_mecanico,
+        'receita_mensal': receita_mensal,
+        'receita_diaria': receita_diaria,
+        'pendentes': pendentes,
+        'recentes': recentes,
+        'gerado_em': timezone.now(),
+    }
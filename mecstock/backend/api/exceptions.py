@@ -0,0 +1,25 @@
+from django.db.models import ProtectedError
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import exception_handler as drf_exception_handler
+
+# Como cada modelo protegido aparece na mensagem de erro
+DESCRICOES_PROTEGIDAS = {'core.movimentoestoque': 'movimentos de estoque'}
+
+
+def exception_handler(exc, context):
+    """
+    Handler padrão do DRF mais ``ProtectedError`` como 409 em qualquer view. A exclusão
+    de um cliente, carro, mecânico ou pagamento apaga em cascata os serviços, e um
+    serviço com movimentos de estoque não pode ser apagado.
+    """
+    if isinstance(exc, ProtectedError):
+        descricoes = sorted({
+            DESCRICOES_PROTEGIDAS.get(obj._meta.label_lower, str(obj._meta.verbose_name_plural))
+            for obj in exc.protected_objects
+        })
+        return Response(
+            {"error": f"O registro possui {', '.join(descricoes)} vinculados e não pode ser excluído"},
+            status=status.HTTP_409_CONFLICT
+        )
+    return drf_exception_handler(exc, context)
@@ -0,0 +1,84 @@
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.db import stream_queryset
+
+from .utils import query_param_set
+
+
+class _Echo:
+    """Arquivo falso para o csv.writer: devolve a linha em vez de guardá-la."""
+    def write(self, value):
+        return value
+
+
+def _csv_rows(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_rows(columns, rows):
+    encoder = JSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', _csv_rows),
+    'ndjson': ('application/x-ndjson', _ndjson_rows),
+}
+
+
+class ExportMixin:
+    """
+    Adiciona ``GET <recurso>/export/?formato=csv|ndjson`` a um ModelViewSet.
+
+    O arquivo é gerado linha a linha a partir de um cursor do lado do servidor
+    (``core.db.stream_queryset``) sobre ``values_list``, sem instanciar models nem
+    serializers, então a memória usada não depende do número de registros. Os filtros
+    da listagem valem também para a exportação e ``?fields=`` escolhe as colunas.
+    Relações saem como o ID do registro relacionado.
+    """
+    export_fields = None
+
+    def get_export_fields(self):
+        if self.export_fields is not None:
+            return list(self.export_fields)
+        return [field.name for field in self.get_queryset().model._meta.concrete_fields]
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        formato = request.query_params.get('formato', 'csv')
+        if formato not in EXPORT_FORMATS:
+            return Response(
+                {"error": f"Formato inválido: {formato} (use {', '.join(EXPORT_FORMATS)})"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        columns = self.get_export_fields()
+        requested = query_param_set(request, 'fields')
+        if requested is not None:
+            unknown = requested - set(columns)
+            if unknown:
+                return Response(
+                    {"error": f"Campos inválidos: {', '.join(sorted(unknown))}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            columns = [column for column in columns if column in requested]
+
+        queryset = self.get_queryset()
+        rows = stream_queryset(queryset.order_by(queryset.model._meta.pk.name).values_list(*columns))
+        content_type, render = EXPORT_FORMATS[formato]
+        response = StreamingHttpResponse(render(columns, rows), content_type=content_type)
+        nome = f"{queryset.model._meta.model_name}-{timezone.localdate():%Y%m%d}.{formato}"
+        response['Content-Disposition'] = f'attachment; filename="{nome}"'
+        return response
@@ -0,0 +1,32 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+
+
+class QueryParamFilterMixin:
+    """
+    Filtra o queryset a partir de parâmetros da query string.
+
+    ``filter_params`` mapeia o nome do parâmetro para o lookup do ORM, por exemplo
+    ``{'cliente': 'cliente', 'data_entrada_de': 'data_entrada__gte'}``. Lookups
+    terminados em ``__in`` aceitam valores separados por vírgula.
+    """
+    filter_params = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        filters = {}
+        for param, lookup in self.filter_params.items():
+            value = self.request.query_params.get(param)
+            if value in (None, ''):
+                continue
+            if lookup.endswith('__in'):
+                value = [item.strip() for item in value.split(',') if item.strip()]
+            filters[lookup] = value
+
+        if not filters:
+            return queryset
+        try:
+            # O ORM converte os valores ao montar o filtro, então valores inválidos viram 400 aqui
+            return queryset.filter(**filters)
+        except (ValueError, DjangoValidationError) as e:
+            raise ValidationError({"error": f"Filtro inválido: {e}"})
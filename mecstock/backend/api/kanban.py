@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.db.models import Case, CharField, Count, DurationField, ExpressionWrapper, F, Value, When
+from django.utils import timezone
+
+from core.models import Servico
+
+DEFAULT_CARDS_PER_STATUS = 50
+MAX_CARDS_PER_STATUS = 200
+
+
+def annotate_cards(queryset, today=None):
+    """
+    Adiciona ao queryset os campos calculados dos cards (prazo e urgência) e faz o
+    join com cliente, carro e mecânico, evitando consultas extras por card.
+    """
+    today = today or timezone.localdate()
+    return (
+        queryset
+        .select_related('cliente', 'carro', 'mecanico')
+        .only(
+            'servico_ID', 'status_atual', 'data_entrada', 'data_saida', 'diagnostico', 'descricao_servico',
+            'cliente__nome', 'carro__montadora', 'carro__modelo_carro', 'carro__placa', 'mecanico__nome',
+        )
+        .annotate(
+            dias_em_servico=ExpressionWrapper(F('data_saida') - F('data_entrada'), output_field=DurationField()),
+            dias_restantes=ExpressionWrapper(F('data_saida') - Value(today), output_field=DurationField()),
+            urgencia=Case(
+                When(data_saida__lt=today, then=Value('overdue')),
+                When(data_saida__lt=today + timedelta(days=2), then=Value('urgent')),
+                When(data_saida__lt=today + timedelta(days=5), then=Value('soon')),
+                default=Value('normal'),
+                output_field=CharField(),
+            ),
+        )
+    )
+
+
+def servico_to_card(servico):
+    """Converte um serviço anotado por ``annotate_cards`` no card exibido no quadro."""
+    carro = servico.carro
+    return {
+        "id": str(servico.servico_ID),
+        "title": f"OS #{servico.servico_ID}",
+        "status": servico.status_atual,
+        "client": servico.cliente.nome,
+        "car": f"{carro.montadora} {carro.modelo_carro} - {carro.placa}",
+        "mechanic": servico.mecanico.nome,
+        "entry_date": servico.data_entrada.isoformat(),
+        "exit_date": servico.data_saida.isoformat(),
+        "days": servico.dias_em_servico.days,
+        "days_remaining": servico.dias_restantes.days,
+        "urgency": servico.urgencia,
+        "diagnostico": servico.diagnostico,
+        "service_description": servico.descricao_servico,
+    }
+
+
+def build_kanban_board(queryset, limit=DEFAULT_CARDS_PER_STATUS, today=None):
+    """
+    Monta o quadro agrupado por ``Servico.STATUS_CHOICES``.
+
+    Cada coluna traz o total de serviços naquele status e no máximo ``limit`` cards,
+    os de prazo mais próximo primeiro. São uma contagem agrupada mais uma consulta
+    indexada por status, então o custo não cresce com o histórico de serviços entregues.
+    ``transicoes`` traz as mudanças de status permitidas a partir de cada coluna.
+    """
+    today = today or timezone.localdate()
+    totals = dict(
+        queryset.order_by().values_list('status_atual').annotate(total=Count('pk'))
+    )
+    cards = annotate_cards(queryset, today).order_by('data_saida', 'pk')
+
+    colunas = []
+    for status_value, _label in Servico.STATUS_CHOICES:
+        total = totals.get(status_value, 0)
+        colunas.append({
+            "status": status_value,
+            "total": total,
+            "cards": [servico_to_card(s) for s in cards.filter(status_atual=status_value)[:limit]] if total else [],
+        })
+    return {"data": today.isoformat(), "colunas": colunas, "transicoes": Servico.TRANSITIONS}
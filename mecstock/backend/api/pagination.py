@@ -0,0 +1,29 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class MecStockCursorPagination(CursorPagination):
+    """
+    Paginação por cursor usada em todos os endpoints de listagem.
+
+    O cursor é baseado na chave primária, que é única e nunca muda, então as
+    páginas continuam estáveis mesmo com inserções concorrentes e cada página
+    custa uma busca pelo índice da PK, independente do tamanho da tabela.
+    """
+    ordering = '-pk'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class SearchPagination(LimitOffsetPagination):
+    """
+    Paginação por limit/offset para resultados ordenados por relevância, onde o cursor
+    pela PK não se aplica. A contagem para em ``max_count`` para não percorrer todos
+    os resultados de um termo muito comum.
+    """
+    default_limit = 20
+    max_limit = 100
+    max_count = 1000
+
+    def get_count(self, queryset):
+        return queryset.order_by()[:self.max_count].count()
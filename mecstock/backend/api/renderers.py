@@ -0,0 +1,99 @@
+import json
+from decimal import Decimal
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow é opcional
+    pa = None
+
+PAGINATION_KEYS = ('next', 'previous')
+
+
+def _split_page(data):
+    """Separa as linhas dos links de paginação; um detalhe vira uma tabela de uma linha."""
+    if isinstance(data, dict) and 'results' in data:
+        return data['results'], {key: data.get(key) for key in PAGINATION_KEYS}
+    if isinstance(data, dict):
+        return [data], {}
+    return list(data or []), {}
+
+
+def _columns(rows):
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    return columns
+
+
+class _ColumnarRenderer(BaseRenderer):
+    """Respostas de erro (4xx/5xx) continuam em JSON, que é o que os clientes sabem ler."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        if response is not None and response.status_code >= 400:
+            response['Content-Type'] = 'application/json'
+            return JSONRenderer().render(data, 'application/json', renderer_context)
+        if data is None:
+            return b''
+        rows, links = _split_page(data)
+        return self.render_table(_columns(rows), rows, links)
+
+
+class ColumnarJSONRenderer(_ColumnarRenderer):
+    """
+    ``Accept: application/vnd.mecstock.columnar+json``: os mesmos dados da listagem,
+    com um array por coluna em vez de um objeto por linha, mais ``next``/``previous``.
+    Fica bem menor que o JSON padrão e vira DataFrame sem percorrer as linhas.
+    """
+    media_type = 'application/vnd.mecstock.columnar+json'
+    format = 'columnar'
+    charset = None
+
+    def render_table(self, columns, rows, links):
+        payload = {
+            'columns': columns,
+            'data': {column: [row.get(column) for row in rows] for column in columns},
+            **links,
+        }
+        return json.dumps(payload, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class ArrowStreamRenderer(_ColumnarRenderer):
+    """
+    ``Accept: application/vnd.apache.arrow.stream``: a página em formato Arrow IPC.
+    Os links de paginação vão nos metadados do schema (``next``/``previous``).
+    Valores monetários saem como float64 e relações expandidas como structs.
+    """
+    media_type = 'application/vnd.apache.arrow.stream'
+    format = 'arrow'
+    charset = None
+
+    def render_table(self, columns, rows, links):
+        arrays = {
+            column: [float(value) if isinstance(value, Decimal) else value
+                     for value in (row.get(column) for row in rows)]
+            for column in columns
+        }
+        metadata = {key: value or '' for key, value in links.items()}
+        table = pa.table(arrays, metadata=metadata)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+COLUMNAR_RENDERERS = [ColumnarJSONRenderer] + ([ArrowStreamRenderer] if pa is not None else [])
+
+
+class ColumnarRenderMixin:
+    """
+    Listagens e detalhes negociáveis em formato colunar pelo Accept, além do JSON e
+    da API navegável. O Arrow só é oferecido quando o pyarrow está instalado.
+    """
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *COLUMNAR_RENDERERS]
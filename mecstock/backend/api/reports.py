@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+from django.db.models import F, Q, Sum
+
+from core.models import ReceitaMensal
+from .dashboard import PAID_STATUS
+
+ZERO = Decimal('0.00')
+
+
+def build_payment_report():
+    """
+    Totais da página de pagamentos, lidos do agregado ``ReceitaMensal`` (algumas
+    linhas por mês) em vez de somar todos os serviços. Os valores são DecimalField,
+    então as somas são exatas em centavos.
+    """
+    linhas = ReceitaMensal.objects.all()
+    paid = Q(status_pagamento=PAID_STATUS)
+
+    totals = linhas.aggregate(
+        total_recebido=Sum('valor_final', filter=paid),
+        total_pendente=Sum('orcamento', filter=~paid),
+    )
+    recebido = totals['total_recebido'] or ZERO
+    pendente = totals['total_pendente'] or ZERO
+    total = recebido + pendente
+
+    por_metodo = list(
+        linhas.filter(paid)
+        .values(metodo=F('metodo_pagamento'))
+        .annotate(total=Sum('valor_final'))
+        .order_by('-total')
+    )
+    receita_mensal = list(
+        linhas.filter(paid)
+        .values('mes')
+        .annotate(receita=Sum('valor_final'))
+        .order_by('mes')
+    )
+
+    return {
+        'total_recebido': recebido,
+        'total_pendente': pendente,
+        'taxa_recebimento': (recebido * 100 / total).quantize(Decimal('0.1')) if total else None,
+        'por_metodo': por_metodo,
+        'receita_mensal': receita_mensal,
+    }
+
+
+def build_revenue_report(de=None, ate=None, status=None):
+    """
+    Receita por mês e por método no período ``[de, ate]`` (primeiros dias de mês),
+    considerando os pagamentos com os status informados (padrão: pagos).
+    """
+    linhas = ReceitaMensal.objects.filter(status_pagamento__in=status or [PAID_STATUS])
+    if de:
+        linhas = linhas.filter(mes__gte=de)
+    if ate:
+        linhas = linhas.filter(mes__lte=ate)
+
+    meses = list(
+        linhas.values('mes')
+        .annotate(receita=Sum('valor_final'), servicos=Sum('servicos'))
+        .order_by('mes')
+    )
+    por_metodo = list(
+        linhas.values(metodo=F('metodo_pagamento'))
+        .annotate(total=Sum('valor_final'), servicos=Sum('servicos'))
+        .order_by('-total')
+    )
+    return {
+        'total': sum((mes['receita'] for mes in meses), ZERO),
+        'servicos': sum(mes['servicos'] for mes in meses),
+        'meses': meses,
+        'por_metodo': por_metodo,
+    }
@@ -0,0 +1,60 @@
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+
+from core.models import Carro, Cliente, Mecanico, Servico
+from .kanban import annotate_cards
+
+# Mesma expressão do índice GIN criado na migração 0013; o planner só usa o índice
+# quando a consulta repete a expressão exatamente
+SERVICO_TSVECTOR_SQL = (
+    "to_tsvector('portuguese'::regconfig, "
+    "COALESCE(\"core_servico\".\"diagnostico\", '') || ' ' || COALESCE(\"core_servico\".\"descricao_servico\", ''))"
+)
+# Quantos clientes, mecânicos ou carros casados pelo nome/placa entram na busca
+MAX_RELATED_MATCHES = 500
+
+
+def _related_ids(model, field, q):
+    # icontains vira UPPER(campo) LIKE UPPER('%q%'), atendido pelos índices de trigramas
+    return list(model.objects.filter(**{f'{field}__icontains': q}).values_list('pk', flat=True)[:MAX_RELATED_MATCHES])
+
+
+def search_servicos(q):
+    """
+    Serviços que casam com ``q`` na descrição ou no diagnóstico (busca textual em
+    português) ou no nome do cliente, nome do mecânico ou placa do carro (substring),
+    já anotados como cards do quadro e ordenados por relevância.
+
+    Os clientes, mecânicos e carros que casam são buscados antes, cada um pelo seu
+    índice de trigramas, para que o filtro final em ``core_servico`` seja um OR de
+    condições indexadas (tsvector, cliente_id, mecanico_id, carro_id). Fora do
+    PostgreSQL a busca cai para ``icontains`` em todos os campos, sem relevância.
+    """
+    related = (
+        Q(cliente__in=_related_ids(Cliente, 'nome', q))
+        | Q(mecanico__in=_related_ids(Mecanico, 'nome', q))
+        | Q(carro__in=_related_ids(Carro, 'placa', q))
+    )
+    queryset = annotate_cards(Servico.objects.all())
+
+    if connection.vendor != 'postgresql':
+        text = Q(diagnostico__icontains=q) | Q(descricao_servico__icontains=q)
+        return queryset.filter(text | related).order_by('-pk')
+
+    text = RawSQL(f"{SERVICO_TSVECTOR_SQL} @@ websearch_to_tsquery('portuguese'::regconfig, %s)", [q],
+                  output_field=BooleanField())
+    text_rank = RawSQL(f"ts_rank({SERVICO_TSVECTOR_SQL}, websearch_to_tsquery('portuguese'::regconfig, %s))", [q],
+                       output_field=FloatField())
+    return (
+        queryset
+        .filter(Q(text) | related)
+        .annotate(rank=text_rank + Greatest(
+            TrigramSimilarity('cliente__nome', q),
+            TrigramSimilarity('mecanico__nome', q),
+            TrigramSimilarity('carro__placa', q),
+        ))
+        .order_by('-rank', '-pk')
+    )
@@ -1,50 +1,191 @@
+from django.db import transaction
 from rest_framework import serializers
-from core.models import Cliente, Carro, Pagamento, Mecanico, Servico, Endereco, Insumo, Status
+from core.inventory.services import registrar_saldos_iniciais
+from core.models import Cliente, Carro, Pagamento, Mecanico, Servico, Endereco, Insumo, Status, MovimentoEstoque
+from core.models.endereco import CAMPOS_DO_HASH, hash_endereco
+from .utils import query_param_set
 
-class ClienteSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Permite que o cliente escolha os campos retornados com ``?fields=a,b,c``.
+    Campos desconhecidos são ignorados; sem o parâmetro, todos os campos são retornados.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested_fields = query_param_set(self.context.get('request'), 'fields')
+        if self.requested_fields is None:
+            return
+        for field_name in set(self.fields) - self.requested_fields:
+            self.fields.pop(field_name)
+
+class ExpandableFieldsMixin:
+    """
+    ``?expand=cliente,carro`` troca o ID dessas relações pelo objeto serializado.
+
+    ``expandable_fields`` mapeia o nome da relação para ``(serializer, many)``. As
+    views usam ``expansions_for`` para montar o select_related/prefetch_related
+    correspondente, então expandir não gera uma consulta por linha.
+    """
+    expandable_fields = {}
+
+    @classmethod
+    def expansions_for(cls, request):
+        return (query_param_set(request, 'expand') or set()) & set(cls.expandable_fields)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in self.expansions_for(self.context.get('request')):
+            if self.requested_fields is not None and name not in self.requested_fields:
+                continue
+            serializer_class, many = self.expandable_fields[name]
+            self.fields[name] = serializer_class(many=many, read_only=True)
+
+class ClienteSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Cliente
         fields = '__all__'
         read_only_fields = ('cliente_ID',)
 
-class CarroSerializer(serializers.ModelSerializer):
+    def validate_email(self, value):
+        # A restrição única é sobre LOWER(email), que o ModelSerializer não valida sozinho
+        existing = Cliente.por_email(value)
+        if self.instance is not None:
+            existing = existing.exclude(pk=self.instance.pk)
+        if existing.exists():
+            raise serializers.ValidationError("Já existe um cliente com este email.")
+        return value
+
+class CarroSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Carro
         fields = '__all__'
         read_only_fields = ('carro_ID',)
 
-class PagamentoSerializer(serializers.ModelSerializer):
+class PagamentoSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Pagamento
         fields = '__all__'
         read_only_fields = ('pagamento_ID',)
 
-class MecanicoSerializer(serializers.ModelSerializer):
+class MecanicoSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Mecanico
         fields = '__all__'
         read_only_fields = ('mecanico_ID',)
 
-class ServicoSerializer(serializers.ModelSerializer):
+class StatusSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Status
+        fields = '__all__'
+        # O horário do evento é sempre o do servidor, mantendo o histórico em ordem de gravação
+        read_only_fields = ('id', 'data_atualizacao')
+        extra_kwargs = {'servico_ID': {'required': True, 'allow_null': False}}
+
+class ServicoSerializer(ExpandableFieldsMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'cliente': (ClienteSerializer, False),
+        'carro': (CarroSerializer, False),
+        'mecanico': (MecanicoSerializer, False),
+        'pagamento': (PagamentoSerializer, False),
+        'historico': (StatusSerializer, True),
+    }
+
     class Meta:
         model = Servico
         fields = '__all__'
         read_only_fields = ('id',)
 
-class EnderecoSerializer(serializers.ModelSerializer):
+class EnderecoSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Endereco
         fields = '__all__'
         read_only_fields = ('id',)
 
-class InsumoSerializer(serializers.ModelSerializer):
+    def validate(self, attrs):
+        # Na criação um endereço repetido é reaproveitado; na edição, colidir com outro é erro
+        if self.instance is not None:
+            dados = {campo: attrs.get(campo, getattr(self.instance, campo)) for campo in CAMPOS_DO_HASH}
+            outro = Endereco.objects.filter(hash_conteudo=hash_endereco(dados)).exclude(pk=self.instance.pk).first()
+            if outro is not None:
+                raise serializers.ValidationError(f"Já existe um endereço com este conteúdo (ID {outro.pk}).")
+        return attrs
+
+    def create(self, validated_data):
+        endereco, _ = Endereco.objects.obter_ou_criar(**validated_data)
+        return endereco
+
+class ClienteCadastroSerializer(ClienteSerializer):
+    """
+    Cliente com o endereço aninhado, gravados juntos. O endereço é deduplicado pelo
+    hash do conteúdo normalizado: se já existir, o cliente passa a compartilhá-lo.
+    """
+    endereco = EnderecoSerializer(source='endereco_ID')
+
+    class Meta(ClienteSerializer.Meta):
+        fields = ('cliente_ID', 'nome', 'email', 'cpf', 'telefone', 'endereco')
+
+    def create(self, validated_data):
+        dados_endereco = validated_data.pop('endereco_ID')
+        with transaction.atomic():
+            endereco, self.endereco_criado = Endereco.objects.obter_ou_criar(**dados_endereco)
+            return Cliente.objects.create(endereco_ID=endereco, **validated_data)
+
+class InsumoSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Insumo
         fields = '__all__'
-        read_only_fields = ('insumo_ID',)
+        read_only_fields = ('insumo_ID', 'qtd_reservada')
+
+    def validate_qtd(self, value):
+        # Sobrescrever o saldo perderia movimentos concorrentes; depois de criado, só o ledger o altera
+        if self.instance is not None and value != self.instance.qtd:
+            raise serializers.ValidationError(
+                "A quantidade só pode ser alterada por movimentos de estoque (/api/movimentos-estoque/)."
+            )
+        return value
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            insumo = super().create(validated_data)
+            registrar_saldos_iniciais([insumo])
+        return insumo
 
-class StatusSerializer(serializers.ModelSerializer):
+class MovimentoEstoqueSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
-        model = Status
+        model = MovimentoEstoque
         fields = '__all__'
-        read_only_fields = ('id',)
+        read_only_fields = ('movimento_ID', 'criado_em')
+
+class OrdemServicoSerializer(serializers.ModelSerializer):
+    """
+    Ordem de serviço completa em uma requisição: os campos do serviço, o pagamento
+    inicial aninhado, opcionalmente um endereço novo para atendimento domiciliar e a
+    observação do primeiro evento de status. Tudo é validado antes de gravar e criado
+    em uma única transação, então uma falha não deixa pagamento ou endereço órfãos.
+    """
+    pagamento = PagamentoSerializer()
+    endereco = EnderecoSerializer(required=False, write_only=True,
+                                  help_text="Endereço novo para o atendimento (em vez de service_address)")
+    observacao = serializers.CharField(required=False, write_only=True, allow_blank=True,
+                                       default='Ordem de serviço criada')
+
+    class Meta:
+        model = Servico
+        fields = '__all__'
+        read_only_fields = ('servico_ID',)
+
+    def validate(self, attrs):
+        if attrs.get('endereco') and attrs.get('service_address'):
+            raise serializers.ValidationError("Informe endereco ou service_address, não os dois")
+        return attrs
+
+    def create(self, validated_data):
+        endereco = validated_data.pop('endereco', None)
+        observacao = validated_data.pop('observacao')
+        with transaction.atomic():
+            validated_data['pagamento'] = Pagamento.objects.create(**validated_data['pagamento'])
+            if endereco:
+                validated_data['service_address'], _ = Endereco.objects.obter_ou_criar(**endereco)
+            servico = Servico.objects.create(**validated_data)
+            Status.objects.create(servico_ID=servico, status=servico.status_atual, observacao=observacao)
+        return servico
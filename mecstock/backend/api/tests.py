@@ -1,7 +1,34 @@
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
 from rest_framework import status
 from rest_framework.test import APITestCase
-from core.models import Cliente, Carro, Pagamento, Mecanico, Servico
+from api.caching import HITS_KEY, reset_cache_stats
+from api.pagination import MecStockCursorPagination
+from api.renderers import ArrowStreamRenderer, ColumnarJSONRenderer, pa
+from core.cep.exceptions import CepUpstreamException
+from core.cep.services import limpar_cache
+from core.inventory.services import saldos_do_ledger
+from core.revenue.services import agregar, reconstruir
+from core.seed.services import gerar_linhas, planejar
+from core.versioning import get_version
+from core.models import (
+    Cliente, Carro, Pagamento, Mecanico, Servico, Endereco, Insumo, InsumoExcluido, ReceitaMensal, Status, Cep
+)
 
 class ServicoTests(APITestCase):
     def setUp(self):
@@ -65,10 +92,1034 @@ class ServicoTests(APITestCase):
         url = reverse('servico-list')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_servico_detail(self):
         url = reverse('servico-detail', args=[self.servico.servico_ID])
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['descricao_servico'], self.servico.descricao_servico)
\ No newline at end of file
+        self.assertEqual(response.data['descricao_servico'], self.servico.descricao_servico)
+
+class WorkshopFixtureMixin:
+    """Cria um conjunto mínimo e válido de registros relacionados para os testes da API."""
+
+    def make_cliente(self, nome="Maria Souza", email="maria@example.com", cpf="111.111.111-11"):
+        endereco, _ = Endereco.objects.obter_ou_criar(
+            cep="01001000", rua="Praça da Sé", bairro="Sé", numero="1",
+            cidade="São Paulo", estado="SP"
+        )
+        return Cliente.objects.create(
+            nome=nome, email=email, cpf=cpf, telefone="11999999999", endereco_ID=endereco
+        )
+
+    def make_servico(self, cliente=None, **overrides):
+        cliente = cliente or self.make_cliente()
+        carro = overrides.pop('carro', None) or Carro.objects.create(
+            modelo_carro="Fusca", montadora="Volkswagen", placa="ABC1D23",
+            combustivel="Gasolina", ano=1970, Customer_ID=cliente
+        )
+        mecanico = overrides.pop('mecanico', None) or Mecanico.objects.create(
+            nome="João Silva", telefone="11988888888", email="joao@example.com"
+        )
+        pagamento = overrides.pop('pagamento', None) or Pagamento.objects.create(
+            valor_final=150.0, valor_total=150.0, metodo_pagamento="pix", status="Pendente"
+        )
+        data = {
+            'diagnostico': "Barulho no motor",
+            'orcamento': 150.0,
+            'descricao_servico': "Troca de óleo e filtro",
+            'data_entrada': "2025-01-10",
+            'data_saida': "2025-01-15",
+        }
+        data.update(overrides)
+        return Servico.objects.create(
+            cliente=cliente, carro=carro, mecanico=mecanico, pagamento=pagamento, **data
+        )
+
+
+class PaginationTests(APITestCase):
+    def setUp(self):
+        Mecanico.objects.bulk_create([
+            Mecanico(nome=f"Mecânico {i}", telefone="0987654321", email=f"mec{i}@example.com")
+            for i in range(25)
+        ])
+
+    def test_list_is_cursor_paginated(self):
+        response = self.client.get(reverse('mecanico-list'), {'page_size': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNotNone(response.data['next'])
+        self.assertIn('cursor=', response.data['next'])
+
+    def test_pages_do_not_overlap_after_concurrent_insert(self):
+        first = self.client.get(reverse('mecanico-list'), {'page_size': 10})
+        Mecanico.objects.create(nome="Novo", telefone="1", email="novo@example.com")
+        second = self.client.get(first.data['next'])
+        first_ids = {m['mecanico_ID'] for m in first.data['results']}
+        second_ids = {m['mecanico_ID'] for m in second.data['results']}
+        self.assertFalse(first_ids & second_ids)
+        self.assertEqual(len(second_ids), 10)
+
+    def test_page_size_is_capped(self):
+        Mecanico.objects.bulk_create([
+            Mecanico(nome=f"Mecânico {i}", telefone="0987654321", email=f"mec{i}@example.com")
+            for i in range(25, 1010)
+        ])
+        response = self.client.get(reverse('mecanico-list'), {'page_size': 100000})
+        self.assertEqual(len(response.data['results']), MecStockCursorPagination.max_page_size)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_sparse_fieldset(self):
+        response = self.client.get(reverse('mecanico-list'), {'fields': 'mecanico_ID,nome'})
+        self.assertEqual(set(response.data['results'][0]), {'mecanico_ID', 'nome'})
+
+
+class FilterTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        self.servico = self.make_servico(status_atual='Em Andamento')
+        other_cliente = self.make_cliente(nome="Ana", email="ana@example.com", cpf="222.222.222-22")
+        self.other = self.make_servico(cliente=other_cliente, data_entrada="2025-03-01", data_saida="2025-03-05")
+        Status.objects.create(status='Em Andamento', servico_ID=self.servico)
+        Status.objects.create(status='Cadastrado', servico_ID=self.other)
+
+    def test_filter_servicos_by_cliente(self):
+        response = self.client.get(reverse('servico-list'), {'cliente': self.servico.cliente_id})
+        self.assertEqual([s['servico_ID'] for s in response.data['results']], [self.servico.servico_ID])
+
+    def test_filter_servicos_by_status_list_and_date_range(self):
+        response = self.client.get(reverse('servico-list'), {
+            'status_atual': 'Cadastrado,Aprovado',
+            'data_entrada_de': '2025-02-01',
+        })
+        self.assertEqual([s['servico_ID'] for s in response.data['results']], [self.other.servico_ID])
+
+    def test_filter_status_by_servico(self):
+        response = self.client.get(reverse('status-list'), {'servico_ID': self.servico.servico_ID})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['status'], 'Em Andamento')
+
+    def test_invalid_filter_value_returns_400(self):
+        response = self.client.get(reverse('servico-list'), {'data_entrada_de': 'ontem'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DashboardSummaryTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        pago = Pagamento.objects.create(valor_final=200.0, valor_total=200.0, metodo_pagamento="pix", status="Pago")
+        self.make_servico(status_atual='Finalizado', pagamento=pago)
+        self.make_servico(
+            cliente=self.make_cliente(nome="Ana", email="ana@example.com", cpf="222.222.222-22"),
+            status_atual='Em Andamento'
+        )
+
+    def test_summary_aggregates(self):
+        response = self.client.get(reverse('dashboard-summary'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_servicos'], 2)
+        self.assertEqual(response.data['servicos_pendentes'], 1)
+        self.assertEqual(response.data['total_clientes'], 2)
+        self.assertEqual(response.data['receita_total'], 200.0)
+        self.assertEqual(
+            {row['status_atual']: row['total'] for row in response.data['por_status']},
+            {'Finalizado': 1, 'Em Andamento': 1}
+        )
+
+    def test_summary_is_cached(self):
+        self.client.get(reverse('dashboard-summary'))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('dashboard-summary'))
+
+
+class PaymentReportTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        for i, valor in enumerate(["0.10", "0.20"]):
+            pago = Pagamento.objects.create(valor_final=valor, valor_total=valor, metodo_pagamento="pix", status="Pago")
+            self.make_servico(
+                cliente=self.make_cliente(email=f"c{i}@example.com", cpf=f"{i:03}.000.000-00"),
+                pagamento=pago, orcamento=valor,
+            )
+        self.make_servico(
+            cliente=self.make_cliente(email="ana@example.com", cpf="222.222.222-22"), orcamento="99.99"
+        )
+
+    def test_totals_are_exact_decimals(self):
+        response = self.client.get(reverse('pagamento-relatorio'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_recebido'], Decimal("0.30"))
+        self.assertEqual(response.data['total_pendente'], Decimal("99.99"))
+        self.assertEqual(response.data['por_metodo'], [{'metodo': "pix", 'total': Decimal("0.30")}])
+        self.assertEqual(response.json()['total_recebido'], 0.3)
+
+
+class KanbanTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        today = timezone.localdate()
+        self.atrasado = self.make_servico(
+            status_atual='Em Andamento',
+            data_entrada=today - timedelta(days=10),
+            data_saida=today - timedelta(days=1),
+        )
+        self.make_servico(
+            cliente=self.make_cliente(nome="Ana", email="ana@example.com", cpf="222.222.222-22"),
+            data_entrada=today,
+            data_saida=today + timedelta(days=7),
+        )
+
+    def test_cards_grouped_by_status(self):
+        response = self.client.get(reverse('servico-kanban'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        colunas = {c['status']: c for c in response.data['colunas']}
+        self.assertEqual(list(colunas), [value for value, _ in Servico.STATUS_CHOICES])
+        card = colunas['Em Andamento']['cards'][0]
+        self.assertEqual(card['id'], str(self.atrasado.servico_ID))
+        self.assertEqual(card['client'], "Maria Souza")
+        self.assertEqual(card['days_remaining'], -1)
+        self.assertEqual(card['days'], 9)
+        self.assertEqual(card['urgency'], 'overdue')
+        self.assertEqual(colunas['Cadastrado']['cards'][0]['urgency'], 'normal')
+
+    def test_unchanged_board_returns_304(self):
+        first = self.client.get(reverse('servico-kanban'))
+        # Só a consulta das versões: o quadro não é montado
+        with self.assertNumQueries(1):
+            second = self.client.get(reverse('servico-kanban'), HTTP_IF_NONE_MATCH=f'W/"x", {first["ETag"]}')
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        other = self.client.get(reverse('servico-kanban'), {'limite': 1}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.atrasado.cliente.nome = "Maria S. Souza"
+            self.atrasado.cliente.save()
+        third = self.client.get(reverse('servico-kanban'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(third.status_code, status.HTTP_200_OK)
+
+
+class ExpandTests(WorkshopFixtureMixin, APITestCase):
+    url_params = {'expand': 'cliente,carro,mecanico,pagamento,historico'}
+
+    def make_servicos(self, count):
+        start = Servico.objects.count()
+        # Executa os incrementos de versão agendados para o commit, invalidando o cache
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(start, start + count):
+                servico = self.make_servico(
+                    cliente=self.make_cliente(nome=f"Cliente {i}", email=f"c{i}@example.com",
+                                              cpf=f"{i:03d}.000.000-00")
+                )
+                Status.objects.create(status='Cadastrado', servico_ID=servico)
+
+    def test_expanded_relations_are_nested(self):
+        self.make_servicos(1)
+        response = self.client.get(reverse('servico-list'), self.url_params)
+        servico = response.data['results'][0]
+        self.assertEqual(servico['cliente']['nome'], "Cliente 0")
+        self.assertEqual(servico['carro']['placa'], "ABC1D23")
+        self.assertEqual(servico['historico'][0]['status'], 'Cadastrado')
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # Consulta de versões do cache + serviços + histórico
+        self.make_servicos(2)
+        with self.assertNumQueries(3):
+            self.client.get(reverse('servico-list'), self.url_params)
+        self.make_servicos(8)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('servico-list'), self.url_params)
+        self.assertEqual(len(response.data['results']), 10)
+
+    @override_settings(EXPANDED_HISTORY_LIMIT=2)
+    def test_history_is_windowed_on_lists(self):
+        self.make_servicos(2)
+        servico = Servico.objects.order_by('pk').first()
+        with self.captureOnCommitCallbacks(execute=True):
+            for etapa in ('Em Andamento', 'Aguardando Peças'):
+                Status.objects.create(status=etapa, servico_ID=servico)
+
+        response = self.client.get(reverse('servico-list'), self.url_params)
+        historicos = {row['servico_ID']: row['historico'] for row in response.data['results']}
+        self.assertEqual([e['status'] for e in historicos[servico.pk]], ['Aguardando Peças', 'Em Andamento'])
+        self.assertEqual(len(historicos), 2)
+
+        response = self.client.get(reverse('servico-detail', args=[servico.pk]), self.url_params)
+        self.assertEqual(len(response.data['historico']), 3)
+
+    def test_expand_is_ignored_on_writes(self):
+        servico = self.make_servico()
+        response = self.client.patch(
+            reverse('servico-detail', args=[servico.servico_ID]) + '?expand=cliente',
+            {'diagnostico': "Freio"}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['cliente'], servico.cliente_id)
+
+
+class BulkTests(APITestCase):
+    def setUp(self):
+        self.oleo = Insumo.objects.create(nome="Óleo 5W30", preco=45.0, qtd=10, descricao="Sintético")
+        self.filtro = Insumo.objects.create(nome="Filtro", preco=30.0, qtd=4, descricao="Filtro de óleo")
+
+    def test_upserts_and_deletes_in_one_request(self):
+        payload = {
+            'upserts': [
+                {'insumo_ID': self.oleo.insumo_ID, 'preco': 50.0},
+                {'nome': "Pastilha", 'preco': 120.0, 'qtd': 8, 'descricao': "Dianteira"},
+            ],
+            'deletes': [self.filtro.insumo_ID],
+        }
+        response = self.client.post(reverse('insumo-bulk'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['applied'])
+        self.assertEqual([r['op'] for r in response.data['results']], ['update', 'create', 'delete'])
+
+        self.oleo.refresh_from_db()
+        self.assertEqual(self.oleo.preco, 50.0)
+        self.assertTrue(Insumo.objects.filter(pk=response.data['results'][1]['id'], nome="Pastilha").exists())
+        self.assertFalse(Insumo.objects.filter(pk=self.filtro.pk).exists())
+
+    def test_invalid_row_rolls_back_everything(self):
+        payload = {
+            'upserts': [
+                {'insumo_ID': self.oleo.insumo_ID, 'preco': 50.0},
+                {'nome': "Sem preço"},
+            ],
+            'deletes': [self.filtro.insumo_ID, 99999],
+        }
+        response = self.client.post(reverse('insumo-bulk'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data['applied'])
+        self.assertEqual([r['status'] for r in response.data['results']], ['ok', 'error', 'ok', 'error'])
+        self.oleo.refresh_from_db()
+        self.assertEqual(self.oleo.preco, 45.0)
+        self.assertTrue(Insumo.objects.filter(pk=self.filtro.pk).exists())
+
+
+class InventoryTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        self.servico = self.make_servico()
+        response = self.client.post(reverse('insumo-list'), {
+            'nome': "Óleo 5W30", 'preco': 45.0, 'qtd': 10, 'descricao': "Sintético"
+        }, format='json')
+        self.insumo = Insumo.objects.get(pk=response.data['insumo_ID'])
+
+    def movimentar(self, payload):
+        return self.client.post(reverse('movimentoestoque-list'), payload, format='json')
+
+    def assert_saldos(self, qtd, reservada):
+        self.insumo.refresh_from_db()
+        self.assertEqual((self.insumo.qtd, self.insumo.qtd_reservada), (qtd, reservada))
+        self.assertEqual(saldos_do_ledger([self.insumo.pk])[self.insumo.pk], (qtd, reservada))
+
+    def test_reserve_consume_release_cycle(self):
+        base = {'insumo': self.insumo.pk, 'servico': self.servico.pk}
+        self.assertEqual(self.movimentar({**base, 'tipo': 'reserva', 'quantidade': 4}).status_code,
+                         status.HTTP_201_CREATED)
+        self.assert_saldos(10, 4)
+
+        response = self.movimentar([
+            {**base, 'tipo': 'consumo', 'quantidade': 3},
+            {**base, 'tipo': 'liberacao', 'quantidade': 1},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 2)
+        self.assert_saldos(7, 0)
+
+    def test_overdraw_is_rejected_and_nothing_is_written(self):
+        base = {'insumo': self.insumo.pk, 'servico': self.servico.pk}
+        response = self.movimentar([
+            {**base, 'tipo': 'reserva', 'quantidade': 6},
+            {**base, 'tipo': 'reserva', 'quantidade': 6},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assert_saldos(10, 0)
+
+        response = self.movimentar({**base, 'tipo': 'consumo', 'quantidade': 1})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        response = self.movimentar({'insumo': self.insumo.pk, 'tipo': 'reserva', 'quantidade': 1})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_quantity_changes_only_through_movements(self):
+        response = self.client.patch(reverse('insumo-detail', args=[self.insumo.pk]), {'qtd': 50}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.movimentar({'insumo': self.insumo.pk, 'tipo': 'ajuste', 'quantidade': -2})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assert_saldos(8, 0)
+
+    def test_deleting_records_that_cascade_into_movements_is_a_conflict(self):
+        self.movimentar({'insumo': self.insumo.pk, 'servico': self.servico.pk, 'tipo': 'reserva', 'quantidade': 1})
+        for url in (reverse('cliente-detail', args=[self.servico.cliente_id]),
+                    reverse('servico-detail', args=[self.servico.pk])):
+            response = self.client.delete(url)
+            self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+            self.assertIn("movimentos de estoque", response.data['error'])
+        self.assertTrue(Cliente.objects.filter(pk=self.servico.cliente_id).exists())
+
+    def test_bulk_created_items_get_initial_balance(self):
+        response = self.client.post(reverse('insumo-bulk'), {
+            'upserts': [{'nome': "Filtro", 'preco': 30.0, 'qtd': 4, 'descricao': "Filtro de óleo"}]
+        }, format='json')
+        pk = response.data['results'][0]['id']
+        self.assertEqual(saldos_do_ledger([pk])[pk], (4, 0))
+
+
+@override_settings(CHANGE_FEED_LAG_SECONDS=0)
+class LowStockAndChangeFeedTests(APITestCase):
+    def setUp(self):
+        self.oleo = Insumo.objects.create(nome="Óleo 5W30", preco=45.0, qtd=10, descricao="Sintético")
+        self.filtro = Insumo.objects.create(nome="Filtro", preco=30.0, qtd=2, descricao="Filtro de óleo")
+        self.vela = Insumo.objects.create(nome="Vela", preco=20.0, qtd=6, qtd_reservada=3,
+                                          estoque_minimo=4, descricao="Ignição")
+
+    def feed(self, cursor=None):
+        response = self.client.get(reverse('insumo-alteracoes'), {'desde': cursor} if cursor else {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_low_stock_uses_available_quantity_and_threshold(self):
+        response = self.client.get(reverse('insumo-low-stock'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({row['nome'] for row in response.data['results']}, {"Filtro", "Vela"})
+
+    def test_feed_returns_only_changes_since_cursor(self):
+        initial = self.feed()
+        self.assertEqual(len(initial['alterados']), 3)
+        self.assertFalse(initial['mais'])
+        self.assertEqual(self.feed(initial['cursor'])['alterados'], [])
+
+        self.client.patch(reverse('insumo-detail', args=[self.oleo.pk]), {'preco': 50.0}, format='json')
+        self.client.delete(reverse('insumo-detail', args=[self.filtro.pk]))
+        changes = self.feed(initial['cursor'])
+        self.assertEqual([row['insumo_ID'] for row in changes['alterados']], [self.oleo.pk])
+        self.assertEqual(changes['removidos'], [self.filtro.pk])
+
+        caught_up = self.feed(changes['cursor'])
+        self.assertEqual((caught_up['alterados'], caught_up['removidos']), ([], []))
+
+    def test_late_commit_inside_the_lag_window_is_delivered(self):
+        with override_settings(CHANGE_FEED_LAG_SECONDS=60):
+            cursor = self.feed()['cursor']
+            # Confirmada depois da consulta, mas com o timestamp de antes dela
+            Insumo.objects.filter(pk=self.oleo.pk).update(preco=55.0, atualizado_em=self.oleo.atualizado_em)
+            changes = self.feed(cursor)
+        self.assertIn(self.oleo.pk, [row['insumo_ID'] for row in changes['alterados']])
+        # Fora da janela as linhas deixam de ser reenviadas
+        self.assertEqual(self.feed(self.feed(changes['cursor'])['cursor'])['alterados'], [])
+
+    def test_tombstones_are_paged_with_the_same_limit(self):
+        cursor = self.feed()['cursor']
+        InsumoExcluido.objects.bulk_create([InsumoExcluido(insumo_ID=1000 + i) for i in range(3)])
+        response = self.client.get(reverse('insumo-alteracoes'), {'desde': cursor, 'limite': 2})
+        self.assertEqual(response.data['removidos'], [1000, 1001])
+        self.assertTrue(response.data['mais'])
+        response = self.client.get(reverse('insumo-alteracoes'), {'desde': response.data['cursor'], 'limite': 2})
+        self.assertEqual((response.data['removidos'], response.data['mais']), ([1002], False))
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('insumo-alteracoes'), {'desde': 'ontem'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StatusHistoryTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        self.servico = self.make_servico()
+        self.other = self.make_servico(cliente=self.make_cliente(email="ana@example.com", cpf="222.222.222-22"))
+
+    def test_events_are_bulk_inserted_and_listed_as_timeline(self):
+        payload = [
+            {'servico_ID': self.servico.pk, 'status': 'Cadastrado', 'observacao': 'Criada'},
+            {'servico_ID': self.servico.pk, 'status': 'Aprovado', 'status_anterior': 'Cadastrado'},
+            {'servico_ID': self.other.pk, 'status': 'Cadastrado'},
+        ]
+        response = self.client.post(reverse('status-list'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(all(row['data_atualizacao'] for row in response.data))
+
+        response = self.client.get(reverse('servico-historico', args=[self.servico.pk]))
+        self.assertEqual([row['status'] for row in response.data], ['Cadastrado', 'Aprovado'])
+        self.assertEqual(response.data[0]['observacao'], 'Criada')
+
+    def test_latest_event_per_service(self):
+        Status.objects.create(status='Cadastrado', servico_ID=self.servico)
+        Status.objects.create(status='Aprovado', servico_ID=self.servico)
+        Status.objects.create(status='Cadastrado', servico_ID=self.other)
+        response = self.client.get(reverse('status-ultimos'), {'servico_ID': f"{self.servico.pk},{self.other.pk}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({row['servico_ID']: row['status'] for row in response.data},
+                         {self.servico.pk: 'Aprovado', self.other.pk: 'Cadastrado'})
+
+    def test_history_is_append_only(self):
+        evento = Status.objects.create(status='Cadastrado', servico_ID=self.servico)
+        url = reverse('status-detail', args=[evento.pk])
+        self.assertEqual(self.client.patch(url, {'status': 'Entregue'}, format='json').status_code,
+                         status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        response = self.client.post(reverse('status-list'), {'status': 'Aprovado'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TransitionTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        self.servico = self.make_servico(status_atual='Em Andamento')
+        self.url = reverse('servico-transition', args=[self.servico.pk])
+
+    def test_allowed_transition_updates_status_and_history_and_returns_card(self):
+        response = self.client.post(self.url, {'status': 'Aguardando Peças', 'observacao': 'Falta filtro'},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], str(self.servico.pk))
+        self.assertEqual(response.data['status'], 'Aguardando Peças')
+
+        self.servico.refresh_from_db()
+        self.assertEqual(self.servico.status_atual, 'Aguardando Peças')
+        evento = Status.objects.get(servico_ID=self.servico)
+        self.assertEqual((evento.status_anterior, evento.status, evento.observacao),
+                         ('Em Andamento', 'Aguardando Peças', 'Falta filtro'))
+
+    def test_transition_outside_state_machine_is_rejected(self):
+        response = self.client.post(self.url, {'status': 'Entregue'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.servico.refresh_from_db()
+        self.assertEqual(self.servico.status_atual, 'Em Andamento')
+        self.assertFalse(Status.objects.exists())
+
+    def test_stale_expected_status_is_rejected(self):
+        response = self.client.post(self.url, {'status': 'Finalizado', 'status_atual': 'Aprovado'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        response = self.client.post(reverse('servico-transition', args=[9999]), {'status': 'Finalizado'},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ClienteLookupTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        self.cliente = self.make_cliente(email="Maria.Souza@Example.com")
+
+    def test_lookup_ignores_case(self):
+        response = self.client.get(reverse('cliente-lookup'), {'email': ' maria.souza@example.COM '})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['cliente_ID'], self.cliente.pk)
+
+        response = self.client.get(reverse('cliente-lookup'), {'email': 'ninguem@example.com'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_duplicate_email_in_other_case_is_rejected(self):
+        response = self.client.post(reverse('cliente-list'), {
+            'nome': "Outra Maria", 'email': "MARIA.SOUZA@example.com", 'cpf': "999.999.999-99",
+            'telefone': "11999999999", 'endereco_ID': self.cliente.endereco_ID_id,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+
+
+class ServicoQuerysetTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        self.ativo = self.make_servico(status_atual='Em Andamento')
+        self.entregue = self.make_servico(
+            cliente=self.make_cliente(email="ana@example.com", cpf="222.222.222-22"), status_atual='Entregue'
+        )
+
+    def test_ativos_action_is_routed_and_filters(self):
+        response = self.client.get(reverse('servico-ativos'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['servico_ID'] for row in response.data['results']], [self.ativo.pk])
+
+    def test_sparse_fields_select_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('servico-list'), {'fields': 'servico_ID,status_atual'})
+        self.assertEqual(set(response.data['results'][0]), {'servico_ID', 'status_atual'})
+        # A primeira consulta é a das versões do cache de respostas
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('diagnostico', queries[1]['sql'])
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        # As versões do cache só são incrementadas no commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mecanico = Mecanico.objects.create(nome="João Silva", telefone="11988888888",
+                                                    email="joao@example.com")
+
+    def test_unchanged_list_returns_304_without_serializing(self):
+        response = self.client.get(reverse('mecanico-list'))
+        etag = response['ETag']
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('mecanico-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(reverse('mecanico-list'), {'fields': 'nome'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_writes_change_the_etag(self):
+        url = reverse('mecanico-detail', args=[self.mecanico.pk])
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {'telefone': "11900000000"}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('mecanico-bulk'),
+                             {'upserts': [{'mecanico_ID': self.mecanico.pk, 'nome': "João"}]}, format='json')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_write_in_the_same_second_is_not_hidden(self):
+        url = reverse('mecanico-detail', args=[self.mecanico.pk])
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {'telefone': "11900000000"}, format='json')
+
+        # If-Modified-Since com a hora da leitura: a gravação caiu no mesmo segundo
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time()))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['telefone'], "11900000000")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=http_date(time.time()))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_version_is_bumped_only_after_commit(self):
+        versao = get_version(Mecanico)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Mecanico.objects.create(nome="Ana", telefone="11977777777", email="ana@example.com")
+            # Nenhuma trava na linha do contador enquanto a transação do escritor está aberta
+            self.assertEqual(get_version(Mecanico), versao)
+        callbacks[0]()
+        self.assertEqual(get_version(Mecanico)[0], versao[0] + 1)
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.insumo = Insumo.objects.create(nome="Óleo 5W30", preco=45.0, qtd=10, descricao="Sintético")
+
+    def test_repeated_list_is_served_from_cache(self):
+        first = self.client.get(reverse('insumo-list'))
+        with self.assertNumQueries(1):
+            second = self.client.get(reverse('insumo-list'))
+        self.assertEqual(second.data, first.data)
+        # Os contadores ficam no processo até o próximo envio em lote
+        self.assertIsNone(cache.get(HITS_KEY))
+
+        stats = self.client.get(reverse('cache-stats')).data
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_writes_invalidate_cached_payload(self):
+        url = reverse('insumo-detail', args=[self.insumo.pk])
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {'nome': "Óleo 10W40"}, format='json')
+        self.assertEqual(self.client.get(url).data['nome'], "Óleo 10W40")
+
+        # Movimentos atualizam o saldo com update(), sem post_save
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('movimentoestoque-list'),
+                             {'insumo': self.insumo.pk, 'tipo': 'entrada', 'quantidade': 5}, format='json')
+        self.assertEqual(self.client.get(url).data['qtd'], 15)
+
+
+class ExportTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        self.finalizado = self.make_servico(status_atual='Finalizado', orcamento="150.50")
+        self.make_servico(cliente=self.make_cliente(email="ana@example.com", cpf="222.222.222-22"))
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export_streams_filtered_rows(self):
+        response = self.client.get(reverse('servico-export'),
+                                   {'status_atual': 'Finalizado', 'fields': 'servico_ID,orcamento,status_atual'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertEqual(self.read(response).splitlines(), [
+            'servico_ID,orcamento,status_atual',
+            f'{self.finalizado.servico_ID},150.50,Finalizado',
+        ])
+
+    def test_ndjson_export(self):
+        response = self.client.get(reverse('servico-export'), {'formato': 'ndjson'})
+        linhas = [json.loads(linha) for linha in self.read(response).splitlines()]
+        self.assertEqual(len(linhas), 2)
+        self.assertEqual(linhas[0]['orcamento'], 150.5)
+        self.assertEqual(linhas[0]['cliente'], self.finalizado.cliente_id)
+
+    def test_invalid_format_and_fields(self):
+        self.assertEqual(self.client.get(reverse('insumo-export'), {'formato': 'xls'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('pagamento-export'), {'fields': 'senha'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+
+class ColumnarFormatTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        Insumo.objects.create(nome="Óleo 5W30", preco="45.90", qtd=10, descricao="Sintético")
+        Insumo.objects.create(nome="Filtro", preco="30.00", qtd=4, descricao="Filtro de óleo")
+
+    def test_columnar_json_has_one_array_per_column(self):
+        response = self.client.get(reverse('insumo-list'), {'fields': 'nome,preco', 'page_size': 1},
+                                   HTTP_ACCEPT=ColumnarJSONRenderer.media_type)
+        self.assertEqual(response['Content-Type'], ColumnarJSONRenderer.media_type)
+        page = json.loads(response.content)
+        self.assertEqual(page['columns'], ['preco', 'nome'])
+        self.assertEqual(page['data'], {'nome': ["Filtro"], 'preco': [30.0]})
+        self.assertIsNotNone(page['next'])
+
+    @unittest.skipIf(pa is None, "pyarrow não instalado")
+    def test_arrow_stream_round_trip(self):
+        response = self.client.get(reverse('insumo-list'), {'fields': 'nome,preco'},
+                                   HTTP_ACCEPT=ArrowStreamRenderer.media_type)
+        table = pa.ipc.open_stream(response.content).read_all()
+        self.assertEqual(table.column_names, ['preco', 'nome'])
+        self.assertEqual(table.column('preco').to_pylist(), [30.0, 45.9])
+        self.assertEqual(table.schema.metadata[b'next'], b'')
+
+    def test_errors_stay_json(self):
+        response = self.client.get(reverse('insumo-detail', args=[0]), HTTP_ACCEPT=ColumnarJSONRenderer.media_type)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('detail', json.loads(response.content))
+
+
+class RevenueRollupTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        self.pago = Pagamento.objects.create(valor_final="100.00", valor_total="100.00",
+                                             metodo_pagamento="pix", status="Pago")
+        self.janeiro = self.make_servico(pagamento=self.pago, orcamento="100.00")
+        self.fevereiro = self.make_servico(
+            cliente=self.make_cliente(email="ana@example.com", cpf="222.222.222-22"),
+            data_entrada="2025-02-03", data_saida="2025-02-10",
+        )
+
+    def rollup(self):
+        return {
+            (linha.mes.isoformat(), linha.metodo_pagamento, linha.status_pagamento): (linha.servicos, linha.valor_final)
+            for linha in ReceitaMensal.objects.all()
+        }
+
+    def test_rollup_follows_servico_and_pagamento_writes(self):
+        self.assertEqual(self.rollup(), {
+            ('2025-01-01', "pix", "Pago"): (1, Decimal("100.00")),
+            ('2025-02-01', "pix", "Pendente"): (1, Decimal("150.00")),
+        })
+
+        pagamento = self.fevereiro.pagamento
+        pagamento.status, pagamento.metodo_pagamento = "Pago", "cartao"
+        pagamento.save()
+        self.janeiro.data_entrada = "2025-02-20"
+        self.janeiro.save()
+        self.assertEqual(self.rollup(), {
+            ('2025-02-01', "pix", "Pago"): (1, Decimal("100.00")),
+            ('2025-02-01', "cartao", "Pago"): (1, Decimal("150.00")),
+        })
+
+        self.fevereiro.delete()
+        self.assertEqual(self.rollup(), {('2025-02-01', "pix", "Pago"): (1, Decimal("100.00"))})
+
+    def test_loaded_servico_does_not_reread_its_month(self):
+        servico = Servico.objects.get(pk=self.janeiro.pk)
+        servico.data_entrada = "2025-02-20"
+        with CaptureQueriesContext(connection) as queries:
+            servico.save()
+        self.assertFalse([q for q in queries if q['sql'].startswith('SELECT "core_servico"."data_entrada"')])
+        self.assertNotIn('2025-01-01', {chave[0] for chave in self.rollup()})
+
+    def test_rebuild_matches_incremental_rollup(self):
+        antes = self.rollup()
+        ReceitaMensal.objects.all().delete()
+        self.assertEqual(reconstruir(), len(agregar(Servico.objects.all())))
+        self.assertEqual(self.rollup(), antes)
+
+    def test_revenue_endpoint_reads_the_rollup(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('reports-revenue'), {'de': '2025-01', 'ate': '2025-01'})
+        self.assertEqual(response.data['total'], Decimal("100.00"))
+        self.assertEqual(response.data['por_metodo'], [{'metodo': "pix", 'total': Decimal("100.00"), 'servicos': 1}])
+
+        response = self.client.get(reverse('reports-revenue'), {'status': 'Pago,Pendente'})
+        self.assertEqual([mes['servicos'] for mes in response.data['meses']], [1, 1])
+        self.assertEqual(self.client.get(reverse('reports-revenue'), {'de': '2025'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+
+class ServicoSearchTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        self.freio = self.make_servico(descricao_servico="Troca das pastilhas de freio")
+        self.ana = self.make_servico(
+            cliente=self.make_cliente(nome="Ana Lima", email="ana@example.com", cpf="222.222.222-22"),
+        )
+
+    def search(self, q, **params):
+        return self.client.get(reverse('search-servicos'), {'q': q, **params})
+
+    def test_matches_description_client_and_plate(self):
+        response = self.search("freio")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([card['id'] for card in response.data['results']], [str(self.freio.pk)])
+        self.assertEqual(response.data['results'][0]['client'], "Maria Souza")
+
+        self.assertEqual([card['id'] for card in self.search("ana lima").data['results']], [str(self.ana.pk)])
+        self.assertEqual(self.search("abc1d").data['count'], 2)
+
+    def test_paginates_and_validates_query(self):
+        response = self.search("abc1d", limit=1)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+        self.assertEqual(self.search("a").status_code, status.HTTP_400_BAD_REQUEST)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "busca textual exige PostgreSQL")
+    def test_full_text_uses_portuguese_stemming(self):
+        response = self.search("pastilha")
+        self.assertEqual([card['id'] for card in response.data['results']], [str(self.freio.pk)])
+        self.assertGreater(response.data['results'][0]['rank'], 0)
+
+
+class StubCepFetcher:
+    """Substitui o ViaCEP nos testes: responde só ao CEP 01310100 e falha no 99999999."""
+    chamadas = []
+
+    def __call__(self, cep):
+        self.chamadas.append(cep)
+        if cep == '99999999':
+            raise CepUpstreamException("Serviço indisponível")
+        if cep == '01310100':
+            return {'logradouro': "Avenida Paulista", 'complemento': "", 'bairro': "Bela Vista",
+                    'localidade': "São Paulo", 'uf': "SP"}
+        return None
+
+
+@override_settings(CEP_FETCHER='api.tests.StubCepFetcher')
+class CepTests(APITestCase):
+    def setUp(self):
+        limpar_cache()
+        StubCepFetcher.chamadas = []
+        Cep.objects.create(cep='01001000', logradouro="Praça da Sé", bairro="Sé", localidade="São Paulo", uf="SP")
+
+    def get(self, cep):
+        return self.client.get(reverse('cep', args=[cep]))
+
+    def test_local_table_then_lru(self):
+        response = self.get('01001-000')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['logradouro'], "Praça da Sé")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get('01001000').data['bairro'], "Sé")
+        self.assertEqual(StubCepFetcher.chamadas, [])
+
+    def test_missing_cep_is_fetched_once_and_stored(self):
+        self.assertEqual(self.get('01310100').data['logradouro'], "Avenida Paulista")
+        self.assertEqual(Cep.objects.get(pk='01310100').origem, Cep.EXTERNO)
+        limpar_cache()
+        self.get('01310100')
+        self.assertEqual(StubCepFetcher.chamadas, ['01310100'])
+
+    def test_unknown_cep_is_remembered(self):
+        self.assertEqual(self.get('00000000').status_code, status.HTTP_404_NOT_FOUND)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get('00000000').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(StubCepFetcher.chamadas, ['00000000'])
+
+    def test_errors(self):
+        self.assertEqual(self.get('123').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get('00000000').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.get('99999999').status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_bulk_load_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as arquivo:
+            arquivo.write("cep;logradouro;complemento;bairro;localidade;uf\n"
+                          "01001-000;Praça da Sé;lado ímpar;Sé;São Paulo;SP\n"
+                          "20040020;Avenida Rio Branco;;Centro;Rio de Janeiro;RJ\n"
+                          "inválido;;;;;\n")
+        self.addCleanup(os.remove, arquivo.name)
+        self.get('01001000')
+        call_command('carregar_ceps', arquivo.name, delimitador=';', stdout=io.StringIO())
+
+        self.assertEqual(Cep.objects.count(), 2)
+        self.assertEqual(self.get('01001000').data['complemento'], "lado ímpar")
+        self.assertEqual(self.get('20040020').data['localidade'], "Rio de Janeiro")
+
+
+class OrdemServicoTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        existente = self.make_servico()
+        self.payload = {
+            'cliente': existente.cliente_id,
+            'carro': existente.carro_id,
+            'mecanico': existente.mecanico_id,
+            'diagnostico': "Freio fazendo barulho",
+            'descricao_servico': "Troca de pastilhas",
+            'orcamento': "320.00",
+            'data_entrada': "2025-03-01",
+            'data_saida': "2025-03-04",
+            'status_atual': "Aguardando Aprovação",
+            'home_service': True,
+            'pagamento': {'valor_final': "320.00", 'valor_total': "320.00",
+                          'metodo_pagamento': "Pix", 'status': "Pendente"},
+            'endereco': {'cep': "01310100", 'rua': "Avenida Paulista", 'bairro': "Bela Vista", 'numero': "1000",
+                         'cidade': "São Paulo", 'estado': "SP"},
+        }
+
+    def test_creates_the_whole_order(self):
+        response = self.client.post(reverse('ordens'), self.payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['status'], "Aguardando Aprovação")
+
+        servico = Servico.objects.get(pk=response.data['id'])
+        self.assertEqual(servico.pagamento.valor_final, Decimal("320.00"))
+        self.assertEqual(servico.service_address.rua, "Avenida Paulista")
+        evento = Status.objects.get(servico_ID=servico)
+        self.assertEqual((evento.status, evento.observacao), ("Aguardando Aprovação", "Ordem de serviço criada"))
+
+    def test_invalid_order_writes_nothing(self):
+        contagens = (Pagamento.objects.count(), Endereco.objects.count(), Servico.objects.count())
+        for alteracao in ({'carro': 0}, {'service_address': Endereco.objects.first().pk},
+                          {'pagamento': {'valor_final': "abc"}}):
+            response = self.client.post(reverse('ordens'), {**self.payload, **alteracao}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual((Pagamento.objects.count(), Endereco.objects.count(), Servico.objects.count()), contagens)
+
+class ClienteCadastroTests(WorkshopFixtureMixin, APITestCase):
+    def setUp(self):
+        self.existente = self.make_cliente()
+        self.payload = {
+            'nome': "João Lima", 'email': "joao@example.com", 'cpf': "222.222.222-22", 'telefone': "11988887777",
+            'endereco': {'cep': "01001-000", 'rua': "praca  da se", 'bairro': "SÉ", 'numero': "1",
+                         'cidade': "Sao Paulo", 'estado': "sp"},
+        }
+
+    def test_same_address_in_other_spelling_is_reused(self):
+        response = self.client.post(reverse('cliente-cadastro'), self.payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(response.data['endereco_existente'])
+        self.assertEqual(Endereco.objects.count(), 1)
+        self.assertEqual(Cliente.objects.get(pk=response.data['cliente_ID']).endereco_ID, self.existente.endereco_ID)
+
+        novo = {**self.payload, 'email': "ana@example.com", 'cpf': "333.333.333-33",
+                'endereco': {**self.payload['endereco'], 'numero': "2"}}
+        response = self.client.post(reverse('cliente-cadastro'), novo, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response.data['endereco_existente'])
+        self.assertEqual(response.data['endereco']['numero'], "2")
+        self.assertEqual(Endereco.objects.count(), 2)
+
+    def test_invalid_client_creates_nothing(self):
+        response = self.client.post(reverse('cliente-cadastro'), {**self.payload, 'email': "MARIA@example.com",
+                                                                  'endereco': {**self.payload['endereco'], 'numero': "9"}},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual((Cliente.objects.count(), Endereco.objects.count()), (1, 1))
+
+    def test_editing_into_an_existing_address_is_rejected(self):
+        outro, _ = Endereco.objects.obter_ou_criar(cep="01310100", rua="Avenida Paulista", bairro="Bela Vista",
+                                                   numero="1000", cidade="São Paulo", estado="SP")
+        response = self.client.patch(reverse('endereco-detail', args=[outro.pk]),
+                                     {'rua': "Praça da Sé", 'numero': "1", 'bairro': "Sé", 'cep': "01001000"},
+                                     format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(reverse('endereco-list'), {**self.payload['endereco']}, format='json')
+        self.assertEqual(response.data['endereco_ID'], self.existente.endereco_ID_id)
+
+    def test_shared_address_is_not_edited_in_place(self):
+        vizinho = self.make_cliente(nome="Ana Lima", email="ana@example.com", cpf="333.333.333-33")
+        endereco = self.existente.endereco_ID
+        response = self.client.patch(reverse('endereco-detail', args=[endereco.pk]), {'numero': "5"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        endereco.refresh_from_db()
+        self.assertEqual(endereco.numero, "1")
+
+        # Cópia na escrita: só o cliente editado passa para o novo endereço
+        response = self.client.put(reverse('cliente-endereco', args=[self.existente.pk]),
+                                   {**self.payload['endereco'], 'numero': "5"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['endereco']['numero'], "5")
+        self.existente.refresh_from_db()
+        vizinho.refresh_from_db()
+        self.assertNotEqual(self.existente.endereco_ID_id, endereco.pk)
+        self.assertEqual(vizinho.endereco_ID_id, endereco.pk)
+
+        # O último cliente a sair reaproveita o endereço novo e o antigo, órfão, é apagado
+        self.client.put(reverse('cliente-endereco', args=[vizinho.pk]),
+                        {**self.payload['endereco'], 'numero': "5"}, format='json')
+        vizinho.refresh_from_db()
+        self.assertEqual(vizinho.endereco_ID_id, self.existente.endereco_ID_id)
+        self.assertFalse(Endereco.objects.filter(pk=endereco.pk).exists())
+
+    def test_referenced_address_cannot_be_deleted(self):
+        self.make_cliente(nome="Ana Lima", email="ana@example.com", cpf="333.333.333-33")
+        url = reverse('endereco-detail', args=[self.existente.endereco_ID_id])
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Cliente.objects.count(), 2)
+
+        orfao, _ = Endereco.objects.obter_ou_criar(cep="01310100", rua="Avenida Paulista", bairro="Bela Vista",
+                                                   numero="1000", cidade="São Paulo", estado="SP")
+        response = self.client.delete(reverse('endereco-detail', args=[orfao.pk]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_deduplicate_command_merges_legacy_copies(self):
+        # Cópia anterior ao hash: mesmo conteúdo, hash_conteudo nulo
+        copia = Endereco.objects.create(cep="00000000", rua="-", bairro="-", numero="0", cidade="-", estado="-")
+        Endereco.objects.filter(pk=copia.pk).update(**{campo: getattr(self.existente.endereco_ID, campo) for campo in
+                                                       ('cep', 'rua', 'bairro', 'numero', 'cidade', 'estado')},
+                                                    hash_conteudo=None)
+        cliente = self.make_cliente(nome="Ana", email="ana@example.com", cpf="333.333.333-33")
+        Cliente.objects.filter(pk=cliente.pk).update(endereco_ID=copia)
+
+        call_command('deduplicar_enderecos', stdout=io.StringIO())
+        self.assertEqual(list(Endereco.objects.values_list('pk', flat=True)), [self.existente.endereco_ID_id])
+        cliente.refresh_from_db()
+        self.assertEqual(cliente.endereco_ID_id, self.existente.endereco_ID_id)
+
+    def test_deduplicate_dry_run_reports_the_same_merges(self):
+        # Duas cópias legadas de um conteúdo que ainda não tem hash algum
+        for _ in range(2):
+            copia = Endereco.objects.create(cep="00000000", rua="-", bairro="-", numero="0", cidade="-", estado="-")
+            Endereco.objects.filter(pk=copia.pk).update(rua="Rua Nova", hash_conteudo=None)
+        relatorios = []
+        for opcoes in ({'dry_run': True}, {}):
+            saida = io.StringIO()
+            call_command('deduplicar_enderecos', stdout=saida, **opcoes)
+            relatorios.append(saida.getvalue().replace('[dry-run] ', ''))
+        self.assertEqual(relatorios[0], relatorios[1])
+        self.assertIn('1 endereços duplicados unificados, 1 receberam o hash', relatorios[1])
+        self.assertEqual(Endereco.objects.filter(rua="Rua Nova").count(), 1)
+
+
+class SeedWorkshopTests(WorkshopFixtureMixin, APITestCase):
+    def seed(self, **options):
+        call_command('seed_workshop', clientes=30, mecanicos=3, insumos=10, seed=7, hoje=date(2026, 1, 15),
+                     processos=1, stdout=io.StringIO(), **options)
+
+    def test_generates_consistent_workshop(self):
+        self.seed()
+        self.assertEqual((Cliente.objects.count(), Endereco.objects.count(), Mecanico.objects.count()), (30, 30, 3))
+        self.assertEqual(Servico.objects.count(), Pagamento.objects.count())
+        self.assertGreaterEqual(Servico.objects.count(), 30)
+
+        for servico in Servico.objects.prefetch_related('historico'):
+            eventos = sorted(servico.historico.all(), key=lambda evento: evento.data_atualizacao)
+            self.assertEqual(eventos[0].status, 'Cadastrado')
+            self.assertEqual(eventos[-1].status, servico.status_atual)
+            for anterior, evento in zip(eventos, eventos[1:]):
+                self.assertIn(evento.status, Servico.TRANSITIONS[anterior.status])
+                self.assertEqual(evento.status_anterior, anterior.status)
+
+        saldos = {insumo.pk: (insumo.qtd, insumo.qtd_reservada) for insumo in Insumo.objects.all()}
+        self.assertEqual(saldos_do_ledger(), saldos)
+        self.assertEqual(ReceitaMensal.objects.count(), len(agregar(Servico.objects.all())))
+
+        # Os IDs explícitos da carga não podem colidir com os próximos cadastros
+        cliente = self.make_cliente(cpf="999.999.999-99", email="novo@example.com")
+        self.assertGreater(cliente.pk, Cliente.objects.exclude(pk=cliente.pk).order_by('-pk').first().pk)
+
+    def test_same_seed_generates_same_rows(self):
+        plano = planejar(2500, 3, 10, seed=7, hoje=date(2026, 1, 15))
+        self.assertEqual(gerar_linhas(plano, 2), gerar_linhas(plano, 2))
+        self.assertNotEqual(gerar_linhas(plano, 1), gerar_linhas(plano, 2))
+        self.assertEqual(len(gerar_linhas(plano, 2)[Cliente]), 500)
+        self.assertNotEqual(gerar_linhas({**plano, 'seed': 8}, 2), gerar_linhas(plano, 2))
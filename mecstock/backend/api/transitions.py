@@ -0,0 +1,50 @@
+from django.db import transaction
+
+from core.models import Servico, Status
+from core.versioning import bump_version
+from .kanban import annotate_cards, servico_to_card
+
+
+class TransitionError(Exception):
+    """Mudança de status recusada; ``status_code`` é o código HTTP da resposta."""
+    def __init__(self, message, status_code):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(self.message)
+
+
+def transition_servico(servico_id, novo_status, observacao='', status_esperado=None):
+    """
+    Move o serviço para ``novo_status`` e devolve o card atualizado.
+
+    A mudança é validada contra ``Servico.TRANSITIONS`` e aplicada em uma transação:
+    um UPDATE condicional (``WHERE status_atual = <status lido>``) troca o status e o
+    evento é gravado no histórico. Se outro pedido mudou o status no meio do caminho, o
+    UPDATE não afeta nenhuma linha e nada é gravado. ``status_esperado`` permite ao
+    cliente exigir que o serviço ainda esteja no status que ele exibiu.
+    """
+    if novo_status not in Servico.TRANSITIONS:
+        raise TransitionError(f"Status inválido: {novo_status}", 400)
+    if not str(servico_id).isdigit():
+        raise TransitionError(f"Serviço {servico_id} não encontrado", 404)
+
+    with transaction.atomic():
+        atual = Servico.objects.filter(pk=servico_id).values_list('status_atual', flat=True).first()
+        if atual is None:
+            raise TransitionError(f"Serviço {servico_id} não encontrado", 404)
+        if status_esperado and status_esperado != atual:
+            raise TransitionError(f"O serviço já está em '{atual}'", 409)
+        if novo_status not in Servico.TRANSITIONS.get(atual, []):
+            permitidos = ', '.join(Servico.TRANSITIONS.get(atual, [])) or 'nenhum'
+            raise TransitionError(
+                f"Transição de '{atual}' para '{novo_status}' não permitida (permitidos: {permitidos})", 409
+            )
+
+        updated = Servico.objects.filter(pk=servico_id, status_atual=atual).update(status_atual=novo_status)
+        if not updated:
+            raise TransitionError("O status do serviço foi alterado por outra requisição", 409)
+        bump_version(Servico)
+        Status.objects.create(servico_ID_id=servico_id, status=novo_status, status_anterior=atual,
+                              observacao=observacao or '')
+
+    return servico_to_card(annotate_cards(Servico.objects.filter(pk=servico_id)).get())
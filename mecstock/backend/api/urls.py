@@ -11,7 +11,14 @@ router.register(r'servicos', views.ServicoViewSet)
 router.register(r'enderecos', views.EnderecoViewSet)
 router.register(r'insumos', views.InsumoViewSet)
 router.register(r'status', views.StatusViewSet)
+router.register(r'movimentos-estoque', views.MovimentoEstoqueViewSet)
 
 urlpatterns = [
+    path('cache/stats/', views.CacheStatsView.as_view(), name='cache-stats'),
+    path('ordens/', views.OrdemServicoView.as_view(), name='ordens'),
+    path('cep/<str:cep>/', views.CepView.as_view(), name='cep'),
+    path('search/servicos/', views.ServicoSearchView.as_view(), name='search-servicos'),
+    path('reports/revenue/', views.RevenueReportView.as_view(), name='reports-revenue'),
+    path('dashboard/summary/', views.DashboardSummaryView.as_view(), name='dashboard-summary'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -0,0 +1,8 @@
+def query_param_set(request, param):
+    """Lê um parâmetro separado por vírgulas de uma requisição GET; None quando ausente."""
+    if request is None or request.method != 'GET':
+        return None
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
@@ -1,33 +1,279 @@
-from rest_framework import viewsets, status
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import mixins, viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from core.models import Cliente, Carro, Pagamento, Mecanico, Servico, Endereco, Insumo, Status
+from rest_framework.views import APIView
+from core.cep.exceptions import CepUpstreamException, InvalidCepException
+from core.cep.services import buscar_cep
+from core.inventory.exceptions import InvalidMovementException, InventoryException
+from core.inventory.services import movimentar, registrar_saldos_iniciais
+from core.models import (
+    Cliente, Carro, Pagamento, Mecanico, Servico, Endereco, Insumo, InsumoExcluido, Status, MovimentoEstoque
+)
+from core.versioning import bump_version
+from .bulk import BulkMixin
+from .caching import CachedResponseMixin, cache_stats
+from .changefeed import DEFAULT_FEED_LIMIT, build_change_feed, parse_cursor
+from .dashboard import build_dashboard_summary
+from .exports import ExportMixin
+from .filters import QueryParamFilterMixin
+from .kanban import DEFAULT_CARDS_PER_STATUS, MAX_CARDS_PER_STATUS, annotate_cards, build_kanban_board, servico_to_card
+from .pagination import SearchPagination
+from .renderers import ColumnarRenderMixin
+from .reports import build_payment_report, build_revenue_report
+from .search import search_servicos
 from .serializers import (
-    ClienteSerializer, CarroSerializer, PagamentoSerializer, 
+    ClienteSerializer, ClienteCadastroSerializer, CarroSerializer, PagamentoSerializer, 
     MecanicoSerializer, ServicoSerializer, EnderecoSerializer,
-    InsumoSerializer, StatusSerializer
+    InsumoSerializer, StatusSerializer, MovimentoEstoqueSerializer, OrdemServicoSerializer
 )
+from .transitions import TransitionError, transition_servico
+from .utils import query_param_set
+
+class ExpandableQuerysetMixin:
+    """
+    Monta o queryset com os joins que o serializer vai precisar: relações expandidas
+    via ``?expand=`` entram em select_related (FK) ou prefetch_related (reversas),
+    mantendo o número de consultas constante em relação ao número de linhas.
+    """
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        expansions_for = getattr(self.get_serializer_class(), 'expansions_for', None)
+        if expansions_for is None:
+            return queryset
+
+        select, prefetch = [], []
+        for name in sorted(expansions_for(self.request)):
+            field = queryset.model._meta.get_field(name)
+            if field.many_to_one or field.one_to_one:
+                select.append(name)
+            else:
+                prefetch.append(self.get_expansion_prefetch(name))
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+    def get_expansion_prefetch(self, name):
+        """Nome ou ``Prefetch`` de uma relação reversa expandida; sobrescreva para limitá-la."""
+        return name
+
+class SparseQuerysetMixin:
+    """
+    Com ``?fields=a,b``, carrega do banco apenas essas colunas (``only()``), a chave
+    primária e as relações que serão expandidas, em vez da linha inteira.
+    """
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = query_param_set(self.request, 'fields')
+        if requested is None:
+            return queryset
+
+        expansions_for = getattr(self.get_serializer_class(), 'expansions_for', None)
+        wanted = requested | (expansions_for(self.request) if expansions_for else set())
+        model = queryset.model
+        columns = [field.name for field in model._meta.concrete_fields if field.name in wanted]
+        return queryset.only(model._meta.pk.name, *columns)
 
-class ClienteViewSet(viewsets.ModelViewSet):
+class ClienteViewSet(CachedResponseMixin, ColumnarRenderMixin, BulkMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Cliente.objects.all()
     serializer_class = ClienteSerializer
 
-class CarroViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'], url_path='lookup')
+    def lookup(self, request):
+        """Cliente pelo email (sem diferenciar maiúsculas), usando o índice em LOWER(email)."""
+        email = request.query_params.get('email', '').strip()
+        if not email:
+            return Response({"error": "Informe o email"}, status=status.HTTP_400_BAD_REQUEST)
+        cliente = Cliente.por_email(email).first()
+        if cliente is None:
+            return Response({"error": "Cliente não encontrado"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self.get_serializer(cliente).data)
+
+    @action(detail=False, methods=['post'], url_path='cadastro')
+    def cadastro(self, request):
+        """
+        Cadastra o cliente com o endereço aninhado em uma única transação. Um endereço
+        já cadastrado (mesmo conteúdo normalizado) é reaproveitado em vez de duplicado.
+        """
+        serializer = ClienteCadastroSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        data = serializer.data
+        data['endereco_existente'] = not serializer.endereco_criado
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['put'], url_path='endereco')
+    def endereco(self, request, pk=None):
+        """
+        Troca o endereço só deste cliente (cópia na escrita): o novo conteúdo é resolvido
+        pelo hash, reaproveitando um endereço igual, e os demais clientes que compartilhavam
+        o endereço antigo não mudam. O endereço antigo é apagado se ficar sem referências.
+        """
+        cliente = self.get_object()
+        serializer = EnderecoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            novo, _ = Endereco.objects.obter_ou_criar(**serializer.validated_data)
+            antigo = cliente.endereco_ID
+            cliente.endereco_ID = novo
+            cliente.save(update_fields=['endereco_ID'])
+            if antigo.pk != novo.pk and not antigo.referencias():
+                antigo.delete()
+        return Response(ClienteCadastroSerializer(cliente).data)
+
+class CarroViewSet(CachedResponseMixin, ColumnarRenderMixin, BulkMixin, SparseQuerysetMixin, QueryParamFilterMixin, viewsets.ModelViewSet):
     queryset = Carro.objects.all()
     serializer_class = CarroSerializer
+    filter_params = {'cliente': 'Customer_ID'}
 
-class PagamentoViewSet(viewsets.ModelViewSet):
+class PagamentoViewSet(CachedResponseMixin, ColumnarRenderMixin, ExportMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Pagamento.objects.all()
     serializer_class = PagamentoSerializer
 
-class MecanicoViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'], url_path='relatorio')
+    def relatorio(self, request):
+        """Totais recebidos, pendentes, por método e por mês, lidos do agregado mensal."""
+        return Response(build_payment_report())
+
+class MecanicoViewSet(CachedResponseMixin, ColumnarRenderMixin, BulkMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Mecanico.objects.all()
     serializer_class = MecanicoSerializer
 
-class ServicoViewSet(viewsets.ModelViewSet):
+@method_decorator(name='list', decorator=swagger_auto_schema(
+    operation_summary="Lista todos os serviços",
+    operation_description="Retorna os serviços cadastrados, paginados por cursor. Aceita filtros, ?fields= e ?expand=."
+))
+@method_decorator(name='retrieve', decorator=swagger_auto_schema(
+    operation_summary="Detalha um serviço específico",
+    operation_description="Retorna os detalhes completos de um serviço específico."
+))
+@method_decorator(name='create', decorator=swagger_auto_schema(
+    operation_summary="Cria um novo serviço",
+    operation_description="Cria um novo serviço com os dados fornecidos."
+))
+@method_decorator(name='update', decorator=swagger_auto_schema(
+    operation_summary="Atualiza um serviço",
+    operation_description="Atualiza todos os campos de um serviço existente."
+))
+@method_decorator(name='partial_update', decorator=swagger_auto_schema(
+    operation_summary="Atualiza parcialmente um serviço",
+    operation_description="Atualiza apenas os campos fornecidos de um serviço existente."
+))
+@method_decorator(name='destroy', decorator=swagger_auto_schema(
+    operation_summary="Remove um serviço",
+    operation_description="Remove permanentemente um serviço do sistema."
+))
+class ServicoViewSet(CachedResponseMixin, ColumnarRenderMixin, ExportMixin, SparseQuerysetMixin, ExpandableQuerysetMixin, QueryParamFilterMixin, viewsets.ModelViewSet):
+    """
+    API endpoint para gerenciamento de serviços.
+    """
     queryset = Servico.objects.all()
     serializer_class = ServicoSerializer
+    filter_params = {
+        'cliente': 'cliente',
+        'carro': 'carro',
+        'mecanico': 'mecanico',
+        'status_atual': 'status_atual__in',
+        'data_entrada_de': 'data_entrada__gte',
+        'data_entrada_ate': 'data_entrada__lte',
+        'data_saida_de': 'data_saida__gte',
+        'data_saida_ate': 'data_saida__lte',
+    }
+
+    def get_cache_dependencies(self):
+        # Relações expandidas entram no payload; alterações nelas também invalidam o cache
+        expandable = self.get_serializer_class().expandable_fields
+        return [Servico] + [
+            expandable[name][0].Meta.model
+            for name in sorted(self.get_serializer_class().expansions_for(self.request))
+        ]
+
+    def get_expansion_prefetch(self, name):
+        # Nas listagens, ?expand=historico traz só os eventos mais recentes de cada serviço
+        # (ROW_NUMBER() por serviço); a linha do tempo completa fica no detalhe e em historico/
+        if name != 'historico':
+            return name
+        if self.action == 'retrieve':
+            return Prefetch('historico', queryset=Status.objects.order_by('-data_atualizacao', '-id'))
+        return Prefetch('historico', queryset=Status.recentes(getattr(settings, 'EXPANDED_HISTORY_LIMIT', 10)))
     
+    @swagger_auto_schema(
+        method='get',
+        operation_summary="Serviços ativos",
+        operation_description="Retorna apenas os serviços que estão ativos no momento, paginados por cursor.",
+        responses={200: ServicoSerializer(many=True)}
+    )
+    @action(detail=False, methods=['get'], url_path='ativos')
+    def ativos(self, request):
+        """Filtra apenas serviços ativos; usa o índice de status_atual e aceita os mesmos parâmetros da listagem."""
+        ativos = self.filter_queryset(self.get_queryset()).filter(status_atual__in=Servico.ACTIVE_STATUSES)
+        page = self.paginate_queryset(ativos)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=False, methods=['get'], url_path='kanban')
+    def kanban(self, request):
+        """
+        Quadro kanban com os cards já montados e agrupados por status.
+        Aceita os mesmos filtros da listagem e ``?limite=`` cards por coluna.
+
+        O ETag vem das versões dos recursos exibidos nos cards, da URL (filtros e limite)
+        e da data de hoje, da qual dependem prazos e urgência; com If-None-Match ainda
+        válido a resposta é 304 sem montar o quadro.
+        """
+        try:
+            limit = int(request.query_params.get('limite', DEFAULT_CARDS_PER_STATUS))
+        except ValueError:
+            return Response({"error": "limite deve ser um número inteiro"}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, MAX_CARDS_PER_STATUS))
+
+        today = timezone.localdate()
+        etag = self._etag(request, [Servico, Cliente, Carro, Mecanico], extra=f':{today.isoformat()}')
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        board = build_kanban_board(self.filter_queryset(self.get_queryset()), limit=limit, today=today)
+        return Response(board, headers={'ETag': etag})
+
+    @action(detail=True, methods=['post'], url_path='transition')
+    def transition(self, request, pk=None):
+        """
+        Muda o status do serviço validando a máquina de estados e grava o histórico na
+        mesma transação. Corpo: ``{"status": ..., "observacao": ..., "status_atual": ...}``,
+        onde ``status_atual`` (opcional) é o status que o cliente espera encontrar.
+        Retorna o card do quadro já atualizado.
+        """
+        novo_status = request.data.get('status')
+        if not novo_status:
+            return Response({"error": "Informe o novo status"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            card = transition_servico(
+                pk, novo_status,
+                observacao=request.data.get('observacao', ''),
+                status_esperado=request.data.get('status_atual'),
+            )
+        except TransitionError as e:
+            return Response({"error": e.message}, status=e.status_code)
+        return Response(card)
+
+    @action(detail=True, methods=['get'], url_path='historico')
+    def historico(self, request, pk=None):
+        """Linha do tempo do serviço em ordem cronológica, lida pelo índice (servico_ID, data_atualizacao)."""
+        eventos = Status.objects.filter(servico_ID=pk).order_by('data_atualizacao', 'id')
+        return Response(StatusSerializer(eventos, many=True, context=self.get_serializer_context()).data)
+
     @action(detail=True, methods=['post'], url_path='update')
     def update_service(self, request, pk=None):
         try:
@@ -47,14 +293,206 @@ class ServicoViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class EnderecoViewSet(viewsets.ModelViewSet):
+class EnderecoViewSet(CachedResponseMixin, ColumnarRenderMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Endereco.objects.all()
     serializer_class = EnderecoSerializer
 
-class InsumoViewSet(viewsets.ModelViewSet):
+    def update(self, request, *args, **kwargs):
+        # Depois da deduplicação um endereço pode ser de vários clientes e serviços;
+        # editá-lo no lugar mudaria o endereço de todos eles
+        referencias = self.get_object().referencias()
+        if referencias > 1:
+            return Response(
+                {"error": f"Endereço compartilhado por {referencias} cadastros; use PUT /api/clientes/<id>/endereco/ "
+                          "para trocar o endereço de um cliente"},
+                status=status.HTTP_409_CONFLICT
+            )
+        return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        # A exclusão apagaria em cascata os clientes do endereço, com carros e serviços
+        referencias = self.get_object().referencias()
+        if referencias:
+            return Response(
+                {"error": f"Endereço em uso por {referencias} cadastros e não pode ser excluído"},
+                status=status.HTTP_409_CONFLICT
+            )
+        return super().destroy(request, *args, **kwargs)
+
+class InsumoViewSet(CachedResponseMixin, ColumnarRenderMixin, ExportMixin, BulkMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Insumo.objects.all()
     serializer_class = InsumoSerializer
 
-class StatusViewSet(viewsets.ModelViewSet):
+    def bulk_created(self, objs):
+        registrar_saldos_iniciais(objs)
+
+    @action(detail=False, methods=['get'], url_path='low-stock')
+    def low_stock(self, request):
+        """Insumos com disponível abaixo do estoque mínimo, lidos pelo índice parcial."""
+        page = self.paginate_queryset(Insumo.estoque_baixo())
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=False, methods=['get'], url_path='alteracoes')
+    def alteracoes(self, request):
+        """
+        Feed incremental do catálogo: ``?desde=<cursor>`` devolve só os insumos alterados
+        e os ids removidos desde a última consulta, além do próximo cursor.
+        """
+        try:
+            limit = min(int(request.query_params.get('limite', DEFAULT_FEED_LIMIT)), DEFAULT_FEED_LIMIT)
+        except ValueError:
+            return Response({"error": "limite deve ser um número inteiro"}, status=status.HTTP_400_BAD_REQUEST)
+        feed = build_change_feed(
+            Insumo.objects.all(),
+            lambda rows: self.get_serializer(rows, many=True).data,
+            InsumoExcluido.objects.all(),
+            parse_cursor(request.query_params.get('desde')),
+            limit=max(limit, 1),
+            tombstone_id='insumo_ID',
+        )
+        return Response(feed)
+
+class MovimentoEstoqueViewSet(SparseQuerysetMixin, QueryParamFilterMixin, mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Livro de movimentos de estoque. Movimentos não são editados nem apagados: correções
+    são feitas com novos lançamentos (por exemplo um ``ajuste`` ou uma ``liberacao``).
+    """
+    queryset = MovimentoEstoque.objects.all()
+    serializer_class = MovimentoEstoqueSerializer
+    filter_params = {'insumo': 'insumo', 'servico': 'servico', 'tipo': 'tipo__in'}
+
+    def create(self, request, *args, **kwargs):
+        """Aceita um movimento ou uma lista deles; a lista é aplicada inteira ou não é aplicada."""
+        many = isinstance(request.data, list)
+        serializer = self.get_serializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        rows = serializer.validated_data if many else [serializer.validated_data]
+
+        try:
+            movimentos = movimentar([
+                {**row, 'insumo': row['insumo'].pk, 'servico': row['servico'].pk if row.get('servico') else None}
+                for row in rows
+            ])
+        except InvalidMovementException as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
+        except InventoryException as e:
+            return Response({"error": e.message}, status=status.HTTP_409_CONFLICT)
+
+        data = self.get_serializer(movimentos, many=True).data
+        return Response(data if many else data[0], status=status.HTTP_201_CREATED)
+
+class StatusViewSet(CachedResponseMixin, ColumnarRenderMixin, SparseQuerysetMixin, QueryParamFilterMixin, mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Histórico de status dos serviços. É somente de inserção: não há edição nem exclusão
+    de eventos, e uma lista de eventos é gravada com um único INSERT em lote.
+    """
     queryset = Status.objects.all()
-    serializer_class = StatusSerializer
\ No newline at end of file
+    serializer_class = StatusSerializer
+    filter_params = {'servico_ID': 'servico_ID'}
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            eventos = Status.objects.bulk_create([Status(**row) for row in serializer.validated_data])
+            bump_version(Status)
+        return Response(self.get_serializer(eventos, many=True).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='ultimos')
+    def ultimos(self, request):
+        """Último evento de cada serviço em ``?servico_ID=1,2,3``."""
+        ids = [item.strip() for item in request.query_params.get('servico_ID', '').split(',') if item.strip()]
+        if not ids:
+            return Response({"error": "Informe servico_ID"}, status=status.HTTP_400_BAD_REQUEST)
+        if not all(item.isdigit() for item in ids):
+            return Response({"error": "servico_ID deve conter apenas números"}, status=status.HTTP_400_BAD_REQUEST)
+        eventos = Status.ultimos(ids)
+        return Response(self.get_serializer(eventos, many=True).data)
+
+class CacheStatsView(APIView):
+    """Acertos e faltas do cache de respostas da API desde o último reinício do cache."""
+    def get(self, request):
+        return Response(cache_stats())
+
+class OrdemServicoView(APIView):
+    """
+    Cria uma ordem de serviço completa (pagamento, endereço opcional, serviço e o
+    primeiro evento de status) em uma requisição e uma transação; ver
+    ``OrdemServicoSerializer``. Responde com o card do serviço criado.
+    """
+    @swagger_auto_schema(request_body=OrdemServicoSerializer, operation_summary="Cria uma ordem de serviço completa")
+    def post(self, request):
+        serializer = OrdemServicoSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        servico = serializer.save()
+        card = servico_to_card(annotate_cards(Servico.objects.filter(pk=servico.pk)).get())
+        return Response(card, status=status.HTTP_201_CREATED)
+
+class CepView(APIView):
+    """
+    Endereço de um CEP a partir da base local (com LRU em memória); CEPs ausentes são
+    consultados no serviço externo configurado e passam a fazer parte da base.
+    """
+    def get(self, request, cep):
+        try:
+            endereco = buscar_cep(cep)
+        except InvalidCepException as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
+        except CepUpstreamException as e:
+            return Response({"error": e.message}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if endereco is None:
+            return Response({"error": "CEP não encontrado"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(endereco)
+
+class ServicoSearchView(APIView):
+    """
+    Busca de serviços para o quadro: ``?q=`` procura na descrição e no diagnóstico
+    (texto completo) e no nome do cliente, do mecânico e na placa. Os resultados vêm
+    como cards, do mais relevante para o menos, paginados por ``?limit=&offset=``.
+    """
+    min_query_length = 2
+
+    def get(self, request):
+        q = request.query_params.get('q', '').strip()
+        if len(q) < self.min_query_length:
+            return Response({"error": f"Informe ao menos {self.min_query_length} caracteres em q"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        paginator = SearchPagination()
+        page = paginator.paginate_queryset(search_servicos(q), request, view=self)
+        return paginator.get_paginated_response(
+            [{**servico_to_card(servico), 'rank': getattr(servico, 'rank', None)} for servico in page]
+        )
+
+class RevenueReportView(APIView):
+    """
+    Receita por mês e por método a partir do agregado ``ReceitaMensal``.
+    ``?de=AAAA-MM&ate=AAAA-MM`` limitam o período e ``?status=`` (separado por
+    vírgulas) escolhe os status de pagamento; o padrão são os pagos.
+    """
+    def get(self, request):
+        periodo = {}
+        for param in ('de', 'ate'):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                periodo[param] = datetime.strptime(value, '%Y-%m').date()
+            except ValueError:
+                return Response({"error": f"{param} deve estar no formato AAAA-MM"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(build_revenue_report(status=query_param_set(request, 'status'), **periodo))
+
+class DashboardSummaryView(APIView):
+    """
+    Indicadores agregados do dashboard em um único payload.
+    O resultado fica em cache por DASHBOARD_CACHE_TTL segundos.
+    """
+    cache_key = 'dashboard:summary'
+
+    def get(self, request):
+        summary = cache.get(self.cache_key)
+        if summary is None:
+            summary = build_dashboard_summary()
+            cache.set(self.cache_key, summary, getattr(settings, 'DASHBOARD_CACHE_TTL', 30))
+        return Response(summary)
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models.carro import Carro
+from .models.cep import Cep
 from .models.cliente import Cliente
 from .models.endereco import Endereco
 from .models.insumo import Insumo
@@ -7,12 +8,28 @@ from .models.mecanico import Mecanico
 from .models.pagamento import Pagamento
 from .models.servico import Servico
 from .models.status import Status
+from .models.movimento_estoque import MovimentoEstoque
 
 admin.site.register(Carro)
+admin.site.register(Cep)
 admin.site.register(Cliente)
 admin.site.register(Endereco)
 admin.site.register(Insumo)
 admin.site.register(Mecanico)
 admin.site.register(Pagamento)
-admin.site.register(Servico)
-admin.site.register(Status)
\ No newline at end of file
+admin.site.register(Status)
+
+@admin.register(Servico)
+class ServicoAdmin(admin.ModelAdmin):
+    list_display = ('servico_ID', 'cliente', 'mecanico', 'status_atual', 'data_entrada', 'data_saida')
+    list_filter = ('status_atual',)
+    # Servico.__str__ and the list columns read the related rows; join them in the changelist query
+    list_select_related = ('cliente', 'mecanico')
+    ordering = ('-servico_ID',)
+
+@admin.register(MovimentoEstoque)
+class MovimentoEstoqueAdmin(admin.ModelAdmin):
+    list_display = ('movimento_ID', 'insumo', 'servico', 'tipo', 'quantidade', 'criado_em')
+    list_filter = ('tipo',)
+    list_select_related = ('insumo', 'servico__cliente')
+    ordering = ('-movimento_ID',)
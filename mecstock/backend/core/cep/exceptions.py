@@ -0,0 +1,13 @@
+class CepException(Exception):
+    """Base exception for CEP lookups."""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+
+class InvalidCepException(CepException):
+    """Exception raised when the value is not an 8-digit CEP."""
+
+
+class CepUpstreamException(CepException):
+    """Exception raised when the external CEP service fails or times out."""
@@ -0,0 +1,38 @@
+import json
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.conf import settings
+
+from .exceptions import CepUpstreamException
+
+CAMPOS = ('logradouro', 'complemento', 'bairro', 'localidade', 'uf')
+
+
+class ViaCepFetcher:
+    """
+    Consulta ``https://viacep.com.br/ws/<cep>/json/`` com timeout. Retorna o dicionário
+    com os campos de ``CAMPOS`` ou None quando o CEP não existe.
+
+    Outro fetcher pode ser configurado em ``CEP_FETCHER``: basta um callable que receba
+    o CEP normalizado e siga o mesmo contrato.
+    """
+    url = 'https://viacep.com.br/ws/{cep}/json/'
+
+    def __call__(self, cep):
+        timeout = getattr(settings, 'CEP_UPSTREAM_TIMEOUT', 3)
+        try:
+            with urlopen(self.url.format(cep=cep), timeout=timeout) as response:
+                data = json.loads(response.read().decode())
+        except (URLError, TimeoutError, ValueError) as e:
+            raise CepUpstreamException(f"Falha ao consultar o CEP {cep}: {e}")
+        if data.get('erro'):
+            return None
+        return {campo: data.get(campo) or '' for campo in CAMPOS}
+
+
+class OfflineFetcher:
+    """Não consulta nada: só a base local responde. Útil sem acesso à internet."""
+
+    def __call__(self, cep):
+        return None
@@ -0,0 +1,104 @@
+import re
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from ..models import Cep
+from .exceptions import InvalidCepException
+from .fetchers import CAMPOS
+
+_lru = OrderedDict()
+_lru_lock = threading.Lock()
+# Guardado no LRU para CEPs que o fetcher não conhece, evitando repetir a consulta externa
+_NAO_ENCONTRADO = object()
+
+
+def normalizar_cep(valor):
+    """Remove pontuação ('01001-000' vira '01001000') e exige 8 dígitos."""
+    cep = re.sub(r'[\s.-]', '', str(valor or ''))
+    if not re.fullmatch(r'\d{8}', cep):
+        raise InvalidCepException(f"CEP inválido: {valor}")
+    return cep
+
+
+def get_fetcher():
+    return import_string(getattr(settings, 'CEP_FETCHER', 'core.cep.fetchers.ViaCepFetcher'))()
+
+
+def _lembrar(cep, dados):
+    with _lru_lock:
+        _lru[cep] = dados
+        _lru.move_to_end(cep)
+        while len(_lru) > getattr(settings, 'CEP_CACHE_SIZE', 10000):
+            _lru.popitem(last=False)
+
+
+def limpar_cache():
+    with _lru_lock:
+        _lru.clear()
+
+
+def _serializar(cep):
+    return {'cep': cep.cep, **{campo: getattr(cep, campo) for campo in CAMPOS}}
+
+
+def buscar_cep(valor):
+    """
+    Endereço do CEP, ou None se ele não existir. A ordem é: LRU do processo, tabela
+    ``Cep`` e, por último, o fetcher configurado em ``CEP_FETCHER``; o que vem de fora
+    é gravado na tabela para as próximas consultas. CEPs inexistentes também ficam no
+    LRU, até ele ser limpo (``limpar_cache``, chamado por ``carregar_ceps``). Levanta
+    ``InvalidCepException`` para valores malformados e ``CepUpstreamException`` se o
+    serviço externo falhar.
+    """
+    cep = normalizar_cep(valor)
+    with _lru_lock:
+        dados = _lru.get(cep)
+        if dados is not None:
+            _lru.move_to_end(cep)
+            return None if dados is _NAO_ENCONTRADO else dados
+
+    registro = Cep.objects.filter(pk=cep).first()
+    if registro is None:
+        externo = get_fetcher()(cep)
+        if externo is None:
+            _lembrar(cep, _NAO_ENCONTRADO)
+            return None
+        registro, _ = Cep.objects.update_or_create(cep=cep, defaults={**externo, 'origem': Cep.EXTERNO})
+
+    dados = _serializar(registro)
+    _lembrar(cep, dados)
+    return dados
+
+
+def carregar_ceps(linhas, batch_size=5000):
+    """
+    Grava em lote os CEPs de ``linhas`` (dicionários com ``cep`` e os campos de
+    ``CAMPOS``), atualizando os que já existem. Linhas com CEP inválido são ignoradas.
+    Retorna ``(gravados, ignorados)``.
+    """
+    gravados = ignorados = 0
+    # Por CEP: o ON CONFLICT do PostgreSQL não aceita a mesma chave duas vezes no lote
+    lote = {}
+
+    def gravar():
+        Cep.objects.bulk_create(list(lote.values()), update_conflicts=True, unique_fields=['cep'],
+                                update_fields=[*CAMPOS, 'origem', 'atualizado_em'])
+        lote.clear()
+
+    for linha in linhas:
+        try:
+            cep = normalizar_cep(linha.get('cep'))
+        except InvalidCepException:
+            ignorados += 1
+            continue
+        lote[cep] = Cep(cep=cep, origem=Cep.CARGA, **{campo: (linha.get(campo) or '').strip() for campo in CAMPOS})
+        gravados += 1
+        if len(lote) >= batch_size:
+            gravar()
+    if lote:
+        gravar()
+    limpar_cache()
+    return gravados, ignorados
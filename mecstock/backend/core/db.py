@@ -0,0 +1,10 @@
+from django.conf import settings
+
+
+def stream_queryset(queryset, chunk_size=None):
+    """
+    Percorre o queryset sem carregar todas as linhas na memória. No PostgreSQL
+    ``iterator()`` usa um cursor do lado do servidor e busca ``chunk_size`` linhas por
+    vez; nos demais bancos o driver faz a leitura em lotes do mesmo tamanho.
+    """
+    return queryset.iterator(chunk_size=chunk_size or getattr(settings, 'DB_STREAM_CHUNK_SIZE', 2000))
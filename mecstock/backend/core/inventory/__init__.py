@@ -0,0 +1 @@
+# This file initializes the inventory module.
\ No newline at end of file
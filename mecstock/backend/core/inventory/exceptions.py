@@ -0,0 +1,33 @@
+class InventoryException(Exception):
+    """Base exception for stock movement errors."""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+
+class InvalidMovementException(InventoryException):
+    """Exception raised for malformed stock movements."""
+
+
+class InsufficientStockException(InventoryException):
+    """Exception raised when a movement would take more than the available stock."""
+    def __init__(self, insumo_id, disponivel, solicitado):
+        self.insumo_id = insumo_id
+        self.disponivel = disponivel
+        self.solicitado = solicitado
+        super().__init__(
+            f"Estoque insuficiente para o insumo {insumo_id}: disponível {disponivel}, solicitado {solicitado}"
+        )
+
+
+class InsufficientReservationException(InventoryException):
+    """Exception raised when a service consumes or releases more than it reserved."""
+    def __init__(self, insumo_id, servico_id, reservado, solicitado):
+        self.insumo_id = insumo_id
+        self.servico_id = servico_id
+        self.reservado = reservado
+        self.solicitado = solicitado
+        super().__init__(
+            f"Reserva insuficiente do serviço {servico_id} para o insumo {insumo_id}: "
+            f"reservado {reservado}, solicitado {solicitado}"
+        )
@@ -0,0 +1,187 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, When
+from django.utils import timezone
+
+from ..db import stream_queryset
+from ..models import Insumo, MovimentoEstoque
+from ..versioning import bump_version
+from .exceptions import InsufficientReservationException, InsufficientStockException, InvalidMovementException
+
+# Efeito de uma unidade de cada tipo de movimento sobre (qtd, qtd_reservada)
+EFEITOS = {
+    MovimentoEstoque.ENTRADA: (1, 0),
+    MovimentoEstoque.AJUSTE: (1, 0),
+    MovimentoEstoque.RESERVA: (0, 1),
+    MovimentoEstoque.LIBERACAO: (0, -1),
+    MovimentoEstoque.CONSUMO: (-1, -1),
+}
+
+
+def _soma_por_efeito(indice, prefixo=''):
+    """Expressão SQL que soma as quantidades do ledger ponderadas pelo efeito de cada tipo."""
+    whens = [
+        When(**{f'{prefixo}tipo': tipo}, then=F(f'{prefixo}quantidade') * efeito[indice])
+        for tipo, efeito in EFEITOS.items() if efeito[indice]
+    ]
+    return Sum(Case(*whens, default=0, output_field=IntegerField()))
+
+
+def reservas_por_servico(pares):
+    """Saldo reservado no ledger para cada par (servico_id, insumo_id) informado."""
+    servicos = {servico_id for servico_id, _ in pares}
+    insumos = {insumo_id for _, insumo_id in pares}
+    linhas = (
+        MovimentoEstoque.objects
+        .filter(servico__in=servicos, insumo__in=insumos, tipo__in=MovimentoEstoque.TIPOS_DE_SERVICO)
+        .values_list('servico', 'insumo')
+        .annotate(reservado=_soma_por_efeito(1))
+        .order_by()
+    )
+    saldos = {(servico_id, insumo_id): reservado for servico_id, insumo_id, reservado in linhas}
+    return {par: saldos.get(par, 0) for par in pares}
+
+
+def saldos_do_ledger(insumo_ids=None):
+    """
+    Recalcula (qtd, qtd_reservada) de cada insumo a partir do ledger. Usado para
+    conferir os saldos materializados em ``Insumo``.
+    """
+    queryset = Insumo.objects.all()
+    if insumo_ids is not None:
+        queryset = queryset.filter(pk__in=insumo_ids)
+    linhas = queryset.values_list('pk').annotate(
+        qtd=_soma_por_efeito(0, 'movimentos__'),
+        qtd_reservada=_soma_por_efeito(1, 'movimentos__'),
+    ).order_by()
+    return {pk: (qtd or 0, reservada or 0) for pk, qtd, reservada in stream_queryset(linhas)}
+
+
+def _validar(movimento):
+    tipo, quantidade = movimento['tipo'], movimento['quantidade']
+    if tipo not in EFEITOS:
+        raise InvalidMovementException(f"Tipo de movimento inválido: {tipo}")
+    if tipo == MovimentoEstoque.AJUSTE:
+        if quantidade == 0:
+            raise InvalidMovementException("Ajuste deve ter quantidade diferente de zero")
+    elif quantidade <= 0:
+        raise InvalidMovementException(f"Quantidade de {tipo} deve ser positiva")
+    if tipo in MovimentoEstoque.TIPOS_DE_SERVICO and movimento.get('servico') is None:
+        raise InvalidMovementException(f"Movimento de {tipo} exige um serviço")
+
+
+def movimentar(movimentos):
+    """
+    Aplica uma lista de movimentos de estoque de forma atômica.
+
+    Cada movimento é um dict com ``insumo`` e ``servico`` (ids), ``tipo``,
+    ``quantidade`` e ``observacao`` opcional. As linhas dos insumos envolvidos são
+    travadas com SELECT ... FOR UPDATE em ordem de chave primária (evitando deadlock
+    entre lotes concorrentes), os saldos são conferidos com as linhas travadas e
+    então atualizados com um UPDATE por insumo usando ``F()``. Se qualquer movimento
+    for inválido nada é gravado. Retorna os MovimentoEstoque criados.
+    """
+    for movimento in movimentos:
+        _validar(movimento)
+    if not movimentos:
+        return []
+
+    with transaction.atomic():
+        insumo_ids = sorted({movimento['insumo'] for movimento in movimentos})
+        saldos = {
+            pk: [qtd, reservada]
+            for pk, qtd, reservada in Insumo.objects.select_for_update()
+            .filter(pk__in=insumo_ids).order_by('pk').values_list('pk', 'qtd', 'qtd_reservada')
+        }
+        faltando = set(insumo_ids) - set(saldos)
+        if faltando:
+            raise InvalidMovementException(f"Insumo não encontrado: {min(faltando)}")
+
+        reservas = reservas_por_servico({
+            (movimento['servico'], movimento['insumo'])
+            for movimento in movimentos if movimento['tipo'] in MovimentoEstoque.TIPOS_DE_SERVICO
+        })
+        deltas = defaultdict(lambda: [0, 0])
+        for movimento in movimentos:
+            insumo_id, servico_id = movimento['insumo'], movimento.get('servico')
+            tipo, quantidade = movimento['tipo'], movimento['quantidade']
+            saldo = saldos[insumo_id]
+            if tipo == MovimentoEstoque.RESERVA and saldo[0] - saldo[1] < quantidade:
+                raise InsufficientStockException(insumo_id, saldo[0] - saldo[1], quantidade)
+            if tipo in (MovimentoEstoque.CONSUMO, MovimentoEstoque.LIBERACAO):
+                reservado = reservas[(servico_id, insumo_id)]
+                if reservado < quantidade:
+                    raise InsufficientReservationException(insumo_id, servico_id, reservado, quantidade)
+            efeito_qtd, efeito_reserva = EFEITOS[tipo]
+            if saldo[0] + efeito_qtd * quantidade < saldo[1] + efeito_reserva * quantidade:
+                raise InsufficientStockException(insumo_id, saldo[0] - saldo[1], -quantidade)
+
+            saldo[0] += efeito_qtd * quantidade
+            saldo[1] += efeito_reserva * quantidade
+            deltas[insumo_id][0] += efeito_qtd * quantidade
+            deltas[insumo_id][1] += efeito_reserva * quantidade
+            if tipo in MovimentoEstoque.TIPOS_DE_SERVICO:
+                reservas[(servico_id, insumo_id)] += efeito_reserva * quantidade
+
+        agora = timezone.now()
+        alterados = False
+        for insumo_id, (delta_qtd, delta_reserva) in deltas.items():
+            if delta_qtd or delta_reserva:
+                # update() não aplica auto_now; atualizado_em alimenta o feed de alterações
+                Insumo.objects.filter(pk=insumo_id).update(
+                    qtd=F('qtd') + delta_qtd,
+                    qtd_reservada=F('qtd_reservada') + delta_reserva,
+                    atualizado_em=agora,
+                )
+                alterados = True
+        if alterados:
+            # update() também não dispara post_save
+            bump_version(Insumo)
+        return MovimentoEstoque.objects.bulk_create([
+            MovimentoEstoque(
+                insumo_id=movimento['insumo'],
+                servico_id=movimento.get('servico'),
+                tipo=movimento['tipo'],
+                quantidade=movimento['quantidade'],
+                observacao=movimento.get('observacao', ''),
+            )
+            for movimento in movimentos
+        ])
+
+
+def registrar_entrada(insumo_id, quantidade, observacao=''):
+    return movimentar([{'insumo': insumo_id, 'tipo': MovimentoEstoque.ENTRADA,
+                        'quantidade': quantidade, 'observacao': observacao}])[0]
+
+
+def ajustar(insumo_id, quantidade, observacao=''):
+    return movimentar([{'insumo': insumo_id, 'tipo': MovimentoEstoque.AJUSTE,
+                        'quantidade': quantidade, 'observacao': observacao}])[0]
+
+
+def reservar(insumo_id, servico_id, quantidade):
+    return movimentar([{'insumo': insumo_id, 'servico': servico_id,
+                        'tipo': MovimentoEstoque.RESERVA, 'quantidade': quantidade}])[0]
+
+
+def consumir(insumo_id, servico_id, quantidade):
+    return movimentar([{'insumo': insumo_id, 'servico': servico_id,
+                        'tipo': MovimentoEstoque.CONSUMO, 'quantidade': quantidade}])[0]
+
+
+def liberar(insumo_id, servico_id, quantidade):
+    return movimentar([{'insumo': insumo_id, 'servico': servico_id,
+                        'tipo': MovimentoEstoque.LIBERACAO, 'quantidade': quantidade}])[0]
+
+
+def registrar_saldos_iniciais(insumos):
+    """
+    Lança no ledger o saldo com que insumos recém-criados entraram no estoque, para
+    que a soma dos movimentos continue igual a ``Insumo.qtd``.
+    """
+    return MovimentoEstoque.objects.bulk_create([
+        MovimentoEstoque(insumo=insumo, quantidade=insumo.qtd, observacao='Saldo inicial',
+                         tipo=MovimentoEstoque.ENTRADA if insumo.qtd > 0 else MovimentoEstoque.AJUSTE)
+        for insumo in insumos if insumo.qtd
+    ])
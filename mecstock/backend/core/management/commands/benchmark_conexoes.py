@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.test.utils import override_settings
+
+from core.models import Mecanico
+
+BENCHMARK_DOMAIN = 'benchmark.mecstock.invalid'
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede requisições por segundo em uma listagem da API abrindo uma conexão nova a "
+        "cada requisição (CONN_MAX_AGE=0) e reaproveitando a conexão persistente do perfil "
+        "configurado em settings. O cache de respostas é desligado para que toda requisição "
+        "consulte o banco. Os dados sintéticos são removidos ao final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requisicoes', type=int, default=2000, help='Requisições por perfil')
+        parser.add_argument('--url', default='/api/mecanicos/?fields=mecanico_ID,nome',
+                            help='Endpoint medido')
+        parser.add_argument('--mecanicos', type=int, default=50, help='Mecânicos sintéticos a criar')
+
+    def handle(self, *args, **options):
+        Mecanico.objects.bulk_create(
+            Mecanico(nome=f'Mecânico {i}', telefone='0', email=f'mecanico.{i}@{BENCHMARK_DOMAIN}')
+            for i in range(options['mecanicos'])
+        )
+        configurado = connection.settings_dict.get('CONN_MAX_AGE', 0)
+        health_checks = connection.settings_dict.get('CONN_HEALTH_CHECKS', False)
+        perfis = [('sem persistência', 0, False)]
+        if configurado:
+            perfis.append(('persistente', configurado, health_checks))
+        else:
+            self.stdout.write('CONN_MAX_AGE não está configurado; medindo apenas sem persistência')
+        try:
+            for nome, max_age, checar in perfis:
+                self._relatar(nome, options['requisicoes'],
+                              self._medir(options['url'], options['requisicoes'], max_age, checar))
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = configurado
+            connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+            Mecanico.objects.filter(email__endswith=f'@{BENCHMARK_DOMAIN}').delete()
+
+    def _medir(self, url, requisicoes, max_age, health_checks):
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+        cache_desligado = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        with override_settings(ALLOWED_HOSTS=['testserver'], CACHES=cache_desligado):
+            client = Client()
+            inicio = time.perf_counter()
+            for _ in range(requisicoes):
+                # O test Client não dispara o fechamento de conexões do handler WSGI;
+                # repete aqui o que request_started/request_finished fazem em produção
+                close_old_connections()
+                response = client.get(url)
+                close_old_connections()
+                if response.status_code != 200:
+                    raise RuntimeError(f'Resposta inesperada: {response.status_code}')
+            return time.perf_counter() - inicio
+
+    def _relatar(self, nome, requisicoes, elapsed):
+        self.stdout.write(
+            f'{nome}: {requisicoes} requisições em {elapsed:.2f}s, {requisicoes / elapsed:.0f} req/s, '
+            f'{elapsed / requisicoes * 1000:.2f} ms por requisição'
+        )
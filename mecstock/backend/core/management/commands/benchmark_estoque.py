@@ -0,0 +1,109 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.inventory.services import consumir, registrar_saldos_iniciais, reservar, saldos_do_ledger
+from core.models import Carro, Cliente, Endereco, Insumo, Mecanico, MovimentoEstoque, Pagamento, Servico
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a vazão de reservas e consumos concorrentes de um mesmo insumo e confere "
+        "que nenhuma atualização foi perdida. Use um banco que suporte SELECT ... FOR UPDATE "
+        "(PostgreSQL); com --ingenuo repete a carga com leitura-modificação-escrita para comparação."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Threads concorrentes')
+        parser.add_argument('--operacoes', type=int, default=200, help='Pares reserva+consumo por thread')
+        parser.add_argument('--ingenuo', action='store_true',
+                            help='Também executa a versão sem trava (insumo.qtd -= 1; save())')
+
+    def handle(self, *args, **options):
+        workers, operacoes = options['workers'], options['operacoes']
+        total = workers * operacoes
+        servico, endereco_criado = self._criar_servico()
+        try:
+            self._rodar_ledger(servico, workers, operacoes, total)
+            if options['ingenuo']:
+                self._rodar_ingenuo(workers, operacoes, total)
+        finally:
+            MovimentoEstoque.objects.filter(servico=servico).delete()
+            # Apaga só o que foi criado aqui; o cliente leva junto o carro e o serviço
+            servico.cliente.delete()
+            servico.mecanico.delete()
+            servico.pagamento.delete()
+            if endereco_criado:
+                servico.cliente.endereco_ID.delete()
+
+    def _rodar_ledger(self, servico, workers, operacoes, total):
+        insumo = Insumo.objects.create(nome='benchmark', descricao='benchmark_estoque', preco=0, qtd=total)
+        registrar_saldos_iniciais([insumo])
+
+        def carga():
+            try:
+                for _ in range(operacoes):
+                    reservar(insumo.pk, servico.pk, 1)
+                    consumir(insumo.pk, servico.pk, 1)
+            finally:
+                connection.close()
+
+        elapsed = self._executar(carga, workers)
+        insumo.refresh_from_db()
+        ledger = saldos_do_ledger([insumo.pk])[insumo.pk]
+        # Cada thread reserva e consome tudo que recebeu, então o saldo final esperado é zero
+        perdidas = insumo.qtd + insumo.qtd_reservada
+        self._relatar('ledger (SELECT FOR UPDATE + F())', 2 * total, elapsed, perdidas)
+        if ledger != (insumo.qtd, insumo.qtd_reservada):
+            self.stdout.write(self.style.ERROR(
+                f'  saldo materializado {(insumo.qtd, insumo.qtd_reservada)} difere do ledger {ledger}'
+            ))
+        insumo.delete()
+
+    def _rodar_ingenuo(self, workers, operacoes, total):
+        insumo = Insumo.objects.create(nome='benchmark', descricao='benchmark_estoque', preco=0, qtd=total)
+
+        def carga():
+            try:
+                for _ in range(operacoes):
+                    atual = Insumo.objects.get(pk=insumo.pk)
+                    atual.qtd -= 1
+                    atual.save(update_fields=['qtd'])
+            finally:
+                connection.close()
+
+        elapsed = self._executar(carga, workers)
+        insumo.refresh_from_db()
+        self._relatar('ingênuo (leitura-modificação-escrita)', total, elapsed, insumo.qtd)
+        insumo.delete()
+
+    def _executar(self, carga, workers):
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(carga) for _ in range(workers)]:
+                future.result()
+        return time.perf_counter() - inicio
+
+    def _relatar(self, nome, operacoes, elapsed, perdidas):
+        style = self.style.SUCCESS if perdidas == 0 else self.style.ERROR
+        self.stdout.write(f'{nome}: {operacoes} operações em {elapsed:.2f}s ({operacoes / elapsed:.0f} op/s)')
+        self.stdout.write(style(f'  atualizações perdidas: {perdidas}'))
+
+    def _criar_servico(self):
+        sufixo = uuid.uuid4().hex[:11]
+        endereco, criado = Endereco.objects.obter_ou_criar(cep='00000000', rua='Benchmark', bairro='-', numero='0',
+                                                           complemento=f'Benchmark {sufixo}', cidade='-', estado='SP')
+        cliente = Cliente.objects.create(nome='Benchmark', email='benchmark@example.com', cpf=sufixo,
+                                         telefone='0', endereco_ID=endereco)
+        carro = Carro.objects.create(modelo_carro='-', montadora='-', placa='-', combustivel='-',
+                                     ano=date.today().year, Customer_ID=cliente)
+        mecanico = Mecanico.objects.create(nome='Benchmark', telefone='0', email='benchmark@example.com')
+        pagamento = Pagamento.objects.create(valor_final=0, valor_total=0, metodo_pagamento='-', status='Pendente')
+        servico = Servico.objects.create(cliente=cliente, carro=carro, mecanico=mecanico, pagamento=pagamento,
+                                         diagnostico='-', orcamento=0, descricao_servico='benchmark_estoque',
+                                         data_entrada=date.today(), data_saida=date.today())
+        return servico, criado
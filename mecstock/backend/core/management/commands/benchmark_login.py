@@ -0,0 +1,84 @@
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+
+from core.models import Cliente, Endereco
+
+BENCHMARK_DOMAIN = 'benchmark.mecstock.invalid'
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria N clientes sintéticos e mede a latência de /api/clientes/lookup/?email= "
+        "(índice em LOWER(email)); com --comparar também mede a busca antiga, que baixa "
+        "todos os clientes e compara os emails em Python. Os dados sintéticos são removidos ao final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clientes', type=int, default=100_000, help='Clientes sintéticos a criar')
+        parser.add_argument('--buscas', type=int, default=200, help='Buscas medidas')
+        parser.add_argument('--comparar', action='store_true', help='Também mede a busca por varredura completa')
+
+    def handle(self, *args, **options):
+        total, buscas = options['clientes'], options['buscas']
+        # Conteúdo exclusivo desta execução: o endereço deduplicado nunca é o de outro cliente
+        endereco, criado = Endereco.objects.obter_ou_criar(cep='00000000', rua='Benchmark', bairro='-', numero='0',
+                                                           complemento=f'Benchmark {uuid.uuid4().hex}',
+                                                           cidade='-', estado='SP')
+        try:
+            inicio = time.perf_counter()
+            Cliente.objects.bulk_create(
+                (
+                    Cliente(nome=f'Cliente {i}', email=f'Cliente.{i}@{BENCHMARK_DOMAIN}', cpf=f'bench-{i}',
+                            telefone='0', endereco_ID=endereco)
+                    for i in range(total)
+                ),
+                batch_size=5000,
+            )
+            self.stdout.write(f'{total} clientes criados em {time.perf_counter() - inicio:.1f}s')
+
+            # Emails em minúsculas para exercitar a comparação sem diferenciar maiúsculas
+            emails = [f'cliente.{random.randrange(total)}@{BENCHMARK_DOMAIN}' for _ in range(buscas)]
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                client = Client()
+                self._relatar('lookup indexado', [self._medir(
+                    lambda email=email: client.get('/api/clientes/lookup/', {'email': email}), 200
+                ) for email in emails])
+                if options['comparar']:
+                    self._relatar('varredura completa', [self._medir(
+                        lambda email=email: self._varredura(client, email), None
+                    ) for email in emails[:5]])
+        finally:
+            Cliente.objects.filter(endereco_ID=endereco, email__endswith=f'@{BENCHMARK_DOMAIN}').delete()
+            if criado:
+                endereco.delete()
+
+    def _medir(self, chamada, status_esperado):
+        inicio = time.perf_counter()
+        response = chamada()
+        elapsed = (time.perf_counter() - inicio) * 1000
+        if status_esperado is not None and response.status_code != status_esperado:
+            raise RuntimeError(f'Resposta inesperada: {response.status_code}')
+        return elapsed
+
+    def _varredura(self, client, email):
+        url, params = '/api/clientes/', {'page_size': 1000}
+        while url:
+            page = client.get(url, params).json()
+            for cliente in page['results']:
+                if cliente['email'].lower() == email:
+                    return client.get('/api/clientes/lookup/', {'email': email})
+            url, params = page['next'], None
+        return None
+
+    def _relatar(self, nome, tempos):
+        tempos = sorted(tempos)
+        p95 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))]
+        self.stdout.write(
+            f'{nome}: {len(tempos)} buscas, média {statistics.mean(tempos):.2f} ms, p95 {p95:.2f} ms'
+        )
@@ -0,0 +1,34 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cep.services import carregar_ceps
+
+
+class Command(BaseCommand):
+    help = (
+        "Carrega CEPs de um CSV com cabeçalho (cep, logradouro, complemento, bairro, "
+        "localidade, uf) para a tabela local usada por /api/cep/<cep>/. CEPs já "
+        "existentes são atualizados; o arquivo é lido em streaming."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Caminho do CSV')
+        parser.add_argument('--delimitador', default=',', help='Separador de colunas (padrão: vírgula)')
+        parser.add_argument('--encoding', default='utf-8', help='Codificação do arquivo')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Linhas por INSERT')
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        try:
+            with open(options['arquivo'], newline='', encoding=options['encoding']) as arquivo:
+                leitor = csv.DictReader(arquivo, delimiter=options['delimitador'])
+                if 'cep' not in (leitor.fieldnames or []):
+                    raise CommandError("O CSV precisa de uma coluna 'cep'")
+                gravados, ignorados = carregar_ceps(leitor, batch_size=options['batch_size'])
+        except OSError as e:
+            raise CommandError(f"Não foi possível ler {options['arquivo']}: {e}")
+        self.stdout.write(
+            f'{gravados} CEPs gravados, {ignorados} linhas ignoradas em {time.perf_counter() - inicio:.1f}s'
+        )
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Cliente, Endereco, Servico
+from core.models.endereco import hash_endereco
+from core.versioning import bump_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Unifica endereços cadastrados em duplicidade antes do hash de conteúdo: clientes "
+        "e serviços passam a apontar para o endereço mais antigo de mesmo conteúdo e as "
+        "cópias são apagadas. Endereços sem duplicata apenas recebem o hash."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Só relata o que seria feito')
+
+    def handle(self, *args, **options):
+        unificados = preenchidos = 0
+        # Hash -> pk do endereço canônico, decidido aqui para que o --dry-run, que não
+        # grava os hashes, tome as mesmas decisões que a execução real
+        canonicos = {}
+        with transaction.atomic():
+            for endereco in Endereco.objects.filter(hash_conteudo__isnull=True).order_by('pk'):
+                hash_conteudo = hash_endereco(endereco)
+                if hash_conteudo not in canonicos:
+                    existente = Endereco.objects.filter(hash_conteudo=hash_conteudo).values_list('pk', flat=True).first()
+                    if existente is None:
+                        canonicos[hash_conteudo] = endereco.pk
+                        preenchidos += 1
+                        if not options['dry_run']:
+                            endereco.save(update_fields=['hash_conteudo'])
+                        continue
+                    canonicos[hash_conteudo] = existente
+                unificados += 1
+                if not options['dry_run']:
+                    canonico = canonicos[hash_conteudo]
+                    Cliente.objects.filter(endereco_ID=endereco).update(endereco_ID=canonico)
+                    Servico.objects.filter(service_address=endereco).update(service_address=canonico)
+                    endereco.delete()
+            if unificados and not options['dry_run']:
+                # update() não dispara os sinais que invalidam o cache das listagens
+                bump_version(Cliente)
+                bump_version(Servico)
+
+        prefixo = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(f'{prefixo}{unificados} endereços duplicados unificados, {preenchidos} receberam o hash')
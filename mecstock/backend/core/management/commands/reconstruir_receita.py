@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.revenue.services import reconstruir
+
+
+class Command(BaseCommand):
+    help = (
+        "Apaga e recalcula a tabela ReceitaMensal a partir de todos os serviços. Os sinais "
+        "mantêm o agregado em dia; use após cargas que não passam pelo ORM ou para conferência."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Linhas por INSERT')
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        linhas = reconstruir(batch_size=options['batch_size'])
+        self.stdout.write(f'{linhas} linhas de receita mensal gravadas em {time.perf_counter() - inicio:.2f}s')
@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-18 12:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_servico_home_service_servico_service_address'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='status',
+            name='servico_ID',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='historico', to='core.servico'),
+        ),
+        migrations.AddIndex(
+            model_name='servico',
+            index=models.Index(fields=['status_atual'], name='servico_status_atual_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servico',
+            index=models.Index(fields=['data_entrada'], name='servico_data_entrada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servico',
+            index=models.Index(fields=['data_saida'], name='servico_data_saida_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2 on 2026-10-18 12:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def registrar_saldos_iniciais(apps, schema_editor):
+    # Os saldos existentes viram o primeiro lançamento do ledger de cada insumo. Roda antes
+    # das restrições de qtd_reservada, que um saldo legado negativo violaria.
+    Insumo = apps.get_model('core', 'Insumo')
+    MovimentoEstoque = apps.get_model('core', 'MovimentoEstoque')
+    movimentos = []
+    for pk, qtd in Insumo.objects.exclude(qtd=0).values_list('pk', 'qtd').iterator():
+        movimentos.append(MovimentoEstoque(insumo_id=pk, quantidade=qtd, observacao='Saldo inicial',
+                                           tipo='entrada' if qtd > 0 else 'ajuste'))
+        if qtd < 0:
+            # Estoque negativo não existe fisicamente: zera o saldo com um ajuste no ledger
+            movimentos.append(MovimentoEstoque(insumo_id=pk, quantidade=-qtd, tipo='ajuste',
+                                               observacao='Saldo negativo zerado na migração'))
+    MovimentoEstoque.objects.bulk_create(movimentos, batch_size=1000)
+    Insumo.objects.filter(qtd__lt=0).update(qtd=0)
+    if schema_editor.connection.vendor == 'postgresql':
+        # Verifica já as chaves estrangeiras dos lançamentos: o PostgreSQL não aceita
+        # ALTER TABLE em core_insumo com verificações adiadas pendentes na transação
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        schema_editor.execute('SET CONSTRAINTS ALL DEFERRED')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_servico_filter_indexes_status_servico'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovimentoEstoque',
+            fields=[
+                ('movimento_ID', models.AutoField(primary_key=True, serialize=False)),
+                ('tipo', models.CharField(choices=[('entrada', 'Entrada'), ('ajuste', 'Ajuste'), ('reserva', 'Reserva'), ('consumo', 'Consumo'), ('liberacao', 'Liberação')], max_length=20)),
+                ('quantidade', models.IntegerField()),
+                ('observacao', models.CharField(blank=True, default='', max_length=255)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='insumo',
+            name='qtd_reservada',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='movimentoestoque',
+            name='insumo',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movimentos', to='core.insumo'),
+        ),
+        migrations.AddField(
+            model_name='movimentoestoque',
+            name='servico',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='movimentos_estoque', to='core.servico'),
+        ),
+        migrations.AddIndex(
+            model_name='movimentoestoque',
+            index=models.Index(fields=['insumo', 'criado_em'], name='movimento_insumo_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movimentoestoque',
+            index=models.Index(fields=['servico', 'insumo'], name='movimento_servico_insumo_idx'),
+        ),
+        migrations.RunPython(registrar_saldos_iniciais, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='insumo',
+            constraint=models.CheckConstraint(check=models.Q(('qtd_reservada__gte', 0)), name='insumo_qtd_reservada_gte_0'),
+        ),
+        migrations.AddConstraint(
+            model_name='insumo',
+            constraint=models.CheckConstraint(check=models.Q(('qtd_reservada__lte', models.F('qtd'))), name='insumo_qtd_reservada_lte_qtd'),
+        ),
+    ]
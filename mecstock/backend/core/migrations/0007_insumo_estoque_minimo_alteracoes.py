@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-18 12:15
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_insumo_reservas_movimento_estoque'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InsumoExcluido',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('insumo_ID', models.IntegerField()),
+                ('excluido_em', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='insumo',
+            name='atualizado_em',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='insumo',
+            name='estoque_minimo',
+            field=models.IntegerField(default=5),
+        ),
+        migrations.AddIndex(
+            model_name='insumo',
+            index=models.Index(condition=models.Q(('qtd__lt', django.db.models.expressions.CombinedExpression(models.F('qtd_reservada'), '+', models.F('estoque_minimo')))), fields=['insumo_ID'], name='insumo_estoque_baixo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='insumo',
+            index=models.Index(fields=['atualizado_em', 'insumo_ID'], name='insumo_atualizado_em_idx'),
+        ),
+    ]
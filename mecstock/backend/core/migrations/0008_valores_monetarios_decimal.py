@@ -0,0 +1,35 @@
+# Generated by Django 4.2 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_insumo_estoque_minimo_alteracoes'),
+    ]
+
+    # O PostgreSQL converte os valores existentes com CAST para numeric(10, 2), arredondando
+    # cada um para centavos na própria migração
+    operations = [
+        migrations.AlterField(
+            model_name='insumo',
+            name='preco',
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='pagamento',
+            name='valor_final',
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='pagamento',
+            name='valor_total',
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='servico',
+            name='orcamento',
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-18 12:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_valores_monetarios_decimal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='status',
+            name='data_atualizacao',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='status',
+            name='observacao',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='status',
+            name='status_anterior',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='status',
+            name='servico_ID',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='historico', to='core.servico'),
+        ),
+        migrations.AddIndex(
+            model_name='status',
+            index=models.Index(fields=['servico_ID', 'data_atualizacao', 'id'], name='status_servico_data_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-18 12:20
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+def verificar_emails_duplicados(apps, schema_editor):
+    # Falha com uma mensagem clara em vez do erro genérico de criação do índice único
+    Cliente = apps.get_model('core', 'Cliente')
+    duplicados = list(
+        Cliente.objects.annotate(email_normalizado=django.db.models.functions.text.Lower('email'))
+        .values('email_normalizado')
+        .annotate(total=models.Count('pk'))
+        .filter(total__gt=1)
+        .values_list('email_normalizado', flat=True)[:20]
+    )
+    if duplicados:
+        raise RuntimeError(
+            "Há clientes com o mesmo email (sem diferenciar maiúsculas); unifique-os antes de migrar: "
+            + ', '.join(duplicados)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_status_historico_eventos'),
+    ]
+
+    operations = [
+        migrations.RunPython(verificar_emails_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cliente',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='cliente_email_lower_uniq'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_cliente_email_lower_unico'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersaoRecurso',
+            fields=[
+                ('recurso', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('versao', models.BigIntegerField(default=0)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
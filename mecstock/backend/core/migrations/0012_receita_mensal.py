@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-18 12:32
+
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+
+def preencher_receita_mensal(apps, schema_editor):
+    # Mesmo cálculo de core.revenue.services.reconstruir, com os models históricos
+    Servico = apps.get_model('core', 'Servico')
+    ReceitaMensal = apps.get_model('core', 'ReceitaMensal')
+    linhas = (
+        Servico.objects.annotate(mes=TruncMonth('data_entrada'))
+        .values('mes', metodo_pagamento=F('pagamento__metodo_pagamento'), status_pagamento=F('pagamento__status'))
+        .annotate(servicos=Count('pk'), valor_final=Sum('pagamento__valor_final'), orcamento=Sum('orcamento'))
+        .order_by()
+    )
+    ReceitaMensal.objects.bulk_create([ReceitaMensal(**linha) for linha in linhas], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_versao_recurso'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceitaMensal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField(help_text='Primeiro dia do mês')),
+                ('metodo_pagamento', models.CharField(max_length=255)),
+                ('status_pagamento', models.CharField(max_length=255)),
+                ('servicos', models.PositiveIntegerField(default=0)),
+                ('valor_final', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('orcamento', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='receitamensal',
+            constraint=models.UniqueConstraint(fields=('mes', 'metodo_pagamento', 'status_pagamento'), name='receita_mensal_chave_unica'),
+        ),
+        migrations.RunPython(preencher_receita_mensal, migrations.RunPython.noop),
+    ]
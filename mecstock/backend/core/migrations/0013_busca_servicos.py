@@ -0,0 +1,42 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Índices só existem no PostgreSQL; em outros bancos a busca usa icontains sem índice.
+# A expressão do tsvector precisa ser idêntica à de api.search.SERVICO_TSVECTOR_SQL.
+INDICES = [
+    ('servico_busca_tsv_idx', 'core_servico',
+     "USING gin (to_tsvector('portuguese'::regconfig, "
+     "COALESCE(diagnostico, '') || ' ' || COALESCE(descricao_servico, '')))"),
+    # icontains gera UPPER(campo::text) LIKE ...; trigramas em UPPER atendem o LIKE '%termo%'
+    ('cliente_nome_trgm_idx', 'core_cliente', 'USING gin (UPPER(nome::text) gin_trgm_ops)'),
+    ('mecanico_nome_trgm_idx', 'core_mecanico', 'USING gin (UPPER(nome::text) gin_trgm_ops)'),
+    ('carro_placa_trgm_idx', 'core_carro', 'USING gin (UPPER(placa::text) gin_trgm_ops)'),
+]
+
+
+def criar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nome, tabela, definicao in INDICES:
+        schema_editor.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {nome} ON {tabela} {definicao}')
+
+
+def remover_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nome, _tabela, _definicao in INDICES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {nome}')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação, e não trava as gravações
+    atomic = False
+
+    dependencies = [
+        ('core', '0012_receita_mensal'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(criar_indices, remover_indices),
+    ]
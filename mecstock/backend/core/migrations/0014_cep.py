@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-18 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_busca_servicos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cep',
+            fields=[
+                ('cep', models.CharField(max_length=8, primary_key=True, serialize=False)),
+                ('logradouro', models.CharField(blank=True, default='', max_length=255)),
+                ('complemento', models.CharField(blank=True, default='', max_length=255)),
+                ('bairro', models.CharField(blank=True, default='', max_length=100)),
+                ('localidade', models.CharField(max_length=100)),
+                ('uf', models.CharField(max_length=2)),
+                ('origem', models.CharField(choices=[('carga', 'Carga em lote'), ('externo', 'Consulta externa')], default='carga', max_length=10)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
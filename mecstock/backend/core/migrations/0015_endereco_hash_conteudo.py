@@ -0,0 +1,52 @@
+# Generated by Django 4.2 on 2026-10-18 12:38
+
+import hashlib
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Cópia de core.models.endereco.hash_endereco, congelada para esta migração
+CAMPOS_DO_HASH = ('cep', 'rua', 'numero', 'complemento', 'bairro', 'cidade', 'estado')
+
+
+def _normalizar(campo, valor):
+    if campo == 'cep':
+        return re.sub(r'\D', '', str(valor or ''))
+    texto = unicodedata.normalize('NFKD', str(valor or '')).encode('ascii', 'ignore').decode()
+    return ' '.join(texto.lower().split())
+
+
+def preencher_hashes(apps, schema_editor):
+    # O endereço mais antigo de cada conteúdo recebe o hash; as duplicatas ficam com
+    # NULL até serem unificadas por manage.py deduplicar_enderecos
+    Endereco = apps.get_model('core', 'Endereco')
+    vistos, lote = set(), []
+    for endereco in Endereco.objects.order_by('pk').only(*CAMPOS_DO_HASH).iterator(chunk_size=2000):
+        conteudo = '|'.join(_normalizar(campo, getattr(endereco, campo)) for campo in CAMPOS_DO_HASH)
+        hash_conteudo = hashlib.sha256(conteudo.encode()).hexdigest()
+        if hash_conteudo in vistos:
+            continue
+        vistos.add(hash_conteudo)
+        endereco.hash_conteudo = hash_conteudo
+        lote.append(endereco)
+        if len(lote) >= 2000:
+            Endereco.objects.bulk_update(lote, ['hash_conteudo'])
+            lote = []
+    Endereco.objects.bulk_update(lote, ['hash_conteudo'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_cep'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='endereco',
+            name='hash_conteudo',
+            field=models.CharField(editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(preencher_hashes, migrations.RunPython.noop),
+    ]
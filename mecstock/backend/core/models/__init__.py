@@ -5,4 +5,9 @@ from .mecanico import Mecanico
 from .servico import Servico
 from .endereco import Endereco
 from .insumo import Insumo
-from .status import Status
\ No newline at end of file
+from .status import Status
+from .movimento_estoque import MovimentoEstoque
+from .insumo_excluido import InsumoExcluido
+from .versao_recurso import VersaoRecurso
+from .receita_mensal import ReceitaMensal
+from .cep import Cep
\ No newline at end of file
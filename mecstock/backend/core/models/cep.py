@@ -0,0 +1,23 @@
+from django.db import models
+
+class Cep(models.Model):
+    """
+    Endereço de referência de um CEP, com os mesmos nomes de campo do ViaCEP. É
+    preenchido em lote a partir de uma base offline (``manage.py carregar_ceps``) e
+    completado com as consultas feitas ao serviço externo.
+    """
+    CARGA = 'carga'
+    EXTERNO = 'externo'
+    ORIGEM_CHOICES = [(CARGA, 'Carga em lote'), (EXTERNO, 'Consulta externa')]
+
+    cep = models.CharField(max_length=8, primary_key=True)
+    logradouro = models.CharField(max_length=255, blank=True, default='')
+    complemento = models.CharField(max_length=255, blank=True, default='')
+    bairro = models.CharField(max_length=100, blank=True, default='')
+    localidade = models.CharField(max_length=100)
+    uf = models.CharField(max_length=2)
+    origem = models.CharField(max_length=10, choices=ORIGEM_CHOICES, default=CARGA)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.cep} - {self.localidade}/{self.uf}'
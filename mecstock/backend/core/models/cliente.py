@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 class Cliente(models.Model):
     cliente_ID = models.AutoField(primary_key=True)
@@ -8,5 +9,19 @@ class Cliente(models.Model):
     telefone = models.CharField(max_length=15)
     endereco_ID = models.ForeignKey('Endereco', on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            # Índice funcional em LOWER(email): garante um cadastro por email sem diferenciar
+            # maiúsculas e atende a busca do login com uma única consulta indexada
+            models.UniqueConstraint(Lower('email'), name='cliente_email_lower_uniq'),
+        ]
+
+    @classmethod
+    def por_email(cls, email):
+        """Busca pelo email sem diferenciar maiúsculas, com a mesma expressão do índice."""
+        return cls.objects.alias(email_normalizado=Lower('email')).filter(
+            email_normalizado=email.strip().lower()
+        )
+
     def __str__(self):
         return self.nome
\ No newline at end of file
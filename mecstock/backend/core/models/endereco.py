@@ -1,4 +1,46 @@
-from django.db import models
+import hashlib
+import re
+import unicodedata
+
+from django.db import IntegrityError, models, transaction
+
+# Campos que identificam um endereço; dois cadastros com o mesmo conteúdo normalizado
+# são o mesmo endereço
+CAMPOS_DO_HASH = ('cep', 'rua', 'numero', 'complemento', 'bairro', 'cidade', 'estado')
+
+
+def _normalizar(campo, valor):
+    if campo == 'cep':
+        return re.sub(r'\D', '', str(valor or ''))
+    # Sem acentos, minúsculas e espaços simples: "Praça  da Sé" e "praca da se" coincidem
+    texto = unicodedata.normalize('NFKD', str(valor or '')).encode('ascii', 'ignore').decode()
+    return ' '.join(texto.lower().split())
+
+
+def hash_endereco(dados):
+    """SHA-256 do conteúdo normalizado de um endereço (dicionário ou instância)."""
+    obter = dados.get if isinstance(dados, dict) else lambda campo: getattr(dados, campo)
+    conteudo = '|'.join(_normalizar(campo, obter(campo)) for campo in CAMPOS_DO_HASH)
+    return hashlib.sha256(conteudo.encode()).hexdigest()
+
+
+class EnderecoManager(models.Manager):
+    def obter_ou_criar(self, **dados):
+        """
+        Devolve ``(endereco, criado)``: o endereço já cadastrado com o mesmo conteúdo
+        normalizado, buscado pelo índice único de ``hash_conteudo``, ou um novo.
+        """
+        hash_conteudo = hash_endereco(dados)
+        existente = self.filter(hash_conteudo=hash_conteudo).first()
+        if existente is not None:
+            return existente, False
+        try:
+            with transaction.atomic():
+                return self.create(**dados), True
+        except IntegrityError:
+            # Outra requisição gravou o mesmo endereço primeiro
+            return self.get(hash_conteudo=hash_conteudo), False
+
 
 class Endereco(models.Model):
     endereco_ID = models.AutoField(primary_key=True)
@@ -9,6 +51,21 @@ class Endereco(models.Model):
     cidade = models.CharField(max_length=100)
     estado = models.CharField(max_length=100)
     complemento = models.CharField(max_length=255, blank=True, null=True)
+    # Preenchido em save(); nulo só em duplicatas anteriores à deduplicação
+    hash_conteudo = models.CharField(max_length=64, unique=True, null=True, editable=False)
+
+    objects = EnderecoManager()
+
+    def save(self, *args, **kwargs):
+        self.hash_conteudo = hash_endereco(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'hash_conteudo' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'hash_conteudo']
+        super().save(*args, **kwargs)
+
+    def referencias(self):
+        """Clientes e serviços domiciliares que apontam para este endereço."""
+        return self.cliente_set.count() + self.servicos_realizados.count()
 
     def __str__(self):
-        return f"{self.rua}, {self.numero}, {self.complemento+', ' if self.complemento else ''}{self.bairro}, {self.cidade} - {self.estado}"
\ No newline at end of file
+        return f"{self.rua}, {self.numero}, {self.complemento+', ' if self.complemento else ''}{self.bairro}, {self.cidade} - {self.estado}"
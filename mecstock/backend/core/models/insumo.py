@@ -2,10 +2,39 @@ from django.db import models
 
 class Insumo(models.Model):
     insumo_ID = models.AutoField(primary_key=True)
-    preco = models.FloatField()
+    preco = models.DecimalField(max_digits=10, decimal_places=2)
+    # Saldo físico em estoque; alterado apenas pelos movimentos de core.inventory
     qtd = models.IntegerField()
+    # Parte do saldo físico já reservada para serviços em andamento
+    qtd_reservada = models.IntegerField(default=0)
+    # Ponto de reposição: o insumo está em falta quando o disponível fica abaixo deste valor
+    estoque_minimo = models.IntegerField(default=5)
     nome = models.CharField(max_length=255)
     descricao = models.TextField()
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Índice parcial: só contém os insumos em falta, então a consulta de estoque baixo
+            # não depende do tamanho do catálogo
+            models.Index(fields=['insumo_ID'], name='insumo_estoque_baixo_idx',
+                         condition=models.Q(qtd__lt=models.F('qtd_reservada') + models.F('estoque_minimo'))),
+            models.Index(fields=['atualizado_em', 'insumo_ID'], name='insumo_atualizado_em_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(qtd_reservada__gte=0), name='insumo_qtd_reservada_gte_0'),
+            models.CheckConstraint(check=models.Q(qtd_reservada__lte=models.F('qtd')),
+                                   name='insumo_qtd_reservada_lte_qtd'),
+        ]
+
+    @classmethod
+    def estoque_baixo(cls):
+        """Insumos cujo disponível está abaixo do estoque mínimo, com o mesmo predicado do índice parcial."""
+        return cls.objects.filter(qtd__lt=models.F('qtd_reservada') + models.F('estoque_minimo'))
+
+    @property
+    def qtd_disponivel(self):
+        return self.qtd - self.qtd_reservada
 
     def __str__(self):
-        return self.nome
\ No newline at end of file
+        return self.nome
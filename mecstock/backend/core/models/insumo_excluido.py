@@ -0,0 +1,9 @@
+from django.db import models
+
+class InsumoExcluido(models.Model):
+    """Registro de exclusão de um insumo, para que o feed de alterações também informe remoções."""
+    insumo_ID = models.IntegerField()
+    excluido_em = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'Insumo {self.insumo_ID} excluído em {self.excluido_em}'
@@ -0,0 +1,40 @@
+from django.db import models
+
+class MovimentoEstoque(models.Model):
+    """
+    Lançamento do livro de movimentos de estoque. O saldo de ``Insumo.qtd`` e
+    ``Insumo.qtd_reservada`` é sempre a soma dos movimentos do insumo.
+    """
+    ENTRADA = 'entrada'
+    AJUSTE = 'ajuste'
+    RESERVA = 'reserva'
+    CONSUMO = 'consumo'
+    LIBERACAO = 'liberacao'
+    TIPO_CHOICES = [
+        (ENTRADA, 'Entrada'),
+        (AJUSTE, 'Ajuste'),
+        (RESERVA, 'Reserva'),
+        (CONSUMO, 'Consumo'),
+        (LIBERACAO, 'Liberação'),
+    ]
+    # Tipos que movimentam a reserva de um serviço e por isso exigem servico
+    TIPOS_DE_SERVICO = [RESERVA, CONSUMO, LIBERACAO]
+
+    movimento_ID = models.AutoField(primary_key=True)
+    insumo = models.ForeignKey('Insumo', on_delete=models.CASCADE, related_name='movimentos')
+    servico = models.ForeignKey('Servico', on_delete=models.PROTECT, null=True, blank=True,
+                                related_name='movimentos_estoque')
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES)
+    # Positiva para todos os tipos, exceto AJUSTE, que pode ser negativo
+    quantidade = models.IntegerField()
+    observacao = models.CharField(max_length=255, blank=True, default='')
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['insumo', 'criado_em'], name='movimento_insumo_data_idx'),
+            models.Index(fields=['servico', 'insumo'], name='movimento_servico_insumo_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_tipo_display()} de {self.quantidade} - Insumo {self.insumo_id}'
@@ -2,8 +2,8 @@ from django.db import models
 
 class Pagamento(models.Model):
     pagamento_ID = models.AutoField(primary_key=True)
-    valor_final = models.FloatField()
-    valor_total = models.FloatField()
+    valor_final = models.DecimalField(max_digits=10, decimal_places=2)
+    valor_total = models.DecimalField(max_digits=10, decimal_places=2)
     metodo_pagamento = models.CharField(max_length=255)
     status = models.CharField(max_length=255)
 
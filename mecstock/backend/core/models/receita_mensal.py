@@ -0,0 +1,23 @@
+from django.db import models
+
+class ReceitaMensal(models.Model):
+    """
+    Agregado mensal dos serviços por método e status do pagamento, mantido pelos sinais
+    de Servico e Pagamento (ver ``core.revenue``). O mês é o de ``Servico.data_entrada``.
+    Os relatórios de receita leem daqui em vez de somar todos os serviços.
+    """
+    mes = models.DateField(help_text="Primeiro dia do mês")
+    metodo_pagamento = models.CharField(max_length=255)
+    status_pagamento = models.CharField(max_length=255)
+    servicos = models.PositiveIntegerField(default=0)
+    valor_final = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    orcamento = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['mes', 'metodo_pagamento', 'status_pagamento'],
+                                    name='receita_mensal_chave_unica'),
+        ]
+
+    def __str__(self):
+        return f'{self.mes:%Y-%m} {self.metodo_pagamento} {self.status_pagamento}'
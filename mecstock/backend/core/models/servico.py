@@ -13,12 +13,29 @@ class Servico(models.Model):
         ('Entregue', 'Entregue'),
         ('Cancelado', 'Cancelado'),
     ]
+    ACTIVE_STATUSES = [
+        'Cadastrado', 'Aguardando Aprovação', 'Aprovado',
+        'Em Andamento', 'Diagnóstico Adicional', 'Aguardando Peças',
+    ]
+    COMPLETED_STATUSES = ['Finalizado', 'Entregue']
+    # Mudanças de status permitidas, conforme docs/diagrams/state.mermaid
+    TRANSITIONS = {
+        'Cadastrado': ['Aguardando Aprovação'],
+        'Aguardando Aprovação': ['Aprovado', 'Cancelado'],
+        'Aprovado': ['Em Andamento'],
+        'Em Andamento': ['Diagnóstico Adicional', 'Aguardando Peças', 'Finalizado'],
+        'Diagnóstico Adicional': ['Aguardando Aprovação'],
+        'Aguardando Peças': ['Em Andamento'],
+        'Finalizado': ['Entregue'],
+        'Entregue': [],
+        'Cancelado': [],
+    }
     
     servico_ID = models.AutoField(primary_key=True)
     cliente = models.ForeignKey('Cliente', on_delete=models.CASCADE)
     carro = models.ForeignKey('Carro', on_delete=models.CASCADE)
     diagnostico = models.TextField()
-    orcamento = models.FloatField()
+    orcamento = models.DecimalField(max_digits=10, decimal_places=2)
     pagamento = models.ForeignKey('Pagamento', on_delete=models.CASCADE)
     descricao_servico = models.TextField()
     data_entrada = models.DateField()
@@ -32,5 +49,20 @@ class Servico(models.Model):
                                        related_name='servicos_realizados',
                                        help_text="Endereço onde o serviço será realizado (apenas para serviços domiciliares)")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status_atual'], name='servico_status_atual_idx'),
+            models.Index(fields=['data_entrada'], name='servico_data_entrada_idx'),
+            models.Index(fields=['data_saida'], name='servico_data_saida_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Data de entrada gravada: o agregado de receita refaz o mês antigo sem nova consulta
+        if 'data_entrada' in instance.__dict__:
+            instance._data_entrada_gravada = instance.data_entrada
+        return instance
+
     def __str__(self):
         return f'Serviço {self.servico_ID} - Cliente {self.cliente.nome}'
\ No newline at end of file
@@ -1,7 +1,55 @@
-from django.db import models
+from django.db import connection, models
+from django.db.models.functions import RowNumber
+from django.utils import timezone
 
 class Status(models.Model):
+    """
+    Evento do histórico de status de um serviço. O histórico é somente de inserção:
+    cada mudança gera um novo registro e os anteriores nunca são alterados.
+    """
     status = models.CharField(max_length=255)
+    status_anterior = models.CharField(max_length=255, blank=True, default='')
+    # Indexado pelo índice composto abaixo, que começa por servico_ID
+    servico_ID = models.ForeignKey('Servico', on_delete=models.CASCADE, null=True, blank=True,
+                                   related_name='historico', db_index=False)
+    data_atualizacao = models.DateTimeField(default=timezone.now)
+    observacao = models.TextField(blank=True, default='')
+
+    class Meta:
+        indexes = [
+            # Serve tanto o último status de um serviço (uma busca no índice) quanto a linha do tempo
+            models.Index(fields=['servico_ID', 'data_atualizacao', 'id'], name='status_servico_data_idx'),
+        ]
+
+    @classmethod
+    def ultimos(cls, servico_ids):
+        """
+        Último evento de cada serviço informado, em ordem de serviço. No PostgreSQL é um
+        DISTINCT ON que percorre o índice ``status_servico_data_idx`` de trás para frente,
+        só nas faixas dos serviços pedidos; nos demais bancos, ``ROW_NUMBER()`` por serviço.
+        O custo é proporcional aos eventos desses serviços, não à tabela inteira.
+        """
+        eventos = cls.objects.filter(servico_ID__in=servico_ids)
+        if connection.vendor == 'postgresql':
+            # A ordem toda descendente coincide com o índice lido ao contrário, sem ordenação extra
+            ultimos = eventos.order_by('-servico_ID', '-data_atualizacao', '-id').distinct('servico_ID')
+        else:
+            ultimos = eventos.annotate(ordem=models.Window(
+                RowNumber(), partition_by=[models.F('servico_ID')],
+                order_by=[models.F('data_atualizacao').desc(), models.F('id').desc()],
+            )).filter(ordem=1)
+        return sorted(ultimos, key=lambda evento: evento.servico_ID_id)
+
+    @classmethod
+    def recentes(cls, limite):
+        """
+        Os ``limite`` eventos mais recentes de cada serviço, do mais novo para o mais
+        antigo: ``ROW_NUMBER()`` por serviço, aplicável a um ``Prefetch``.
+        """
+        return cls.objects.annotate(ordem=models.Window(
+            RowNumber(), partition_by=[models.F('servico_ID')],
+            order_by=[models.F('data_atualizacao').desc(), models.F('id').desc()],
+        )).filter(ordem__lte=limite).order_by('-data_atualizacao', '-id')
 
     def __str__(self):
-        return self.status
\ No newline at end of file
+        return self.status
@@ -0,0 +1,13 @@
+from django.db import models
+
+class VersaoRecurso(models.Model):
+    """
+    Contador de versão de um recurso da API (um por model, por exemplo ``core.cliente``).
+    É incrementado a cada gravação ou exclusão e alimenta os ETags das respostas.
+    """
+    recurso = models.CharField(max_length=100, primary_key=True)
+    versao = models.BigIntegerField(default=0)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.recurso} v{self.versao}'
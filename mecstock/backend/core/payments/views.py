@@ -1,3 +1,5 @@
+from decimal import Decimal, InvalidOperation
+
 from rest_framework import viewsets
 from rest_framework.response import Response
 from rest_framework import status
@@ -53,7 +55,7 @@ class ProcessPaymentView(APIView):
                     description='Método de pagamento',
                     enum=['cash', 'credit_card', 'debit_card', 'bank_transfer', 'pix']
                 ),
-                'amount': openapi.Schema(type=openapi.TYPE_NUMBER, format='float', description='Valor do pagamento')
+                'amount': openapi.Schema(type=openapi.TYPE_NUMBER, format='decimal', description='Valor do pagamento')
             }
         ),
         responses={
@@ -85,13 +87,21 @@ class ProcessPaymentView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
+        try:
+            amount = Decimal(str(amount)).quantize(Decimal('0.01'))
+        except InvalidOperation:
+            return Response(
+                {"error": f"Valor inválido: {amount}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             # Process the payment using our service
             payment_service = PaymentService()
             payment_result, pagamento = payment_service.process_payment(
                 servico_id=servico_id,
                 payment_method=payment_method,
-                amount=float(amount)
+                amount=amount
             )
             
             # Return the result
@@ -0,0 +1,87 @@
+from datetime import date
+from functools import reduce
+from operator import or_
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from ..models import ReceitaMensal, Servico
+
+CAMPOS_DA_CHAVE = ('mes', 'metodo_pagamento', 'status_pagamento')
+CAMPOS_SOMADOS = ('servicos', 'valor_final', 'orcamento')
+# Primeira chave dos advisory locks do agregado; a segunda identifica o mês
+TRAVA_RECEITA = 20250101
+
+
+def inicio_do_mes(dia):
+    # Aceita também a string ISO que ainda está na instância logo após um create()
+    return Servico._meta.get_field('data_entrada').to_python(dia).replace(day=1)
+
+
+def _proximo_mes(mes):
+    return date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+
+def agregar(servicos):
+    """Linhas de ``ReceitaMensal`` (ainda não gravadas) calculadas a partir dos serviços."""
+    linhas = (
+        servicos.annotate(mes=TruncMonth('data_entrada'))
+        .values('mes', metodo_pagamento=F('pagamento__metodo_pagamento'),
+                status_pagamento=F('pagamento__status'))
+        .annotate(servicos=Count('pk'), valor_final=Sum('pagamento__valor_final'), orcamento=Sum('orcamento'))
+        .order_by()
+    )
+    return [ReceitaMensal(**linha) for linha in linhas]
+
+
+def _travar_meses(meses):
+    """
+    Serializa o recálculo de cada mês até o fim da transação corrente. Sem a trava,
+    duas gravações no mesmo mês podem agregar em paralelo e a que leu os dados mais
+    antigos sobrescreve o resultado da outra. Os meses chegam ordenados, o que evita
+    deadlock entre gravações que tocam mais de um mês.
+    """
+    if connection.vendor != 'postgresql':
+        # O SQLite já serializa as transações de escrita
+        return
+    with connection.cursor() as cursor:
+        for mes in meses:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [TRAVA_RECEITA, mes.year * 12 + mes.month])
+
+
+def atualizar_meses(meses):
+    """
+    Recalcula o agregado dos meses informados a partir dos serviços desses meses.
+    Cada mês custa uma varredura pelo índice de ``data_entrada``, independente do
+    tamanho do histórico. A leitura só acontece depois da trava do mês, então enxerga
+    tudo o que as gravações anteriores no mesmo mês já confirmaram.
+    """
+    meses = sorted({inicio_do_mes(mes) for mes in meses if mes})
+    if not meses:
+        return
+    periodos = reduce(or_, (Q(data_entrada__gte=mes, data_entrada__lt=_proximo_mes(mes)) for mes in meses))
+    with transaction.atomic():
+        _travar_meses(meses)
+        linhas = agregar(Servico.objects.filter(periodos))
+        vigentes = ReceitaMensal.objects.filter(mes__in=meses)
+        for linha in linhas:
+            vigentes = vigentes.exclude(mes=linha.mes, metodo_pagamento=linha.metodo_pagamento,
+                                        status_pagamento=linha.status_pagamento)
+        vigentes.delete()
+        ReceitaMensal.objects.bulk_create(linhas, update_conflicts=True, unique_fields=CAMPOS_DA_CHAVE,
+                                          update_fields=CAMPOS_SOMADOS)
+
+
+def reconstruir(batch_size=1000):
+    """Apaga e recalcula todo o agregado; retorna o número de linhas gravadas."""
+    linhas = agregar(Servico.objects.all())
+    with transaction.atomic():
+        ReceitaMensal.objects.all().delete()
+        ReceitaMensal.objects.bulk_create(linhas, batch_size=batch_size)
+    return len(linhas)
+
+
+def meses_do_pagamento(pagamento_id):
+    datas = Servico.objects.filter(pagamento_id=pagamento_id).values_list('data_entrada', flat=True).distinct()
+    return {inicio_do_mes(dia) for dia in datas}
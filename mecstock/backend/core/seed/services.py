@@ -0,0 +1,369 @@
+import csv
+import io
+import math
+import random
+import unicodedata
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from ..models import Carro, Cliente, Endereco, Insumo, Mecanico, MovimentoEstoque, Pagamento, Servico, Status
+from ..models.endereco import hash_endereco
+from ..revenue.services import reconstruir
+from ..versioning import bump_version
+
+# Cada bloco de clientes tem o próprio gerador, semeado por (seed, bloco): a carga é a
+# mesma para a mesma seed, qualquer que seja o número de processos
+CLIENTES_POR_BLOCO = 1000
+MAX_CARROS = 3
+MAX_SERVICOS = 12
+# O caminho mais longo do histórico tem 10 eventos (ver _caminho_de_status)
+MAX_EVENTOS = 10
+
+# Faixa de IDs reservada a cada bloco; IDs explícitos permitem o COPY em paralelo
+CAPACIDADE = {
+    Endereco: CLIENTES_POR_BLOCO,
+    Cliente: CLIENTES_POR_BLOCO,
+    Carro: CLIENTES_POR_BLOCO * MAX_CARROS,
+    Pagamento: CLIENTES_POR_BLOCO * MAX_SERVICOS,
+    Servico: CLIENTES_POR_BLOCO * MAX_SERVICOS,
+    Status: CLIENTES_POR_BLOCO * MAX_SERVICOS * MAX_EVENTOS,
+}
+# Ordem de gravação, respeitando as chaves estrangeiras
+MODELOS_DO_CATALOGO = [Mecanico, Insumo, MovimentoEstoque]
+MODELOS_DO_BLOCO = list(CAPACIDADE)
+
+NOMES = [
+    'Ana', 'Beatriz', 'Bruno', 'Camila', 'Carlos', 'Daniela', 'Eduardo', 'Fernanda', 'Gabriel', 'Helena',
+    'Igor', 'Juliana', 'João', 'Larissa', 'Lucas', 'Marcos', 'Maria', 'Natália', 'Otávio', 'Patrícia',
+    'Paulo', 'Rafael', 'Renata', 'Rodrigo', 'Sérgio', 'Tatiane', 'Thiago', 'Vanessa', 'Vinícius', 'Yasmin',
+]
+SOBRENOMES = [
+    'Almeida', 'Alves', 'Araújo', 'Barbosa', 'Cardoso', 'Carvalho', 'Costa', 'Dias', 'Fernandes', 'Ferreira',
+    'Gomes', 'Lima', 'Martins', 'Melo', 'Oliveira', 'Pereira', 'Ribeiro', 'Rocha', 'Santos', 'Silva', 'Souza',
+]
+RUAS = [
+    'Rua das Flores', 'Rua XV de Novembro', 'Avenida Brasil', 'Rua São João', 'Rua Sete de Setembro',
+    'Avenida Getúlio Vargas', 'Rua Tiradentes', 'Rua Santos Dumont', 'Rua Dom Pedro II', 'Avenida Paulista',
+    'Rua Barão do Rio Branco', 'Rua Marechal Deodoro', 'Rua José Bonifácio', 'Rua Rui Barbosa',
+]
+BAIRROS = ['Centro', 'Jardim América', 'Vila Nova', 'Boa Vista', 'Santa Cecília', 'Bela Vista', 'Industrial',
+           'São José', 'Liberdade', 'Vila Mariana']
+# (cidade, UF, DDD, prefixo do CEP, peso); o peso segue, grosso modo, a população
+CIDADES = [
+    ('São Paulo', 'SP', 11, '0', 12), ('Campinas', 'SP', 19, '13', 3), ('Rio de Janeiro', 'RJ', 21, '2', 7),
+    ('Belo Horizonte', 'MG', 31, '30', 3), ('Curitiba', 'PR', 41, '8', 2), ('Porto Alegre', 'RS', 51, '9', 2),
+    ('Salvador', 'BA', 71, '4', 3), ('Recife', 'PE', 81, '5', 2), ('Fortaleza', 'CE', 85, '60', 3),
+    ('Goiânia', 'GO', 62, '74', 2), ('Brasília', 'DF', 61, '70', 3),
+]
+# (montadora, modelo, peso)
+VEICULOS = [
+    ('Fiat', 'Uno', 6), ('Fiat', 'Strada', 5), ('Fiat', 'Argo', 4), ('Volkswagen', 'Gol', 7),
+    ('Volkswagen', 'Polo', 4), ('Volkswagen', 'T-Cross', 3), ('Chevrolet', 'Onix', 8), ('Chevrolet', 'Prisma', 3),
+    ('Chevrolet', 'S10', 2), ('Hyundai', 'HB20', 6), ('Hyundai', 'Creta', 3), ('Toyota', 'Corolla', 3),
+    ('Toyota', 'Hilux', 2), ('Honda', 'Civic', 2), ('Honda', 'HR-V', 2), ('Renault', 'Kwid', 3),
+    ('Renault', 'Sandero', 3), ('Ford', 'Ka', 4), ('Jeep', 'Renegade', 3), ('Nissan', 'Kicks', 2),
+]
+COMBUSTIVEIS = {'Flex': 62, 'Gasolina': 14, 'Diesel': 11, 'Etanol': 5, 'Híbrido': 5, 'Elétrico': 3}
+METODOS_DE_PAGAMENTO = {'Pix': 40, 'Cartão de Crédito': 30, 'Cartão de Débito': 15, 'Dinheiro': 10,
+                        'Transferência': 5}
+# Status atual dos serviços: a maior parte do histórico já foi entregue
+STATUS_ATUAIS = {
+    'Entregue': 58, 'Finalizado': 8, 'Cancelado': 7, 'Em Andamento': 8, 'Aguardando Peças': 5,
+    'Aprovado': 4, 'Aguardando Aprovação': 6, 'Diagnóstico Adicional': 2, 'Cadastrado': 2,
+}
+# (descrição, diagnóstico, valor mediano do orçamento, peso)
+SERVICOS = [
+    ('Troca de óleo e filtros', 'Revisão periódica por quilometragem', 250, 20),
+    ('Troca de pastilhas de freio', 'Ruído ao frear e pastilhas no limite', 380, 12),
+    ('Alinhamento e balanceamento', 'Veículo puxando para o lado', 160, 12),
+    ('Revisão completa', 'Revisão dos 40.000 km', 1100, 8),
+    ('Troca da correia dentada', 'Correia com desgaste visível', 900, 5),
+    ('Substituição da bateria', 'Falha na partida a frio', 550, 6),
+    ('Reparo do ar-condicionado', 'Ar-condicionado sem refrigeração', 700, 5),
+    ('Troca de amortecedores', 'Barulho na suspensão dianteira', 1400, 5),
+    ('Reparo da embreagem', 'Embreagem patinando', 1800, 4),
+    ('Limpeza de bicos injetores', 'Falhas e consumo elevado', 320, 5),
+    ('Diagnóstico eletrônico', 'Luz de injeção acesa no painel', 180, 8),
+    ('Retífica do motor', 'Perda de compressão e fumaça azul', 6500, 1),
+]
+PECAS = [
+    ('Óleo de motor 5W30', 45), ('Filtro de óleo', 35), ('Filtro de ar', 40), ('Filtro de combustível', 55),
+    ('Pastilha de freio', 120), ('Disco de freio', 260), ('Amortecedor', 380), ('Correia dentada', 150),
+    ('Bateria 60Ah', 480), ('Vela de ignição', 30), ('Fluido de freio', 28), ('Lâmpada H4', 25),
+    ('Kit de embreagem', 850), ('Palheta do limpador', 45), ('Gás do ar-condicionado', 90),
+]
+MARCAS_DE_PECAS = ['Bosch', 'Mahle', 'Fras-le', 'Cofap', 'Moura', 'NGK', 'Gates', 'Valeo', 'Tecfil', 'Sabó']
+
+CAMINHO_FELIZ = ['Cadastrado', 'Aguardando Aprovação', 'Aprovado', 'Em Andamento', 'Finalizado', 'Entregue']
+
+
+def _sortear(rng, pesos):
+    return rng.choices(list(pesos), weights=list(pesos.values()))[0]
+
+
+def _ascii(texto):
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode().lower().replace(' ', '')
+
+
+def _cpf(numero):
+    """CPF com dígitos verificadores válidos derivado de ``numero``."""
+    digitos = [int(d) for d in f'{numero % 10 ** 9:09d}']
+    for tamanho in (9, 10):
+        soma = sum(digito * peso for digito, peso in zip(digitos, range(tamanho + 1, 1, -1)))
+        digitos.append(soma * 10 % 11 % 10)
+    cpf = ''.join(map(str, digitos))
+    return f'{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}'
+
+
+def _telefone(rng, ddd):
+    return f'({ddd}) 9{rng.randrange(10 ** 7, 10 ** 8)}'
+
+
+def _valor(rng, mediana, dispersao=0.45):
+    return Decimal(rng.lognormvariate(math.log(mediana), dispersao)).quantize(Decimal('0.01'))
+
+
+def _placa(rng):
+    letras = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    return (''.join(rng.choice(letras) for _ in range(3)) + str(rng.randrange(10))
+            + rng.choice(letras) + f'{rng.randrange(100):02d}')
+
+
+def _caminho_de_status(rng, atual):
+    """
+    Sequência de status que termina em ``atual`` respeitando ``Servico.TRANSITIONS``.
+    Parte dos serviços passa por um desvio (peças ou diagnóstico adicional) depois de
+    entrar em andamento.
+    """
+    if atual == 'Cancelado':
+        return ['Cadastrado', 'Aguardando Aprovação', 'Cancelado']
+    if atual in ('Aguardando Peças', 'Diagnóstico Adicional'):
+        return CAMINHO_FELIZ[:4] + [atual]
+    caminho = CAMINHO_FELIZ[:CAMINHO_FELIZ.index(atual) + 1]
+    if atual in ('Finalizado', 'Entregue') and rng.random() < 0.2:
+        desvio = (['Aguardando Peças', 'Em Andamento'] if rng.random() < 0.7
+                  else ['Diagnóstico Adicional', 'Aguardando Aprovação', 'Aprovado', 'Em Andamento'])
+        caminho[4:4] = desvio
+    return caminho
+
+
+def planejar(clientes, mecanicos, insumos, seed=0, dias=730, hoje=None, batch_size=50000):
+    """
+    Plano da carga: quantidades, seed, período e o primeiro ID livre de cada tabela.
+    É um dicionário simples para poder ser enviado aos processos de ``gerar_bloco``.
+    """
+    inicio = {}
+    for model in [*MODELOS_DO_CATALOGO, *MODELOS_DO_BLOCO]:
+        maior = model.objects.aggregate(maior=Max('pk'))['maior'] or 0
+        inicio[model._meta.label] = maior + 1
+    return {
+        'clientes': clientes, 'mecanicos': mecanicos, 'insumos': insumos, 'seed': seed, 'dias': dias,
+        'hoje': hoje or timezone.localdate(), 'batch_size': batch_size, 'inicio': inicio,
+        'blocos': math.ceil(clientes / CLIENTES_POR_BLOCO),
+    }
+
+
+def gerar_catalogo(plano):
+    """Linhas de mecânicos, insumos e da entrada inicial de estoque de cada insumo."""
+    rng = random.Random(f"{plano['seed']}:catalogo")
+    agora = timezone.now()
+    linhas = {model: [] for model in MODELOS_DO_CATALOGO}
+
+    for i in range(plano['mecanicos']):
+        nome, sobrenome = rng.choice(NOMES), rng.choice(SOBRENOMES)
+        mecanico_id = plano['inicio'][Mecanico._meta.label] + i
+        linhas[Mecanico].append({
+            'mecanico_ID': mecanico_id, 'nome': f'{nome} {sobrenome}',
+            'telefone': _telefone(rng, _sortear(rng, {c[2]: c[4] for c in CIDADES})),
+            'email': f'{_ascii(nome)}.{_ascii(sobrenome)}.{mecanico_id}@oficina.example.com',
+        })
+
+    movimento_id = plano['inicio'][MovimentoEstoque._meta.label]
+    for i in range(plano['insumos']):
+        peca, preco = rng.choice(PECAS)
+        marca = rng.choice(MARCAS_DE_PECAS)
+        insumo_id = plano['inicio'][Insumo._meta.label] + i
+        qtd = int(rng.expovariate(1 / 40))
+        linhas[Insumo].append({
+            'insumo_ID': insumo_id, 'nome': f'{peca} {marca}', 'descricao': f'{peca} da marca {marca}',
+            'preco': _valor(rng, preco, 0.25), 'qtd': qtd, 'qtd_reservada': 0,
+            'estoque_minimo': rng.choice([2, 5, 5, 10, 20]), 'atualizado_em': agora,
+        })
+        if qtd:
+            # O saldo de Insumo é a soma do ledger; a carga entra como uma entrada inicial
+            linhas[MovimentoEstoque].append({
+                'movimento_ID': movimento_id, 'insumo_id': insumo_id, 'servico_id': None,
+                'tipo': MovimentoEstoque.ENTRADA, 'quantidade': qtd, 'observacao': 'Carga sintética',
+                'criado_em': agora,
+            })
+            movimento_id += 1
+    return linhas
+
+
+def gerar_linhas(plano, bloco):
+    """
+    Linhas de endereços, clientes, carros, pagamentos, serviços e históricos de status
+    do ``bloco`` (até ``CLIENTES_POR_BLOCO`` clientes), sem gravar nada.
+    """
+    rng = random.Random(f"{plano['seed']}:{bloco}")
+    hoje, dias = plano['hoje'], plano['dias']
+    fuso = timezone.get_current_timezone()
+    primeiro_mecanico = plano['inicio'][Mecanico._meta.label]
+    proximo = {model: plano['inicio'][model._meta.label] + bloco * capacidade
+               for model, capacidade in CAPACIDADE.items()}
+    linhas = {model: [] for model in MODELOS_DO_BLOCO}
+
+    def novo_id(model):
+        proximo[model] += 1
+        return proximo[model] - 1
+
+    quantidade = min(CLIENTES_POR_BLOCO, plano['clientes'] - bloco * CLIENTES_POR_BLOCO)
+    for _ in range(quantidade):
+        cidade, uf, ddd, prefixo_cep, _peso = rng.choices(CIDADES, weights=[c[4] for c in CIDADES])[0]
+        endereco_id = novo_id(Endereco)
+        endereco = {
+            'endereco_ID': endereco_id,
+            'cep': (prefixo_cep + ''.join(str(rng.randrange(10)) for _ in range(8)))[:8],
+            'rua': rng.choice(RUAS), 'numero': str(rng.randint(1, 3000)), 'bairro': rng.choice(BAIRROS),
+            'cidade': cidade, 'estado': uf,
+            # O ID no complemento garante conteúdo único, exigido pelo hash do endereço
+            'complemento': f'Apto {endereco_id}' if rng.random() < 0.4 else f'Casa {endereco_id}',
+        }
+        endereco['hash_conteudo'] = hash_endereco(endereco)
+        linhas[Endereco].append(endereco)
+
+        cliente_id = novo_id(Cliente)
+        nome, sobrenome = rng.choice(NOMES), rng.choice(SOBRENOMES)
+        linhas[Cliente].append({
+            'cliente_ID': cliente_id, 'nome': f'{nome} {rng.choice(SOBRENOMES)} {sobrenome}',
+            'email': f'{_ascii(nome)}.{_ascii(sobrenome)}.{cliente_id}@example.com', 'cpf': _cpf(cliente_id),
+            'telefone': _telefone(rng, ddd), 'endereco_ID_id': endereco_id,
+        })
+
+        carros = []
+        for _ in range(rng.choices([1, 2, 3], weights=[70, 25, 5])[0]):
+            montadora, modelo, _peso = rng.choices(VEICULOS, weights=[v[2] for v in VEICULOS])[0]
+            carros.append(novo_id(Carro))
+            linhas[Carro].append({
+                'carro_ID': carros[-1], 'modelo_carro': modelo, 'montadora': montadora, 'placa': _placa(rng),
+                'combustivel': _sortear(rng, COMBUSTIVEIS), 'ano': hoje.year - min(int(rng.expovariate(1 / 7)), 30),
+                'Customer_ID_id': cliente_id,
+            })
+
+        for _ in range(min(MAX_SERVICOS, 1 + int(rng.expovariate(1 / 2.5)))):
+            status_atual = _sortear(rng, STATUS_ATUAIS)
+            descricao, diagnostico, mediana, _peso = rng.choices(SERVICOS, weights=[s[3] for s in SERVICOS])[0]
+            orcamento = _valor(rng, mediana)
+            duracao = timedelta(days=min(int(rng.expovariate(1 / 3)), 30))
+            if status_atual in Servico.ACTIVE_STATUSES:
+                # Serviços abertos são recentes; a saída é a prevista
+                data_entrada = hoje - timedelta(days=rng.randrange(30))
+            else:
+                data_entrada = hoje - timedelta(days=rng.randint(1, dias))
+            data_saida = data_entrada + (timedelta(days=rng.randint(0, 2)) if status_atual == 'Cancelado' else duracao)
+            if status_atual not in Servico.ACTIVE_STATUSES:
+                data_saida = min(data_saida, hoje)
+
+            if status_atual == 'Entregue' or (status_atual == 'Finalizado' and rng.random() < 0.6):
+                status_pagamento = 'Pago'
+            else:
+                status_pagamento = 'Parcial' if status_atual in Servico.ACTIVE_STATUSES and rng.random() < 0.1 else 'Pendente'
+            pagamento_id = novo_id(Pagamento)
+            desconto = Decimal(rng.choice([0, 0, 0, 0, 5, 10])) / 100
+            linhas[Pagamento].append({
+                'pagamento_ID': pagamento_id, 'valor_total': orcamento,
+                'valor_final': (orcamento * (1 - desconto)).quantize(Decimal('0.01')),
+                'metodo_pagamento': _sortear(rng, METODOS_DE_PAGAMENTO), 'status': status_pagamento,
+            })
+
+            servico_id = novo_id(Servico)
+            home_service = rng.random() < 0.08
+            linhas[Servico].append({
+                'servico_ID': servico_id, 'cliente_id': cliente_id, 'carro_id': rng.choice(carros),
+                'diagnostico': diagnostico, 'descricao_servico': descricao, 'orcamento': orcamento,
+                'pagamento_id': pagamento_id, 'data_entrada': data_entrada, 'data_saida': data_saida,
+                'retornado': rng.random() < 0.04, 'status_atual': status_atual,
+                # Poucos mecânicos concentram boa parte dos serviços
+                'mecanico_id': primeiro_mecanico + int(rng.triangular(0, plano['mecanicos'], 0)),
+                'home_service': home_service, 'service_address_id': endereco_id if home_service else None,
+            })
+
+            caminho = _caminho_de_status(rng, status_atual)
+            inicio = datetime.combine(data_entrada, time(8), tzinfo=fuso)
+            fim = datetime.combine(min(data_saida, hoje) if status_atual in Servico.ACTIVE_STATUSES else data_saida,
+                                   time(18), tzinfo=fuso)
+            passo = (fim - inicio) / len(caminho)
+            anterior = ''
+            for ordem, status in enumerate(caminho):
+                linhas[Status].append({
+                    'id': novo_id(Status), 'servico_ID_id': servico_id, 'status': status,
+                    'status_anterior': anterior, 'observacao': '',
+                    'data_atualizacao': inicio + passo * ordem + passo * rng.random() / 2,
+                })
+                anterior = status
+    return linhas
+
+
+def _valor_copy(valor):
+    if valor is None:
+        return '\\N'
+    if isinstance(valor, bool):
+        return 't' if valor else 'f'
+    return valor
+
+
+def _copiar(model, linhas, batch_size):
+    campos = model._meta.concrete_fields
+    colunas = ', '.join(connection.ops.quote_name(campo.column) for campo in campos)
+    sql = (f"COPY {connection.ops.quote_name(model._meta.db_table)} ({colunas}) "
+           f"FROM STDIN WITH (FORMAT csv, NULL '\\N')")
+    with connection.cursor() as cursor:
+        for inicio in range(0, len(linhas), batch_size):
+            buffer = io.StringIO()
+            escritor = csv.writer(buffer)
+            for linha in linhas[inicio:inicio + batch_size]:
+                escritor.writerow([_valor_copy(linha[campo.attname]) for campo in campos])
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+
+
+def gravar(linhas, batch_size):
+    """
+    Grava as linhas de cada modelo na ordem das chaves estrangeiras, em uma transação.
+    No PostgreSQL usa COPY em lotes de ``batch_size`` linhas; nos demais bancos,
+    ``bulk_create``.
+    """
+    with transaction.atomic():
+        for model, linhas_do_modelo in linhas.items():
+            if not linhas_do_modelo:
+                continue
+            if connection.vendor == 'postgresql':
+                _copiar(model, linhas_do_modelo, batch_size)
+            else:
+                model.objects.bulk_create([model(**linha) for linha in linhas_do_modelo], batch_size=batch_size)
+    return {model: len(linhas_do_modelo) for model, linhas_do_modelo in linhas.items()}
+
+
+def gerar_bloco(plano, bloco):
+    """Gera e grava um bloco; é a unidade de trabalho de cada processo."""
+    return gravar(gerar_linhas(plano, bloco), plano['batch_size'])
+
+
+def finalizar():
+    """
+    Ajusta as sequências de ID depois dos IDs explícitos da carga e refaz o que os
+    sinais fariam: o agregado de receita mensal e as versões das listagens em cache.
+    """
+    modelos = [*MODELOS_DO_CATALOGO, *MODELOS_DO_BLOCO]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), modelos):
+            cursor.execute(sql)
+    reconstruir()
+    with transaction.atomic():
+        for model in modelos:
+            bump_version(model)
@@ -0,0 +1,56 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Carro, Cliente, Endereco, Insumo, InsumoExcluido, Mecanico, Pagamento, Servico, Status
+from .revenue.services import atualizar_meses, inicio_do_mes, meses_do_pagamento
+from .versioning import bump_version
+
+# Recursos servidos com ETag e cache de respostas; ver api.conditional e api.caching.
+# Gravações em lote ou via update() não disparam sinais e chamam bump_version direto.
+VERSIONED_MODELS = (Mecanico, Cliente, Carro, Endereco, Pagamento, Servico, Insumo, Status)
+
+
+@receiver(post_delete, sender=Insumo)
+def registrar_exclusao_insumo(sender, instance, **kwargs):
+    InsumoExcluido.objects.create(insumo_ID=instance.pk)
+
+
+def incrementar_versao(sender, **kwargs):
+    bump_version(sender)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(incrementar_versao, sender=model, dispatch_uid=f'versao_{model._meta.label_lower}_save')
+    post_delete.connect(incrementar_versao, sender=model, dispatch_uid=f'versao_{model._meta.label_lower}_delete')
+
+
+@receiver(pre_save, sender=Servico)
+def lembrar_mes_anterior(sender, instance, raw=False, **kwargs):
+    # Se a data de entrada mudar, o agregado do mês antigo também precisa ser refeito.
+    # Instâncias lidas do banco ou já salvas trazem a data gravada; só as demais consultam.
+    if raw or instance.pk is None or hasattr(instance, '_data_entrada_gravada'):
+        return
+    instance._data_entrada_gravada = (
+        Servico.objects.filter(pk=instance.pk).values_list('data_entrada', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Servico)
+@receiver(post_delete, sender=Servico)
+def atualizar_receita_do_servico(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    meses = {inicio_do_mes(instance.data_entrada)}
+    anterior = getattr(instance, '_data_entrada_gravada', None)
+    if anterior:
+        meses.add(inicio_do_mes(anterior))
+    atualizar_meses(meses)
+    instance._data_entrada_gravada = instance.data_entrada
+
+
+@receiver(post_save, sender=Pagamento)
+def atualizar_receita_do_pagamento(sender, instance, raw=False, **kwargs):
+    # Serviços apagados junto com o pagamento já disparam o próprio post_delete
+    if raw:
+        return
+    atualizar_meses(meses_do_pagamento(instance.pk))
@@ -0,0 +1,49 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import VersaoRecurso
+
+
+def resource_key(model):
+    return model._meta.label_lower
+
+
+def bump_version(model):
+    """
+    Incrementa o contador do recurso depois do commit da transação corrente, em uma
+    transação própria e curta (imediatamente, fora de transação). Assim os escritores
+    não ficam na fila da trava da linha do contador até o commit, e uma gravação
+    desfeita não incrementa nada.
+    """
+    key = resource_key(model)
+    transaction.on_commit(lambda: _incrementar(key))
+
+
+def _incrementar(key):
+    updated = VersaoRecurso.objects.filter(recurso=key).update(versao=F('versao') + 1, atualizado_em=timezone.now())
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            VersaoRecurso.objects.create(recurso=key, versao=1)
+    except IntegrityError:
+        # Outro processo criou o contador primeiro
+        VersaoRecurso.objects.filter(recurso=key).update(versao=F('versao') + 1, atualizado_em=timezone.now())
+
+
+def get_version(model):
+    """Retorna ``(versao, atualizado_em)`` do recurso; ``(0, None)`` se nunca foi alterado."""
+    row = VersaoRecurso.objects.filter(recurso=resource_key(model)).values_list('versao', 'atualizado_em').first()
+    return row or (0, None)
+
+
+def get_versions(models):
+    """``get_version`` de vários recursos com uma única consulta, na ordem de ``models``."""
+    keys = [resource_key(model) for model in models]
+    rows = {
+        recurso: (versao, atualizado_em)
+        for recurso, versao, atualizado_em in VersaoRecurso.objects.filter(recurso__in=keys)
+        .values_list('recurso', 'versao', 'atualizado_em')
+    }
+    return [rows.get(key, (0, None)) for key in keys]
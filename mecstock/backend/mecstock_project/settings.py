@@ -77,9 +77,35 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'your_password'),
         'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
         'PORT': os.getenv('POSTGRES_PORT', '5432'),
+        # Perfil de produção: cada worker mantém sua conexão entre requisições (0 volta a
+        # abrir uma por requisição) e verifica se ela ainda responde antes de reutilizá-la
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        # Atrás do PgBouncer em modo transaction os cursores nomeados não sobrevivem entre
+        # transações; nesse caso defina DB_DISABLE_SERVER_SIDE_CURSORS=True
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_DISABLE_SERVER_SIDE_CURSORS', 'False') == 'True',
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+            # Limites em milissegundos aplicados pelo servidor a cada sessão
+            'options': (
+                f"-c statement_timeout={int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000'))} "
+                f"-c idle_in_transaction_session_timeout={int(os.getenv('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS', '60000'))}"
+            ),
+        },
     }
 }
 
+# Linhas buscadas por vez ao percorrer querysets grandes com core.db.stream_queryset
+# (cursor do lado do servidor no PostgreSQL)
+DB_STREAM_CHUNK_SIZE = int(os.getenv('DB_STREAM_CHUNK_SIZE', '2000'))
+
+# Atraso do cursor do feed de alterações (api.changefeed): deve superar a duração de
+# uma transação, limitada acima pelo statement_timeout e pelo idle_in_transaction
+CHANGE_FEED_LAG_SECONDS = int(os.getenv('CHANGE_FEED_LAG_SECONDS', '60'))
+
+# Eventos mais recentes de cada serviço incluídos por ?expand=historico nas listagens
+EXPANDED_HISTORY_LIMIT = int(os.getenv('EXPANDED_HISTORY_LIMIT', '10'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -113,6 +139,49 @@ STATIC_URL = '/static/'
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Django REST Framework
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.MecStockCursorPagination',
+    'PAGE_SIZE': 100,
+    # Money fields are DecimalField(10, 2); render them as JSON numbers, which keep every
+    # cent exactly, so existing clients keep receiving numbers instead of strings
+    'COERCE_DECIMAL_TO_STRING': False,
+    # ProtectedError (exclusões em cascata barradas por PROTECT) vira 409 em todas as views
+    'EXCEPTION_HANDLER': 'api.exceptions.exception_handler',
+}
+
+# Cache: Redis when REDIS_URL is set (shared by every worker; configure the server with
+# maxmemory-policy allkeys-lru), otherwise a per-process LRU local-memory cache
+API_CACHE_TTL = int(os.getenv('API_CACHE_TTL', '300'))
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'TIMEOUT': API_CACHE_TTL,
+            'KEY_PREFIX': 'mecstock',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'mecstock',
+            'TIMEOUT': API_CACHE_TTL,
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv('API_CACHE_MAX_ENTRIES', '5000'))},
+        }
+    }
+
+# Consulta de CEP (/api/cep/<cep>/): base local, LRU em memória e serviço externo
+# plugável; core.cep.fetchers.OfflineFetcher desliga as consultas externas
+CEP_FETCHER = os.getenv('CEP_FETCHER', 'core.cep.fetchers.ViaCepFetcher')
+CEP_UPSTREAM_TIMEOUT = float(os.getenv('CEP_UPSTREAM_TIMEOUT', '3'))
+CEP_CACHE_SIZE = int(os.getenv('CEP_CACHE_SIZE', '10000'))
+
+# Seconds the aggregated /api/dashboard/summary/ payload is kept in cache
+DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', '30'))
+
 # Swagger settings
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
@@ -25,14 +25,12 @@ def validate_client_email(email):
     """Validate if email exists in the database"""
     try:
         api_client = APIClient()
-        response = api_client.get("/api/clientes/")
-        
-        if response.status_code == 200:
-            clients = response.json()
-            for client in clients:
-                if client.get('email', '').lower() == email.lower():
-                    return client
-        return None
+        # Case-insensitive lookup served by the LOWER(email) index on the backend
+        response = api_client.get("/api/clientes/lookup/", params={"email": email})
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         st.error(f"Erro ao validar email: {str(e)}")
         return None
@@ -126,16 +124,12 @@ def show_client_dashboard():
     # Get client's services
     try:
         api_client = APIClient()
-        services_response = api_client.get("/api/servicos/")
+        try:
+            client_services = api_client.get_all("/api/servicos/", params={"cliente": client_data.get('cliente_ID')})
+        except requests.RequestException:
+            client_services = None
         
-        if services_response.status_code == 200:
-            all_services = services_response.json()
-            # Filter services for this client
-            client_services = [
-                service for service in all_services 
-                if service.get('cliente') == client_data.get('cliente_ID')
-            ]
-            
+        if client_services is not None:
             if client_services:
                 st.markdown(f"## 📋 Suas Ordens de Serviço ({len(client_services)})")
                 
@@ -196,15 +190,13 @@ def show_client_dashboard():
                         
                         # Show service history/status updates if available
                         try:
-                            status_response = api_client.get(f"/api/status/?servico_ID={service.get('servico_ID')}")
-                            if status_response.status_code == 200:
-                                status_history = status_response.json()
-                                if status_history:
-                                    with st.expander("📈 Histórico de Status"):
-                                        for status_entry in sorted(status_history, key=lambda x: x.get('data_atualizacao', ''), reverse=True):
-                                            st.write(f"**{status_entry.get('data_atualizacao')}** - {status_entry.get('status')}")
-                                            if status_entry.get('observacao'):
-                                                st.write(f"*{status_entry.get('observacao')}*")
+                            status_history = api_client.get_all(f"/api/servicos/{service.get('servico_ID')}/historico/")
+                            if status_history:
+                                with st.expander("📈 Histórico de Status"):
+                                    for status_entry in reversed(status_history):
+                                        st.write(f"**{status_entry.get('data_atualizacao')}** - {status_entry.get('status')}")
+                                        if status_entry.get('observacao'):
+                                            st.write(f"*{status_entry.get('observacao')}*")
                         except:
                             pass
             else:
@@ -216,60 +216,64 @@ st.markdown(f"""
 # Fetch data with caching
 @st.cache_data(ttl=60, show_spinner=False)
 def fetch_dashboard_data():
-    """Fetch all dashboard data"""
+    """Fetch the aggregated dashboard summary (computed and cached by the backend)"""
     try:
-        # Fetch data from API
-        services_response = api_client.get("/api/servicos/")
-        clients_response = api_client.get("/api/clientes/")
-        cars_response = api_client.get("/api/carros/")
+        response = api_client.get("/api/dashboard/summary/")
         
-        if all(r.status_code == 200 for r in [services_response, clients_response, cars_response]):
-            services = services_response.json()
-            clients = clients_response.json()
-            cars = cars_response.json()
-            
-            return {
-                'services': services,
-                'clients': clients,
-                'cars': cars,
-                'is_live': True
-            }
+        if response.status_code == 200:
+            return {**response.json(), 'is_live': True}
         else:
             # Mock data for demonstration
             return generate_mock_data()
             
     except Exception as e:
+        # Mock data for demonstration
         return generate_mock_data()
 
 def generate_mock_data():
-    """Generate mock data for demonstration"""
+    """Generate mock data for demonstration, in the same shape as /api/dashboard/summary/"""
     import random
     from datetime import datetime, timedelta
     
     # Generate mock services
     services = []
-    statuses = ['Aguardando', 'Em Andamento', 'Concluído', 'Cancelado']
+    statuses = ['Cadastrado', 'Em Andamento', 'Finalizado', 'Cancelado']
     for i in range(45):
         services.append({
-            'id': i + 1,
-            'cliente': f'Cliente {i + 1}',
-            'veiculo': f'Veículo {i + 1}',
+            'servico_ID': i + 1,
+            'cliente__nome': f'Cliente {i + 1}',
             'status_atual': random.choice(statuses),
-            'valor': random.randint(100, 2000),
-            'data_entrada': (datetime.now() - timedelta(days=random.randint(0, 30))).isoformat(),
-            'data_conclusao': (datetime.now() - timedelta(days=random.randint(0, 15))).isoformat() if random.choice([True, False]) else None
+            'orcamento': random.randint(100, 2000),
+            'data_entrada': (datetime.now() - timedelta(days=random.randint(0, 30))).date().isoformat(),
+            'data_saida': (datetime.now() - timedelta(days=random.randint(0, 15))).date().isoformat() if random.choice([True, False]) else None
         })
     
-    # Generate mock clients
-    clients = [{'id': i + 1, 'nome': f'Cliente {i + 1}'} for i in range(85)]
+    week_ago = (datetime.now() - timedelta(days=7)).date().isoformat()
+    pending = [s for s in services if s['status_atual'] in ['Cadastrado', 'Em Andamento']]
+    finished = [s for s in services if s['data_saida']]
+    
+    status_counts = {}
+    for service in services:
+        status_counts[service['status_atual']] = status_counts.get(service['status_atual'], 0) + 1
+    
+    daily_revenue = {}
+    for service in finished:
+        if service['data_saida'] > week_ago:
+            daily_revenue[service['data_saida']] = daily_revenue.get(service['data_saida'], 0) + service['orcamento']
     
-    # Generate mock cars
-    cars = [{'id': i + 1, 'modelo': f'Modelo {i + 1}'} for i in range(120)]
+    recent = sorted([s for s in services if s['data_entrada'] > week_ago], key=lambda s: s['data_entrada'], reverse=True)
     
     return {
-        'services': services,
-        'clients': clients,
-        'cars': cars,
+        'total_servicos': len(services),
+        'servicos_semana': len(recent),
+        'servicos_pendentes': len(pending),
+        'receita_total': sum(s['orcamento'] for s in finished),
+        'total_clientes': 85,
+        'total_carros': 120,
+        'por_status': [{'status_atual': k, 'total': v} for k, v in status_counts.items()],
+        'receita_diaria': [{'data_saida': k, 'receita': v} for k, v in sorted(daily_revenue.items())],
+        'pendentes': pending[:5],
+        'recentes': recent[:10],
         'is_live': False
     }
 
@@ -283,9 +287,8 @@ st.subheader("📊 Métricas Principais")
 col1, col2, col3, col4, col5 = st.columns(5)
 
 with col1:
-    total_services = len(dashboard_data['services'])
-    services_this_week = len([s for s in dashboard_data['services'] 
-                             if datetime.fromisoformat(s['data_entrada'].replace('Z', '')) > datetime.now() - timedelta(days=7)])
+    total_services = dashboard_data['total_servicos']
+    services_this_week = dashboard_data['servicos_semana']
     
     st.markdown(f"""
     <div class="metric-card">
@@ -296,7 +299,7 @@ with col1:
     """, unsafe_allow_html=True)
 
 with col2:
-    total_clients = len(dashboard_data['clients'])
+    total_clients = dashboard_data['total_clientes']
     st.markdown(f"""
     <div class="metric-card">
         <div class="metric-value">{total_clients}</div>
@@ -306,7 +309,7 @@ with col2:
     """, unsafe_allow_html=True)
 
 with col3:
-    total_cars = len(dashboard_data['cars'])
+    total_cars = dashboard_data['total_carros']
     st.markdown(f"""
     <div class="metric-card">
         <div class="metric-value">{total_cars}</div>
@@ -316,7 +319,7 @@ with col3:
     """, unsafe_allow_html=True)
 
 with col4:
-    revenue = sum([s['valor'] for s in dashboard_data['services'] if s.get('data_conclusao')])
+    revenue = float(dashboard_data['receita_total'])
     st.markdown(f"""
     <div class="metric-card">
         <div class="metric-value">R${revenue:,.0f}</div>
@@ -326,7 +329,7 @@ with col4:
     """, unsafe_allow_html=True)
 
 with col5:
-    pending_services = len([s for s in dashboard_data['services'] if s['status_atual'] in ['Aguardando', 'Em Andamento']])
+    pending_services = dashboard_data['servicos_pendentes']
     st.markdown(f"""
     <div class="metric-card">
         <div class="metric-value">{pending_services}</div>
@@ -377,10 +380,7 @@ with chart_col1:
     st.markdown('<div class="chart-title">📈 Ordens de Serviço por Status</div>', unsafe_allow_html=True)
     
     # Status distribution chart
-    status_counts = {}
-    for service in dashboard_data['services']:
-        status = service['status_atual']
-        status_counts[status] = status_counts.get(status, 0) + 1
+    status_counts = {row['status_atual']: row['total'] for row in dashboard_data['por_status']}
     
     if status_counts:
         fig_status = px.pie(
@@ -403,12 +403,7 @@ with chart_col2:
     st.markdown('<div class="chart-title">💰 Receita dos Últimos 7 Dias</div>', unsafe_allow_html=True)
     
     # Revenue chart
-    daily_revenue = {}
-    for service in dashboard_data['services']:
-        if service.get('data_conclusao'):
-            date = datetime.fromisoformat(service['data_conclusao'].replace('Z', '')).date()
-            if date > datetime.now().date() - timedelta(days=7):
-                daily_revenue[date] = daily_revenue.get(date, 0) + service['valor']
+    daily_revenue = {row['data_saida']: float(row['receita']) for row in dashboard_data['receita_diaria']}
     
     if daily_revenue:
         dates = list(daily_revenue.keys())
@@ -440,12 +435,11 @@ bottom_col1, bottom_col2 = st.columns(2)
 with bottom_col1:
     st.subheader("📋 Serviços Pendentes")
     
-    pending_services_list = [s for s in dashboard_data['services'] 
-                           if s['status_atual'] in ['Aguardando', 'Em Andamento']][:5]
+    pending_services_list = dashboard_data['pendentes']
     
     if pending_services_list:
         for service in pending_services_list:
-            status_color = "#FFA500" if service['status_atual'] == 'Aguardando' else "#4CAF50"
+            status_color = "#4CAF50" if service['status_atual'] == 'Em Andamento' else "#FFA500"
             st.markdown(f"""
             <div class="activity-item">
                 <div class="activity-icon" style="background: {status_color}20; color: {status_color};">
@@ -453,10 +447,10 @@ with bottom_col1:
                 </div>
                 <div class="activity-content">
                     <div class="activity-title">
-                        OS #{service['id']} - {service['cliente']}
+                        OS #{service['servico_ID']} - {service['cliente__nome']}
                     </div>
                     <div class="activity-time">
-                        {service['status_atual']} • R${service['valor']:,.2f}
+                        {service['status_atual']} • R${float(service['orcamento']):,.2f}
                     </div>
                 </div>
             </div>
@@ -467,38 +461,16 @@ with bottom_col1:
 with bottom_col2:
     st.subheader("🕒 Atividade Recente")
     
-    recent_services = []
-    for s in dashboard_data['services']:
-        if s.get('data_ententrada'):
-            try:
-                date_str = s['data_entrada']
-                # Handle different date formats
-                if 'T' in str(date_str):
-                    # If it's a datetime string, parse it
-                    service_date = datetime.fromisoformat(str(date_str).replace('Z', ''))
-                else:
-                    # If it's just a date string, parse it as date and convert to datetime
-                    service_date = datetime.strptime(str(date_str), '%Y-%m-%d')
-                
-                # Check if service is from the last 7 days
-                if service_date > datetime.now() - timedelta(days=7):
-                    recent_services.append(s)
-            except (ValueError, TypeError):
-                # Skip services with invalid dates
-                continue
-    
-    for service in recent_services:
-        created_date = datetime.fromisoformat(service['data_entrada'].replace('Z', ''))
+    for service in dashboard_data['recentes']:
+        created_date = datetime.strptime(service['data_entrada'], '%Y-%m-%d')
         time_ago = datetime.now() - created_date
         
         if time_ago.days > 0:
             time_str = f"{time_ago.days} dias atrás"
-        elif time_ago.seconds > 3600:
-            time_str = f"{time_ago.seconds // 3600}h atrás"
         else:
-            time_str = f"{time_ago.seconds // 60}min atrás"
+            time_str = "hoje"
         
-        icon = "✅" if service['status_atual'] == 'Concluído' else "🔧"
+        icon = "✅" if service['status_atual'] in ['Finalizado', 'Entregue'] else "🔧"
         
         st.markdown(f"""
         <div class="activity-item">
@@ -507,10 +479,10 @@ with bottom_col2:
             </div>
             <div class="activity-content">
                 <div class="activity-title">
-                    Nova OS #{service['id']} criada
+                    Nova OS #{service['servico_ID']} criada
                 </div>
                 <div class="activity-time">
-                    {service['cliente']} • {time_str}
+                    {service['cliente__nome']} • {time_str}
                 </div>
             </div>
         </div>
@@ -555,6 +527,6 @@ st.markdown("---")
 st.markdown(f"""
 <div style="text-align: center; opacity: 0.6; font-size: 12px;">
     MecStock Dashboard • Última atualização: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')} • 
-    {len(dashboard_data['services'])} ordens • {len(dashboard_data['clients'])} clientes
+    {dashboard_data['total_servicos']} ordens • {dashboard_data['total_clientes']} clientes
 </div>
 """, unsafe_allow_html=True)
\ No newline at end of file
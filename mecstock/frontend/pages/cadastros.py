@@ -60,10 +60,8 @@ def cadastro_cliente_page():
     
             if cep and len(cep) == 8 and cep != st.session_state.endereco_data.get('cep', ''):
                 try:
-            
-                    response = requests.get(f"https://viacep.com.br/ws/{cep}/json/")
-                    if response.status_code == 200:
-                        address_data = response.json()
+                    address_data = api_client.lookup_cep(cep)
+                    if address_data:
                         st.session_state.endereco_data = {
                             'cep': cep,
                             'rua': address_data.get('logradouro', ''),
@@ -72,7 +70,7 @@ def cadastro_cliente_page():
                             'estado': address_data.get('uf', ''),
                             'complemento': address_data.get('complemento', '')
                         }
-                except Exception as e:
+                except requests.RequestException as e:
                     st.error(f"Erro ao buscar CEP: {str(e)}")
             
             rua = st.text_input("Rua", 
@@ -200,74 +198,58 @@ def cadastro_cliente_page():
                 with st.spinner("Saving information..."):
                     try:
                 
-                        endereco_response = api_client.post("/api/enderecos/", json=st.session_state.endereco_data)
-                        
-                        if endereco_response.status_code == 201:
-                    
-                            endereco_data = endereco_response.json()
+                        # Client and address in a single request; the backend reuses an
+                        # existing address with the same content instead of duplicating it
+                        cliente_data = {
+                            "nome": st.session_state.cliente_data.get('Nome', ''),
+                            "email": st.session_state.cliente_data.get('Email', ''),
+                            "cpf": st.session_state.cliente_data.get('CPF', ''),
+                            "telefone": st.session_state.cliente_data.get('Telefone', ''),
+                            "endereco": st.session_state.endereco_data
+                        }
+
+                        cliente_response = api_client.post("/api/clientes/cadastro/", json=cliente_data)
+
+                        if cliente_response.status_code == 201:
                     
-                            if "id" in endereco_data:
-                                endereco_id = endereco_data["id"]
-                            elif "endereco_ID" in endereco_data:
-                                endereco_id = endereco_data["endereco_ID"] 
-                            else:
-                        
-                                st.warning(f"Could not find ID in response. Available keys: {', '.join(endereco_data.keys())}")
-                                endereco_id = list(endereco_data.values())[0] if endereco_data else None
-                            
+                            st.success("Client successfully registered")
+
                     
-                            cliente_data = {
-                                "nome": st.session_state.cliente_data.get('Nome', ''),
-                                "email": st.session_state.cliente_data.get('Email', ''),
-                                "cpf": st.session_state.cliente_data.get('CPF', ''),
-                                "telefone": st.session_state.cliente_data.get('Telefone', ''),
-                                "endereco_ID": endereco_id  # Try without _id suffix first
-                            }
+                            st.write("")
+                            st.write("")
 
-                            cliente_response = api_client.post("/api/clientes/", json=cliente_data)
+                    
+                            button_container = st.container(border=True)
                             
-                            if cliente_response.status_code == 201:
+                            with button_container:
                         
-                                st.success("Client successfully registered")
-
+                                view_btn = st.button(
+                                    "View Client Details", 
+                                    key="view_client_btn", 
+                                    use_container_width=True,
+                                    type="secondary"
+                                )
+                                
                         
                                 st.write("")
-                                st.write("")
-
-                        
-                                button_container = st.container(border=True)
                                 
-                                with button_container:
-                            
-                                    view_btn = st.button(
-                                        "View Client Details", 
-                                        key="view_client_btn", 
-                                        use_container_width=True,
-                                        type="secondary"
-                                    )
-                                    
-                            
-                                    st.write("")
-                                    
-                            
-                                    new_btn = st.button(
-                                        "Register New Client", 
-                                        key="new_reg_btn", 
-                                        use_container_width=True,
-                                        type="primary"
-                                    )
+                        
+                                new_btn = st.button(
+                                    "Register New Client", 
+                                    key="new_reg_btn", 
+                                    use_container_width=True,
+                                    type="primary"
+                                )
 
+                    
+                            if new_btn:
                         
-                                if new_btn:
-                            
-                                    st.session_state.step = 1
-                                    st.session_state.cliente_data = {}
-                                    st.session_state.endereco_data = {}
-                                    st.rerun()
-                            else:
-                                st.error(f"Error registering client: {cliente_response.text}")
+                                st.session_state.step = 1
+                                st.session_state.cliente_data = {}
+                                st.session_state.endereco_data = {}
+                                st.rerun()
                         else:
-                            st.error(f"Error registering address: {endereco_response.text}")
+                            st.error(f"Error registering client: {cliente_response.text}")
                     except Exception as e:
                         st.error(f"Error during registration: {str(e)}")
 
@@ -282,12 +264,12 @@ def cadastro_carro_page():
     
     api_client = APIClient()
     
-    clientes_response = api_client.get("/api/clientes/")
-    if clientes_response.status_code != 200:
+    try:
+        clientes = api_client.get_all("/api/clientes/")
+    except requests.RequestException:
         st.error("Não foi possível carregar a lista de clientes. Verifique a conexão.")
         return
     
-    clientes = clientes_response.json()
     cliente_options = [f"{cliente['nome']} (ID: {cliente['cliente_ID']})" for cliente in clientes]
     
     if st.session_state.carro_step == 1:
@@ -3,7 +3,9 @@ import requests
 import pandas as pd
 from streamlit_searchbox import st_searchbox
 import plotly.express as px
+from utils.api_client import APIClient
 from utils.auth import check_admin_access, add_logout_sidebar
+from utils.helpers import collect_editor_changes
 
 # Check admin access first (before any other Streamlit commands)
 check_admin_access()
@@ -13,12 +15,36 @@ st.title("Stock Management")
 # Add logout sidebar
 add_logout_sidebar()
 
+api_client = APIClient()
+
 def fetch_stock_data():
-    response = requests.get("http://localhost:8000/api/insumos/")
-    if response.status_code == 200:
-        return response.json()
-    else:
+    """
+    Keep a per-session copy of the catalogue and apply only what changed since the last
+    render, using the since-cursor change feed instead of refetching every item.
+    """
+    cache = st.session_state.setdefault("stock_cache", {"items": {}, "cursor": None})
+    try:
+        while True:
+            params = {"desde": cache["cursor"]} if cache["cursor"] else None
+            response = api_client.get("/api/insumos/alteracoes/", params=params)
+            response.raise_for_status()
+            feed = response.json()
+            for item in feed["alterados"]:
+                cache["items"][item["insumo_ID"]] = item
+            for insumo_id in feed["removidos"]:
+                cache["items"].pop(insumo_id, None)
+            cache["cursor"] = feed["cursor"]
+            if not feed["mais"]:
+                break
+    except requests.RequestException:
         st.error("Failed to fetch stock data.")
+    return list(cache["items"].values())
+
+def fetch_low_stock():
+    try:
+        return api_client.get_all("/api/insumos/low-stock/")
+    except requests.RequestException:
+        st.error("Failed to fetch low stock items.")
         return []
 
 tab1, tab2, tab3 = st.tabs(["Stock Overview", "Add New Item", "Analytics"])
@@ -45,6 +71,7 @@ with tab1:
                    df['descricao'].str.contains(search_term, case=False)]
         
         df = df.sort_values(by=sort_by)
+        df['actions'] = False
         
 
         edited_df = st.data_editor(
@@ -66,8 +93,19 @@ with tab1:
                 ),
                 "qtd": st.column_config.NumberColumn(
                     "Quantity",
-                    help="Available quantity",
+                    help="Quantity on hand",
+                ),
+                "qtd_reservada": st.column_config.NumberColumn(
+                    "Reserved",
+                    help="Quantity reserved for open services",
+                    disabled=True,
+                ),
+                "estoque_minimo": st.column_config.NumberColumn(
+                    "Reorder Point",
+                    help="Flag the item as low stock when the available quantity falls below this value",
+                    min_value=0,
                 ),
+                "atualizado_em": None,
                 "descricao": st.column_config.TextColumn(
                     "Description",
                     help="Item description",
@@ -86,49 +124,47 @@ with tab1:
         
 
         if st.button("Save Changes"):
-            changes_made = False
+            upserts, deletes = collect_editor_changes(
+                edited_df, df, "insumo_ID", ["nome", "preco", "qtd", "estoque_minimo", "descricao"],
+                delete_column="actions"
+            )
+            # Quantities are never overwritten: an edit becomes an adjustment of the difference,
+            # so concurrent stock movements made since the page loaded are not lost
+            original_qtd = df.set_index("insumo_ID")["qtd"]
+            adjustments = []
+            for row in upserts:
+                if "qtd" in row:
+                    delta = int(row.pop("qtd")) - int(original_qtd[row["insumo_ID"]])
+                    if delta:
+                        adjustments.append({"insumo": row["insumo_ID"], "tipo": "ajuste", "quantidade": delta,
+                                            "observacao": "Ajuste manual no estoque"})
+            upserts = [row for row in upserts if len(row) > 1]
             
-    
-            for idx, row in edited_df.iterrows():
-                if row.get('actions', False):
-                    item_id = row['insumo_ID']
-                    delete_response = requests.delete(f"http://localhost:8000/api/insumos/{item_id}/")
-                    if delete_response.status_code == 204:
-                        changes_made = True
-                    else:
-                        st.error(f"Failed to delete item {row['nome']}")
-            
-    
-            for idx, row in edited_df.iterrows():
-                if not row.get('actions', False):
-                    original_row = df.loc[df['insumo_ID'] == row['insumo_ID']].iloc[0]
-                    
-            
-                    if (row['nome'] != original_row['nome'] or 
-                        row['preco'] != original_row['preco'] or
-                        row['qtd'] != original_row['qtd'] or
-                        row['descricao'] != original_row['descricao']):
-                        
-                
-                        update_data = {
-                            "nome": row['nome'],
-                            "preco": row['preco'],
-                            "qtd": row['qtd'],
-                            "descricao": row['descricao']
-                        }
-                        update_response = requests.put(
-                            f"http://localhost:8000/api/insumos/{row['insumo_ID']}/",
-                            json=update_data
-                        )
-                        
-                        if update_response.status_code in [200, 201]:
-                            changes_made = True
-                        else:
-                            st.error(f"Failed to update item {row['nome']}")
-            
-            if changes_made:
-                st.success("Stock updated successfully!")
-                st.rerun()
+            if not upserts and not deletes and not adjustments:
+                st.info("No changes to save.")
+            else:
+                saved = True
+                if upserts or deletes:
+                    response = api_client.bulk("/api/insumos/", upserts, deletes)
+                    if response.status_code != 200:
+                        saved = False
+                        try:
+                            results = response.json().get("results", [])
+                        except ValueError:
+                            results = []
+                        for result in results:
+                            if result.get("status") == "error":
+                                st.error(f"Failed to save item {result.get('id') or result.get('index')}: {result.get('errors')}")
+                        if not results:
+                            st.error(f"Failed to save changes: {response.text}")
+                if saved and adjustments:
+                    response = api_client.post("/api/movimentos-estoque/", json=adjustments)
+                    if response.status_code != 201:
+                        saved = False
+                        st.error(f"Failed to adjust quantities: {response.text}")
+                if saved:
+                    st.success("Stock updated successfully!")
+                    st.rerun()
     else:
         st.info("No stock data available.")
 
@@ -141,6 +177,7 @@ with tab2:
             qtd = st.number_input("Quantity", min_value=0)
         with col2:
             preco = st.number_input("Price", min_value=0.0, format="%.2f")
+        estoque_minimo = st.number_input("Reorder Point", min_value=0, value=5)
         descricao = st.text_area("Description")
         submit_button = st.form_submit_button("Add Item")
 
@@ -152,6 +189,7 @@ with tab2:
                     "nome": nome,
                     "qtd": qtd,
                     "preco": preco,
+                    "estoque_minimo": estoque_minimo,
                     "descricao": descricao
                 }
                 response = requests.post("http://localhost:8000/api/insumos/", json=new_item)
@@ -181,7 +219,8 @@ with tab3:
         st.plotly_chart(fig2, use_container_width=True)
         
 
-        low_stock = df[df['qtd'] < 5]
-        if not low_stock.empty:
-            st.warning("### Low Stock Warning")
-            st.dataframe(low_stock[['nome', 'qtd']], use_container_width=True)
\ No newline at end of file
+    low_stock = fetch_low_stock()
+    if low_stock:
+        st.warning("### Low Stock Warning")
+        st.dataframe(pd.DataFrame(low_stock)[['nome', 'qtd', 'qtd_reservada', 'estoque_minimo']],
+                     use_container_width=True)
\ No newline at end of file
@@ -3,6 +3,7 @@ import pandas as pd
 import requests
 from utils.api_client import APIClient
 from utils.auth import check_admin_access, add_logout_sidebar
+from utils.helpers import collect_editor_changes
 
 check_admin_access()
 
@@ -13,13 +14,34 @@ add_logout_sidebar()
 api_client = APIClient()
 
 def fetch_data(endpoint):
-    response = api_client.get(endpoint)
-    if response.status_code == 200:
-        return response.json()
-    else:
+    try:
+        return api_client.get_all(endpoint)
+    except requests.RequestException:
         st.error(f"Falha ao buscar dados do endpoint {endpoint}")
         return []
 
+def save_changes(endpoint, upserts, deletes):
+    """Send every edit of a table as one bulk request and report the rows that failed"""
+    if not upserts and not deletes:
+        st.info("Nenhuma alteração para salvar.")
+        return False
+    
+    response = api_client.bulk(endpoint, upserts, deletes)
+    if response.status_code == 200:
+        st.success(f"{len(upserts)} registro(s) atualizado(s) e {len(deletes)} excluído(s) com sucesso!")
+        return True
+    
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    failed = [result for result in body.get("results", []) if result.get("status") == "error"]
+    for result in failed:
+        st.error(f"Falha no registro {result.get('id') or result.get('index')}: {result.get('errors')}")
+    if not failed:
+        st.error(f"Falha ao salvar alterações: {body.get('error', response.text)}")
+    return False
+
 tab1, tab2, tab3 = st.tabs(["Clientes", "Veículos", "Mecânicos"])
 
 # ===== CLIENTS TAB =====
@@ -92,46 +114,10 @@ with tab1:
         )
         
         if st.button("Salvar Alterações", key="save_clients"):
-            changes_made = False
-            
-            for idx, row in edited_clients.iterrows():
-                if row['delete']:
-                    delete_response = api_client.delete(f"/api/clientes/{row['cliente_ID']}/")
-                    if delete_response.status_code == 204:
-                        changes_made = True
-                        st.success(f"Cliente {row['nome']} excluído com sucesso!")
-                    else:
-                        st.error(f"Falha ao excluir cliente {row['nome']}")
-            
-            for idx, row in edited_clients.iterrows():
-                if not row['delete']:  # Skip rows marked for deletion
-                    original_row = df_clients.loc[df_clients['cliente_ID'] == row['cliente_ID']].iloc[0]
-                    
-                    if (row['nome'] != original_row['nome'] or
-                        row['email'] != original_row['email'] or
-                        row['cpf'] != original_row['cpf'] or
-                        row['telefone'] != original_row['telefone']):
-                        
-                        update_data = {
-                            "nome": row['nome'],
-                            "email": row['email'],
-                            "cpf": row['cpf'],
-                            "telefone": row['telefone'],
-                            "endereco_ID": row['endereco_ID']
-                        }
-                        
-                        update_response = api_client.put(
-                            f"/api/clientes/{row['cliente_ID']}/",
-                            json=update_data
-                        )
-                        
-                        if update_response.status_code in [200, 201]:
-                            changes_made = True
-                            st.success(f"Cliente {row['nome']} atualizado com sucesso!")
-                        else:
-                            st.error(f"Falha ao atualizar cliente {row['nome']}")
-            
-            if changes_made:
+            upserts, deletes = collect_editor_changes(
+                edited_clients, df_clients, "cliente_ID", ["nome", "email", "cpf", "telefone"]
+            )
+            if save_changes("/api/clientes/", upserts, deletes):
                 st.rerun()  # Refresh the page
     else:
         st.info("Nenhum cliente cadastrado.")
@@ -225,48 +211,10 @@ with tab2:
         )
         
         if st.button("Salvar Alterações", key="save_vehicles"):
-            changes_made = False
-            
-            for idx, row in edited_vehicles.iterrows():
-                if row['delete']:
-                    delete_response = api_client.delete(f"/api/carros/{row['carro_ID']}/")
-                    if delete_response.status_code == 204:
-                        changes_made = True
-                        st.success(f"Veículo {row['modelo_carro']} - {row['placa']} excluído com sucesso!")
-                    else:
-                        st.error(f"Falha ao excluir veículo {row['modelo_carro']} - {row['placa']}")
-            
-            for idx, row in edited_vehicles.iterrows():
-                if not row['delete']:  # Skip rows marked for deletion
-                    original_row = df_vehicles.loc[df_vehicles['carro_ID'] == row['carro_ID']].iloc[0]
-                    
-                    if (row['modelo_carro'] != original_row['modelo_carro'] or
-                        row['montadora'] != original_row['montadora'] or
-                        row['placa'] != original_row['placa'] or
-                        row['combustivel'] != original_row['combustivel'] or
-                        row['ano'] != original_row['ano']):
-                        
-                        update_data = {
-                            "modelo_carro": row['modelo_carro'],
-                            "montadora": row['montadora'],
-                            "placa": row['placa'],
-                            "combustivel": row['combustivel'],
-                            "ano": int(row['ano']),
-                            "Customer_ID": row['Customer_ID']
-                        }
-                        
-                        update_response = api_client.put(
-                            f"/api/carros/{row['carro_ID']}/",
-                            json=update_data
-                        )
-                        
-                        if update_response.status_code in [200, 201]:
-                            changes_made = True
-                            st.success(f"Veículo {row['modelo_carro']} - {row['placa']} atualizado com sucesso!")
-                        else:
-                            st.error(f"Falha ao atualizar veículo {row['modelo_carro']} - {row['placa']}")
-            
-            if changes_made:
+            upserts, deletes = collect_editor_changes(
+                edited_vehicles, df_vehicles, "carro_ID", ["modelo_carro", "montadora", "placa", "combustivel", "ano"]
+            )
+            if save_changes("/api/carros/", upserts, deletes):
                 st.rerun()  # Refresh the page
     else:
         st.info("Nenhum veículo cadastrado.")
@@ -332,43 +280,10 @@ with tab3:
         )
         
         if st.button("Salvar Alterações", key="save_mechanics"):
-            changes_made = False
-            
-            for idx, row in edited_mechanics.iterrows():
-                if row['delete']:
-                    delete_response = api_client.delete(f"/api/mecanicos/{row['mecanico_ID']}/")
-                    if delete_response.status_code == 204:
-                        changes_made = True
-                        st.success(f"Mecânico {row['nome']} excluído com sucesso!")
-                    else:
-                        st.error(f"Falha ao excluir mecânico {row['nome']}")
-            
-            for idx, row in edited_mechanics.iterrows():
-                if not row['delete']:  # Skip rows marked for deletion
-                    original_row = df_mechanics.loc[df_mechanics['mecanico_ID'] == row['mecanico_ID']].iloc[0]
-                    
-                    if (row['nome'] != original_row['nome'] or
-                        row['telefone'] != original_row['telefone'] or
-                        row['email'] != original_row['email']):
-                        
-                        update_data = {
-                            "nome": row['nome'],
-                            "telefone": row['telefone'],
-                            "email": row['email']
-                        }
-                        
-                        update_response = api_client.put(
-                            f"/api/mecanicos/{row['mecanico_ID']}/",
-                            json=update_data
-                        )
-                        
-                        if update_response.status_code in [200, 201]:
-                            changes_made = True
-                            st.success(f"Mecânico {row['nome']} atualizado com sucesso!")
-                        else:
-                            st.error(f"Falha ao atualizar mecânico {row['nome']}")
-            
-            if changes_made:
+            upserts, deletes = collect_editor_changes(
+                edited_mechanics, df_mechanics, "mecanico_ID", ["nome", "telefone", "email"]
+            )
+            if save_changes("/api/mecanicos/", upserts, deletes):
                 st.rerun()  # Refresh the page
     else:
         st.info("Nenhum mecânico cadastrado.")
\ No newline at end of file
@@ -158,111 +158,95 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def fetch_list(endpoint):
+    try:
+        return api_client.get_all(endpoint)
+    except requests.RequestException:
+        return []
+
 @st.cache_data(ttl=300)
 def fetch_all_data():
-    servicos = api_client.get("/api/servicos/").json() if api_client.get("/api/servicos/").status_code == 200 else []
-    
-    clientes = api_client.get("/api/clientes/").json() if api_client.get("/api/clientes/").status_code == 200 else []
-    clientes_dict = {c["cliente_ID"]: c for c in clientes}
-    
-    carros = api_client.get("/api/carros/").json() if api_client.get("/api/carros/").status_code == 200 else []
-    carros_dict = {c["carro_ID"]: c for c in carros}
-    
-    mecanicos = api_client.get("/api/mecanicos/").json() if api_client.get("/api/mecanicos/").status_code == 200 else []
-    mecanicos_dict = {m["mecanico_ID"]: m for m in mecanicos}
-    
-    status = api_client.get("/api/status/").json() if api_client.get("/api/status/").status_code == 200 else []
-    
-    insumos = api_client.get("/api/insumos/").json() if api_client.get("/api/insumos/").status_code == 200 else []
-    
-    pagamentos = api_client.get("/api/pagamentos/").json() if api_client.get("/api/pagamentos/").status_code == 200 else []
+    data = api_client.bootstrap({
+        "servicos": "/api/servicos/",
+        "clientes": "/api/clientes/",
+        "carros": "/api/carros/",
+        "mecanicos": "/api/mecanicos/",
+        # Only the most recent entries are rendered; per-service history is fetched on demand
+        "status": {"endpoint": "/api/status/", "params": {"page_size": 20}, "max_pages": 1},
+        "insumos": "/api/insumos/",
+        "pagamentos": "/api/pagamentos/",
+    })
+    
+    servicos = data["servicos"]
+    clientes_dict = {c["cliente_ID"]: c for c in data["clientes"]}
+    carros_dict = {c["carro_ID"]: c for c in data["carros"]}
+    mecanicos_dict = {m["mecanico_ID"]: m for m in data["mecanicos"]}
+    status = data["status"]
+    insumos = data["insumos"]
+    pagamentos = data["pagamentos"]
     
     return servicos, clientes_dict, carros_dict, mecanicos_dict, status, insumos, pagamentos
 
-def create_kanban_board(services, clients_dict, cars_dict, mechanics_dict, statuses):
-    status_groups = {}
-    for status in STATUS_MAPPING.keys():
-        status_groups[status] = []
-    
-    for service in services:
-
-        if 'status_atual' in service:
-            status = service.get('status_atual', 'Cadastrado')
-        else:
-    
-            service_id = service.get('servico_ID')
-            service_statuses = [s for s in statuses if s.get('servico_ID') == service_id]
-            if service_statuses:
-        
-                try:
-                    service_statuses.sort(key=lambda x: x.get('data_atualizacao', ''), reverse=True)
-                    status = service_statuses[0].get('status', 'Cadastrado')
-                except:
-                    status = 'Cadastrado'
-            else:
-                status = 'Cadastrado'
-        
-        if status not in status_groups:
-            status = 'Cadastrado'  # Default status
-        
-
-        client_id = service.get("cliente_ID")
-        client_name = clients_dict.get(client_id, {}).get("nome", "Unknown")
-        
+@st.cache_data(ttl=300)
+def fetch_services_frame():
+    """Services as a DataFrame, transferred in a columnar format (Arrow when available)"""
+    return api_client.get_frame("/api/servicos/")
 
-        car_id = service.get("carro_ID")
-        car = cars_dict.get(car_id, {})
-        car_info = f"{car.get('montadora', '')} {car.get('modelo_carro', '')} - {car.get('placa', '')}"
-        
+def fetch_kanban_board():
+    """
+    Fetch the server-built kanban board. The last board and its ETag are kept in the
+    session, so an unchanged board costs a single 304 response.
+    """
+    cached = st.session_state.get("kanban_cache")
+    headers = {"If-None-Match": cached["etag"]} if cached else None
+    
+    try:
+        response = api_client.get("/api/servicos/kanban/", headers=headers)
+    except requests.RequestException:
+        return cached["board"] if cached else None
+    
+    if response.status_code == 304 and cached:
+        return cached["board"]
+    if response.status_code == 200:
+        board = response.json()
+        st.session_state.kanban_cache = {"etag": response.headers.get("ETag"), "board": board}
+        return board
+    return cached["board"] if cached else None
 
-        mechanic_id = service.get("mecanico_ID")
-        mechanic_name = mechanics_dict.get(mechanic_id, {}).get("nome", "Unassigned")
-        
+def allowed_transitions(current_status):
+    """Statuses the service can move to, as published by the backend with the kanban board"""
+    board = (st.session_state.get("kanban_cache") or {}).get("board") or fetch_kanban_board() or {}
+    return board.get("transicoes", {}).get(current_status, [])
 
-        entry_date = service.get("data_entrada", "")
-        exit_date = service.get("data_saida", "")
-        
+SEARCH_RESULTS_LIMIT = 100
 
-        try:
-            days_in_service = (datetime.strptime(exit_date, "%Y-%m-%d") - 
-                              datetime.strptime(entry_date, "%Y-%m-%d")).days
-            
-    
-            days_remaining = (datetime.strptime(exit_date, "%Y-%m-%d") - 
-                             datetime.now()).days
-            
-    
-            if days_remaining < 0:
-                urgency = "overdue" 
-            elif days_remaining < 2:
-                urgency = "urgent"
-            elif days_remaining < 5:
-                urgency = "soon"
-            else:
-                urgency = "normal"
-        except:
-            days_in_service = "N/A"
-            days_remaining = "N/A"
-            urgency = "unknown"
-        
+def search_kanban_cards(status_groups, search):
+    """
+    Ranked server-side search (/api/search/servicos/) grouped into the board columns.
+    Falls back to filtering the cards already on the board if the API is unreachable.
+    """
+    try:
+        response = api_client.get("/api/search/servicos/", params={"q": search, "limit": SEARCH_RESULTS_LIMIT})
+        response.raise_for_status()
+    except requests.RequestException:
+        return filter_kanban_cards(status_groups, search)
+    
+    groups = {status: [] for status in status_groups}
+    for card in response.json()["results"]:
+        groups.setdefault(card["status"], []).append(card)
+    return groups
 
-        status_groups[status].append({
-            "id": str(service.get("servico_ID", "")),
-            "title": f"OS #{service.get('servico_ID', '')}",
-            "status": status,
-            "client": client_name,
-            "car": car_info,
-            "mechanic": mechanic_name,
-            "entry_date": entry_date,
-            "exit_date": exit_date,
-            "days": days_in_service,
-            "days_remaining": days_remaining,
-            "urgency": urgency,
-            "diagnostico": service.get("diagnostico", ""),
-            "service_description": service.get("descricao_servico", "")
-        })
-    
-    return status_groups
+def filter_kanban_cards(status_groups, search):
+    """Filter the already denormalized cards by client, mechanic, car or description"""
+    search_lower = search.lower()
+    return {
+        status: [
+            card for card in cards
+            if any(search_lower in str(card.get(field, "")).lower()
+                   for field in ("client", "mechanic", "car", "service_description", "diagnostico"))
+        ]
+        for status, cards in status_groups.items()
+    }
 
 def display_kanban_columns(status_groups):
     column_statuses = [
@@ -371,6 +355,9 @@ def show_service_details(service_id, services, clients_dict, cars_dict, mechanic
     car = cars_dict.get(car_id, {})
     mechanic = mechanics_dict.get(mechanic_id, {})
     
+    # Chronological timeline, read by the backend from the (servico, timestamp) index
+    service_statuses = fetch_list(f"/api/servicos/{service.get('servico_ID')}/historico/")
+    
     # Get address data if it's a home service
     api_client = APIClient()
     service_address = None
@@ -569,9 +556,9 @@ def show_service_details(service_id, services, clients_dict, cars_dict, mechanic
             
             new_status = st.selectbox(
                 "Novo Status",
-                options=list(STATUS_MAPPING.keys()),
-                index=list(STATUS_MAPPING.keys()).index(current_status),
-                format_func=lambda x: f"{STATUS_MAPPING.get(x, '📋')} {x}"
+                options=allowed_transitions(current_status),
+                format_func=lambda x: f"{STATUS_MAPPING.get(x, '📋')} {x}",
+                placeholder="Nenhuma mudança de status disponível"
             )
             
             status_note = st.text_area(
@@ -583,7 +570,7 @@ def show_service_details(service_id, services, clients_dict, cars_dict, mechanic
             submit_btn = st.form_submit_button("Atualizar Status", use_container_width=True)
             
             if submit_btn:
-                success, message = update_service_status(service_id, new_status, status_note)
+                success, message = update_service_status(service_id, new_status, status_note, current_status)
                 if success:
                     st.success("Status atualizado com sucesso!")
                     time.sleep(1)
@@ -592,39 +579,29 @@ def show_service_details(service_id, services, clients_dict, cars_dict, mechanic
                     st.error(f"Falha ao atualizar status: {message}")
 
 # Function to update service status
-def update_service_status(service_id, new_status, note=None):
-    status_data = {
-        "servico_ID": service_id,
+def update_service_status(service_id, new_status, note=None, current_status=None):
+    """
+    Move a service to a new status with one request. The backend validates the move,
+    records the history event and updates the service in a single transaction.
+    """
+    payload = {
         "status": new_status,
-        "data_atualizacao": datetime.now().strftime("%Y-%m-%d"),
-        "observacao": note or f"Status changed to {new_status}"
+        "observacao": note or f"Status changed to {new_status}",
     }
-    
-    status_response = api_client.post("/api/status/", json=status_data)
-    
-    if status_response.status_code == 201:
-
-
-        try:
-    
-            service_response = api_client.get(f"/api/servicos/{service_id}/")
-            if service_response.status_code == 200:
-                service_data = service_response.json()
-        
-                service_data["status_atual"] = new_status
-        
-                update_response = api_client.post(f"/api/servicos/{service_id}/update/", json=service_data)
-                if update_response.status_code in [200, 201, 204]:
-                    return True, "Status updated successfully"
-            
-    
-    
-            return True, "Status history recorded (service update may be pending)"
-        except:
-    
-            return True, "Status history recorded but service update failed"
-    else:
-        return False, f"Failed to update status: {status_response.text}"
+    if current_status:
+        payload["status_atual"] = current_status
+    
+    try:
+        response = api_client.post(f"/api/servicos/{service_id}/transition/", json=payload)
+    except requests.RequestException as e:
+        return False, f"Failed to update status: {e}"
+    
+    if response.status_code == 200:
+        return True, "Status updated successfully"
+    try:
+        return False, response.json().get("error", response.text)
+    except ValueError:
+        return False, response.text
 
 # Status update view
 def show_status_update(service_id, current_status):
@@ -633,9 +610,9 @@ def show_status_update(service_id, current_status):
     
     new_status = st.selectbox(
         "Selecione o novo status",
-        options=list(STATUS_MAPPING.keys()),
-        index=list(STATUS_MAPPING.keys()).index(current_status),
-        format_func=lambda x: f"{STATUS_MAPPING.get(x, '📋')} {x}"
+        options=allowed_transitions(current_status),
+        format_func=lambda x: f"{STATUS_MAPPING.get(x, '📋')} {x}",
+        placeholder="Nenhuma mudança de status disponível"
     )
     
     note = st.text_area("Observação", 
@@ -652,7 +629,7 @@ def show_status_update(service_id, current_status):
     
     with col2:
         if st.button("Confirmar", type="primary", use_container_width=True):
-            success, message = update_service_status(service_id, new_status, note)
+            success, message = update_service_status(service_id, new_status, note, current_status)
             if success:
                 st.success(message)
                 time.sleep(1)
@@ -669,8 +646,18 @@ def show_dashboard(services, clients_dict, cars_dict, mechanics_dict, statuses):
     if not services:
         st.info("Nenhuma ordem de serviço disponível para análise.")
         return
+    
+    # Full history downloads stream from the API instead of going through this page
+    col_csv, col_ndjson, _ = st.columns([1, 1, 3])
+    with col_csv:
+        st.link_button("Exportar serviços (CSV)", api_client.export_url("/api/servicos/"))
+    with col_ndjson:
+        st.link_button("Exportar serviços (NDJSON)", api_client.export_url("/api/servicos/", "ndjson"))
         
-    services_df = pd.DataFrame(services)
+    try:
+        services_df = fetch_services_frame()
+    except requests.RequestException:
+        services_df = pd.DataFrame(services)
     
     if 'status_atual' not in services_df.columns:
 
@@ -814,62 +801,20 @@ def show_dashboard(services, clients_dict, cars_dict, mechanics_dict, statuses):
     
     with tab3:
 
-        status_df = pd.DataFrame(statuses)
-        
-        if not status_df.empty:
-    
-            print(f"Status DataFrame columns: {status_df.columns.tolist()}")
-            
-    
-            servico_id_field = None
-            for possible_field in ['servico_ID', 'servico', 'id', 'servico_id']:
-                if possible_field in status_df.columns:
-                    servico_id_field = possible_field
-                    print(f"Found service ID field: {servico_id_field}")
-                    break
-            
-    
-            if not servico_id_field:
-                st.warning("Campo ID do serviço não encontrado nos dados de status.")
-                status_df['servico_ID'] = "N/A"
-                servico_id_field = 'servico_ID'
-            
-    
-            if 'data_atualizacao' in status_df.columns:
-                status_df = status_df.sort_values(by='data_atualizacao', ascending=False)
-            
-    
-            status_df['servico_ID_str'] = status_df[servico_id_field].astype(str)
-            
-    
-            recent_status = status_df.head(20)
-            
-    
-            if 'status' in recent_status.columns:
-                recent_status['status_icon'] = recent_status['status'].apply(
-                    lambda x: STATUS_MAPPING.get(x, '📋')
-                )
-            else:
-                recent_status['status_icon'] = '📋'
-                st.warning("Campo 'status' não encontrado nos dados.")
-            
-    
-            for _, row in recent_status.iterrows():
-                service_id = row['servico_ID_str']
+        # The status feed is append-only and returned newest first, so no sorting or field guessing is needed
+        if statuses:
+            for row in statuses[:20]:
                 status_text = row.get('status', 'Desconhecido')
-                status_icon = row.get('status_icon', '📋')
-                observacao = row.get('observacao', '')
-                date = row.get('data_atualizacao', 'Data desconhecida')
                 
                 with st.container(border=True):
                     cols = st.columns([1, 2, 3])
                     with cols[0]:
-                        st.markdown(f"**OS #{service_id}**")
-                        st.markdown(f"{date}")
+                        st.markdown(f"**OS #{row.get('servico_ID')}**")
+                        st.markdown(f"{row.get('data_atualizacao', 'Data desconhecida')}")
                     with cols[1]:
-                        st.markdown(f"**{status_icon} {status_text}**")
+                        st.markdown(f"**{STATUS_MAPPING.get(status_text, '📋')} {status_text}**")
                     with cols[2]:
-                        st.markdown(f"{observacao}")
+                        st.markdown(f"{row.get('observacao', '')}")
         else:
             st.info("Nenhum histórico de status disponível.")
     
@@ -886,11 +831,8 @@ def show_new_service_form(clients_dict, cars_dict, mechanics_dict):
     
     # Fetch addresses data outside the form
     api_client = APIClient()
-    addresses_response = api_client.get("/api/enderecos/")
-    addresses_dict = {}
-    if addresses_response.status_code == 200:
-        addresses_data = addresses_response.json()
-        addresses_dict = {addr['endereco_ID']: addr for addr in addresses_data}
+    addresses_data = fetch_list("/api/enderecos/")
+    addresses_dict = {addr['endereco_ID']: addr for addr in addresses_data}
     
     # Initialize session state for form data
     if 'form_client_selection' not in st.session_state:
@@ -919,9 +861,8 @@ def show_new_service_form(clients_dict, cars_dict, mechanics_dict):
         client_id = int(client_selection.split("ID: ")[1].rstrip(")"))
         
         client_cars = [
-            {"id": k, "info": f"{v.get('montadora', '')} {v.get('modelo_carro', '')} - {v.get('placa', '')}"}
-            for k, v in cars_dict.items() 
-            if v.get("Customer_ID") == client_id or v.get("cliente_ID") == client_id
+            {"id": c["carro_ID"], "info": f"{c.get('montadora', '')} {c.get('modelo_carro', '')} - {c.get('placa', '')}"}
+            for c in fetch_list(f"/api/carros/?cliente={client_id}")
         ]
         
         if client_cars:
@@ -1016,16 +957,14 @@ def show_new_service_form(clients_dict, cars_dict, mechanics_dict):
             if new_address_data.get('cep') and len(new_address_data['cep']) == 8:
                 if st.button("Buscar CEP", type="secondary", key="buscar_cep"):
                     try:
-                        response = requests.get(f"https://viacep.com.br/ws/{new_address_data['cep']}/json/")
-                        if response.status_code == 200:
-                            address_data = response.json()
-                            if 'erro' not in address_data:
-                                st.success("CEP encontrado! Atualize a página para ver os dados preenchidos.")
-                                # Store in session state for next render
-                                st.session_state.cep_data = address_data
-                            else:
-                                st.error("CEP não encontrado.")
-                    except Exception as e:
+                        address_data = api_client.lookup_cep(new_address_data['cep'])
+                        if address_data:
+                            st.success("CEP encontrado! Atualize a página para ver os dados preenchidos.")
+                            # Store in session state for next render
+                            st.session_state.cep_data = address_data
+                        else:
+                            st.error("CEP não encontrado.")
+                    except requests.RequestException as e:
                         st.error(f"Erro ao buscar CEP: {str(e)}")
             
             # Use CEP data if available
@@ -1107,80 +1046,51 @@ def show_new_service_form(clients_dict, cars_dict, mechanics_dict):
                 st.error("Por favor, preencha todos os campos obrigatórios do novo endereço.")
             else:
                 # Process the form submission
-                service_address_id = selected_address_id
-                
-                # Handle new address creation if needed
-                if current_home_service and 'address_selector' in st.session_state and st.session_state.address_selector == "Cadastrar novo endereço...":
-                    address_response = api_client.post("/api/enderecos/", json=new_address_data)
-                    if address_response.status_code == 201:
-                        address_data = address_response.json()
-                        service_address_id = address_data.get("endereco_ID") or address_data.get("id")
-                    else:
-                        st.error(f"Falha ao criar novo endereço: {address_response.text}")
-                        st.stop()
-                
-                # Continue with service creation
                 client_id = int(current_client.split("ID: ")[1].rstrip(")"))
                 car_id = int(car_selection.split("ID: ")[1].rstrip(")"))
                 mechanic_id = int(mechanic_selection.split("ID: ")[1].rstrip(")"))
                 
-                # Create payment record
-                payment_data = {
-                    "valor_final": orcamento,
-                    "valor_total": valor_total,
-                    "metodo_pagamento": payment_method,
-                    "status": payment_status
+                # Payment, optional new address, service and first status event are
+                # created by the API in a single transaction
+                order_data = {
+                    "cliente": client_id,
+                    "carro": car_id,
+                    "mecanico": mechanic_id,
+                    "diagnostico": diagnostico,
+                    "descricao_servico": descricao_servico,
+                    # Money fields are fixed-point with two places on the API
+                    "orcamento": round(orcamento, 2),
+                    "data_entrada": entry_date.strftime("%Y-%m-%d"),
+                    "data_saida": exit_date.strftime("%Y-%m-%d"),
+                    "status_atual": initial_status,
+                    "home_service": current_home_service,
+                    "pagamento": {
+                        "valor_final": round(orcamento, 2),
+                        "valor_total": round(valor_total, 2),
+                        "metodo_pagamento": payment_method,
+                        "status": payment_status
+                    },
+                    "observacao": "Ordem de serviço criada"
                 }
+                if current_home_service:
+                    if 'address_selector' in st.session_state and st.session_state.address_selector == "Cadastrar novo endereço...":
+                        order_data["endereco"] = new_address_data
+                    else:
+                        order_data["service_address"] = selected_address_id
                 
-                payment_response = api_client.post("/api/pagamentos/", json=payment_data)
+                response = api_client.post("/api/ordens/", json=order_data)
                 
-                if payment_response.status_code == 201:
-                    payment_id = payment_response.json().get("pagamento_ID")
-                    
-                    # Create service record
-                    service_data = {
-                        "cliente": client_id,
-                        "carro": car_id,
-                        "mecanico": mechanic_id,
-                        "diagnostico": diagnostico,
-                        "descricao_servico": descricao_servico,
-                        "orcamento": orcamento,
-                        "pagamento": payment_id,
-                        "data_entrada": entry_date.strftime("%Y-%m-%d"),
-                        "data_saida": exit_date.strftime("%Y-%m-%d"),
-                        "status_atual": initial_status,
-                        "home_service": current_home_service,
-                        "service_address": service_address_id if current_home_service else None
-                    }
-                    
-                    response = api_client.post("/api/servicos/", json=service_data)
-                    
-                    if response.status_code == 201:
-                        service_id = response.json().get("servico_ID", 0)
-                        status_data = {
-                            "servico_ID": service_id,
-                            "status": initial_status,
-                            "data_atualizacao": datetime.now().strftime("%Y-%m-%d"),
-                            "observacao": "Ordem de serviço criada"
-                        }
-                        
-                        status_response = api_client.post("/api/status/", json=status_data)
-                        
-                        if status_response.status_code == 201:
-                            st.success("Ordem de serviço criada com sucesso!")
-                            # Clear session state
-                            for key in ['form_client_selection', 'form_home_service', 'form_address_selection', 'cep_data']:
-                                if key in st.session_state:
-                                    del st.session_state[key]
-                            time.sleep(1)
-                            st.session_state.current_view = "kanban"
-                            st.rerun()
-                        else:
-                            st.warning(f"Ordem criada, mas falha ao registrar status: {status_response.text}")
-                    else:
-                        st.error(f"Falha ao criar ordem de serviço: {response.text}")
+                if response.status_code == 201:
+                    st.success("Ordem de serviço criada com sucesso!")
+                    # Clear session state
+                    for key in ['form_client_selection', 'form_home_service', 'form_address_selection', 'cep_data']:
+                        if key in st.session_state:
+                            del st.session_state[key]
+                    time.sleep(1)
+                    st.session_state.current_view = "kanban"
+                    st.rerun()
                 else:
-                    st.error(f"Falha ao criar registro de pagamento: {payment_response.text}")
+                    st.error(f"Falha ao criar ordem de serviço: {response.text}")
     
     if st.button("Voltar", use_container_width=True):
         st.session_state.current_view = "kanban"
@@ -1240,47 +1150,29 @@ def main():
             search = st.text_input("🔍 Buscar por cliente, mecânico, placa ou descrição do serviço", placeholder="Digite para filtrar...")
             st.markdown('</div>', unsafe_allow_html=True)
         
-        if search:
-            filtered_services = []
-            search_lower = search.lower()
-            
-            for service in services:
+        board = fetch_kanban_board()
+        if board is None:
+            st.error("Não foi possível carregar o quadro de ordens de serviço.")
+            board = {"colunas": []}
         
-                client_name = clients_dict.get(service.get("cliente_ID", 0), {}).get("nome", "").lower()
-                mechanic_name = mechanics_dict.get(service.get("mecanico_ID", 0), {}).get("nome", "").lower()
-                car = cars_dict.get(service.get("carro_ID", 0), {})
-                car_info = f"{car.get('montadora', '')} {car.get('modelo_carro', '')} {car.get('placa', '')}".lower()
-                description = service.get("descricao_servico", "").lower()
-                diagnostico = service.get("diagnostico", "").lower()
-                
+        status_groups = {column["status"]: column["cards"] for column in board["colunas"]}
+        status_counts = {column["status"]: column["total"] for column in board["colunas"]}
         
-                if (search_lower in client_name or 
-                    search_lower in mechanic_name or
-                    search_lower in car_info or
-                    search_lower in description or
-                    search_lower in diagnostico):
-                    filtered_services.append(service)
+        if search:
+            status_groups = search_kanban_cards(status_groups, search)
+            found = sum(len(cards) for cards in status_groups.values())
             
-            if filtered_services:
-                st.success(f"Encontradas {len(filtered_services)} ordens de serviço")
-                services = filtered_services
+            if found:
+                st.success(f"Encontradas {found} ordens de serviço")
             else:
                 st.warning("Nenhuma ordem de serviço encontrada com os termos da busca")
         
-
-        if services:
-            status_counts = {}
-            for service in services:
-                status = service.get('status_atual', 'Cadastrado')
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
-            total = len(services)
+        total = sum(status_counts.values())
+        if total:
             active = sum(status_counts.get(s, 0) for s in ['Cadastrado', 'Aguardando Aprovação', 'Aprovado', 'Em Andamento'])
             
             st.markdown(f"**Total: {total} ordens | Ativas: {active} ordens**")
         
-
-        status_groups = create_kanban_board(services, clients_dict, cars_dict, mechanics_dict, statuses)
         display_kanban_columns(status_groups)
     
     elif st.session_state.current_view == "details":
@@ -1,4 +1,5 @@
 import streamlit as st
+import requests
 from utils.api_client import APIClient
 import json
 import pandas as pd
@@ -163,12 +164,16 @@ def payment_form(service):
 
 def fetch_data():
     """Fetch all necessary data for the payments page"""
-    services = api_client.get("/api/servicos/").json() if api_client.get("/api/servicos/").status_code == 200 else []
+    data = api_client.bootstrap({
+        "services": "/api/servicos/",
+        "clients": "/api/clientes/",
+        "payments": "/api/pagamentos/",
+    })
+    services = data["services"]
     
-    clients = api_client.get("/api/clientes/").json() if api_client.get("/api/clientes/").status_code == 200 else []
-    clients_dict = {c["cliente_ID"]: c for c in clients}
+    clients_dict = {c["cliente_ID"]: c for c in data["clients"]}
     
-    payments = api_client.get("/api/pagamentos/").json() if api_client.get("/api/pagamentos/").status_code == 200 else []
+    payments = data["payments"]
     payments_dict = {p["pagamento_ID"]: p for p in payments}
     
     for service in services:
@@ -270,39 +275,43 @@ def main():
         else:
             payments_df = pd.DataFrame(all_payments_data)
             st.dataframe(payments_df, use_container_width=True)
+        
+        col_csv, col_ndjson = st.columns(2)
+        with col_csv:
+            st.link_button("Exportar pagamentos (CSV)", api_client.export_url("/api/pagamentos/"))
+        with col_ndjson:
+            st.link_button("Exportar pagamentos (NDJSON)", api_client.export_url("/api/pagamentos/", "ndjson"))
     
     with tab3:
         st.header("Relatórios Financeiros")
         
 
-        total_pending = sum(s.get("orcamento", 0) for s in services if s.get("payment_status") != "Pago")
-        total_paid = sum(s.get("payment_amount", 0) for s in services if s.get("payment_status") == "Pago")
+        try:
+            response = api_client.get("/api/pagamentos/relatorio/")
+            response.raise_for_status()
+            report = response.json()
+        except requests.RequestException as e:
+            st.error(f"Erro ao carregar relatório: {e}")
+            return
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Recebido", f"R$ {total_paid:.2f}")
+            st.metric("Total Recebido", f"R$ {report['total_recebido']:.2f}")
         with col2:
-            st.metric("Pendente de Recebimento", f"R$ {total_pending:.2f}")
+            st.metric("Pendente de Recebimento", f"R$ {report['total_pendente']:.2f}")
         with col3:
-            if total_paid + total_pending > 0:
-                payment_rate = (total_paid / (total_paid + total_pending)) * 100
-                st.metric("Taxa de Recebimento", f"{payment_rate:.1f}%")
+            if report["taxa_recebimento"] is not None:
+                st.metric("Taxa de Recebimento", f"{report['taxa_recebimento']:.1f}%")
             else:
                 st.metric("Taxa de Recebimento", "N/A")
         
 
         st.subheader("Distribuição por Método de Pagamento")
         
-        payment_methods = {}
-        for service in services:
-            if service.get("payment_status") == "Pago":
-                method = service.get("payment_method", "Não informado")
-                payment_methods[method] = payment_methods.get(method, 0) + service.get("payment_amount", 0)
-        
-        if payment_methods:
+        if report["por_metodo"]:
             methods_df = pd.DataFrame({
-                "Método": list(payment_methods.keys()),
-                "Valor": list(payment_methods.values())
+                "Método": [row["metodo"] or "Não informado" for row in report["por_metodo"]],
+                "Valor": [row["total"] for row in report["por_metodo"]]
             })
             
     
@@ -315,25 +324,10 @@ def main():
 
         st.subheader("Receita Mensal")
         
-
-        monthly_revenue = {}
-        for service in services:
-            if service.get("payment_status") == "Pago":
-                try:
-                    date_str = service.get("data_entrada", "")
-                    if date_str:
-                        date = datetime.strptime(date_str, "%Y-%m-%d")
-                        month_key = f"{date.year}-{date.month:02d}"
-                        monthly_revenue[month_key] = monthly_revenue.get(month_key, 0) + service.get("payment_amount", 0)
-                except:
-                    pass
-        
-        if monthly_revenue:
-    
-            sorted_months = sorted(monthly_revenue.keys())
+        if report["receita_mensal"]:
             revenue_df = pd.DataFrame({
-                "Mês": [f"{m.split('-')[0]}-{m.split('-')[1]}" for m in sorted_months],
-                "Receita": [monthly_revenue[m] for m in sorted_months]
+                "Mês": [row["mes"][:7] for row in report["receita_mensal"]],
+                "Receita": [row["receita"] for row in report["receita_mensal"]]
             })
             
     
@@ -1,33 +1,210 @@
 import requests
 import streamlit as st
 import os
+import threading
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+COLUMNAR_MEDIA_TYPE = "application/vnd.mecstock.columnar+json"
+# Server-side cap on ?page_size= (MecStockCursorPagination.max_page_size); full-list
+# helpers ask for it so a list takes N/1000 requests instead of N/100
+MAX_PAGE_SIZE = 1000
+
+# Validators and bodies of ETag-tagged GET responses, shared by every APIClient in the
+# process so they survive Streamlit reruns (each rerun builds a new client)
+VALIDATOR_CACHE_SIZE = 256
+_validator_cache = OrderedDict()
+_validator_lock = threading.Lock()
 
 class APIClient:
     def __init__(self):
         self.base_url = os.getenv("API_URL", "http://localhost:8000")
-        self.session = requests.Session()
-    
-    def get(self, endpoint, params=None):
-        return self.session.get(f"{self.base_url}{endpoint}", params=params)
-    
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        """
+        The calling thread's requests.Session. Session is not documented as thread-safe,
+        so bootstrap's worker threads each get their own instead of sharing one.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def get(self, endpoint, params=None, headers=None):
+        return self.conditional_get(f"{self.base_url}{endpoint}", params=params, headers=headers)
+
+    def conditional_get(self, url, params=None, headers=None):
+        """
+        GET that revalidates with If-None-Match when an earlier response carried an ETag.
+        A 304 is answered from the local cache, so unchanged data costs only headers.
+        Callers that send their own If-None-Match get the raw response untouched.
+        """
+        headers = dict(headers or {})
+        if "If-None-Match" in headers:
+            return self.session.get(url, params=params, headers=headers)
+        
+        # The same URL can be negotiated into different formats
+        key = (requests.Request("GET", url, params=params).prepare().url, headers.get("Accept"))
+        with _validator_lock:
+            cached = _validator_cache.get(key)
+        if cached:
+            headers["If-None-Match"] = cached.headers["ETag"]
+        
+        response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            with _validator_lock:
+                _validator_cache.move_to_end(key)
+            return cached
+        if response.status_code == 200 and response.headers.get("ETag"):
+            with _validator_lock:
+                _validator_cache[key] = response
+                _validator_cache.move_to_end(key)
+                while len(_validator_cache) > VALIDATOR_CACHE_SIZE:
+                    _validator_cache.popitem(last=False)
+        return response
+
+    def get_all(self, endpoint, params=None, max_pages=None):
+        """
+        Fetch every page (or the first max_pages) of a cursor-paginated list endpoint
+        and return the combined results. Raises requests.HTTPError if any page fails.
+        """
+        return _collect_pages(self.conditional_get, f"{self.base_url}{endpoint}", params, max_pages)
+
+    def get_frame(self, endpoint, params=None, max_pages=None):
+        """
+        Fetch every page (or the first max_pages) of a list endpoint straight into a
+        DataFrame. Pages come as Arrow IPC when pyarrow is available (and the API
+        offers it), otherwise as columnar JSON; either way no per-row dicts are built.
+        Raises requests.HTTPError if any page fails.
+        """
+        accept = ARROW_MEDIA_TYPE if pa is not None else COLUMNAR_MEDIA_TYPE
+        url = f"{self.base_url}{endpoint}"
+        params = _with_page_size(params)
+        pages, tables, frames = 0, [], []
+        while url and (max_pages is None or pages < max_pages):
+            response = self.conditional_get(url, params=params, headers={"Accept": accept})
+            if response.status_code == 406 and accept == ARROW_MEDIA_TYPE and not pages:
+                accept = COLUMNAR_MEDIA_TYPE
+                continue
+            response.raise_for_status()
+            if accept == ARROW_MEDIA_TYPE:
+                table = pa.ipc.open_stream(response.content).read_all()
+                tables.append(table)
+                url = (table.schema.metadata or {}).get(b"next", b"").decode() or None
+            else:
+                page = response.json()
+                frames.append(pd.DataFrame(page["data"], columns=page["columns"]))
+                url = page.get("next")
+            # The "next" link already carries the cursor and the original query string
+            params = None
+            pages += 1
+        
+        if tables:
+            # Pages can infer different types for all-null columns; promote them when combining
+            table = pa.concat_tables(tables, promote_options="default")
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        if frames:
+            return pd.concat(frames, ignore_index=True)
+        return pd.DataFrame()
+
+    def bootstrap(self, endpoints, max_workers=8):
+        """
+        Fetch several list endpoints concurrently, issuing each one exactly once.
+
+        endpoints maps a name to either an endpoint path or a dict of get_all keyword
+        arguments, e.g. {"servicos": "/api/servicos/", "status": {"endpoint": "/api/status/", "max_pages": 1}}.
+        Returns a dict with the same keys holding the parsed results; an endpoint that
+        fails yields an empty list so one slow or broken resource doesn't sink the page.
+        """
+        def fetch(spec):
+            kwargs = {"endpoint": spec} if isinstance(spec, str) else spec
+            try:
+                return self.get_all(**kwargs)
+            except requests.RequestException:
+                return []
+
+        workers = max(1, min(max_workers, len(endpoints)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(fetch, spec) for name, spec in endpoints.items()}
+            return {name: future.result() for name, future in futures.items()}
+
     def post(self, endpoint, json=None, data=None):
         return self.session.post(f"{self.base_url}{endpoint}", json=json, data=data)
-    
+
     def put(self, endpoint, json=None, data=None):
         return self.session.put(f"{self.base_url}{endpoint}", json=json, data=data)
-    
+
     def delete(self, endpoint):
         return self.session.delete(f"{self.base_url}{endpoint}")
 
+    def lookup_cep(self, cep, timeout=5):
+        """
+        Address for a CEP via the backend's local CEP table (ViaCEP field names).
+        Returns None when the CEP doesn't exist; raises requests.RequestException on
+        network errors or when the backend can't reach its upstream service.
+        """
+        response = self.session.get(f"{self.base_url}/api/cep/{cep}/", timeout=timeout)
+        if response.status_code in (400, 404):
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    def export_url(self, endpoint, formato="csv", **params):
+        """
+        URL of a streaming export (<endpoint>export/). Hand it to the browser, e.g. with
+        st.link_button, so the file goes straight from the API to the user without
+        being buffered in the Streamlit process.
+        """
+        params = {"formato": formato, **params}
+        return requests.Request("GET", f"{self.base_url}{endpoint}export/", params=params).prepare().url
+
+    def bulk(self, endpoint, upserts=None, deletes=None):
+        """Send creates/updates and deletes for a resource in one transactional request"""
+        return self.post(f"{endpoint}bulk/", json={"upserts": upserts or [], "deletes": deletes or []})
+
+def _with_page_size(params):
+    """Request the largest page the API allows unless the caller chose a page_size"""
+    return {"page_size": MAX_PAGE_SIZE, **(params or {})}
+
+def _collect_pages(get, url, params=None, max_pages=None):
+    params = _with_page_size(params)
+    results = []
+    pages = 0
+    while url and (max_pages is None or pages < max_pages):
+        response = get(url, params=params)
+        response.raise_for_status()
+        page = response.json()
+        if isinstance(page, list):
+            return page
+        results.extend(page.get("results", []))
+        pages += 1
+        # The "next" link already carries the cursor and the original query string
+        url = page.get("next")
+        params = None
+    return results
+
 BASE_URL = "http://localhost:8000/api"
 
+def _get_list(endpoint):
+    try:
+        return _collect_pages(requests.get, f"{BASE_URL}{endpoint}")
+    except requests.RequestException:
+        return None
+
 def get_clientes():
-    response = requests.get(f"{BASE_URL}/clientes/")
-    return response.json() if response.status_code == 200 else None
+    return _get_list("/clientes/")
 
 def get_carros():
-    response = requests.get(f"{BASE_URL}/carros/")
-    return response.json() if response.status_code == 200 else None
+    return _get_list("/carros/")
 
 def create_servico(data):
     response = requests.post(f"{BASE_URL}/servicos/", json=data)
@@ -42,13 +219,11 @@ def delete_servico(servico_id):
     return response.status_code == 204
 
 def get_pagamentos():
-    response = requests.get(f"{BASE_URL}/pagamentos/")
-    return response.json() if response.status_code == 200 else None
+    return _get_list("/pagamentos/")
 
 def create_pagamento(data):
     response = requests.post(f"{BASE_URL}/pagamentos/", json=data)
     return response.json() if response.status_code == 201 else None
 
 def get_mecanicos():
-    response = requests.get(f"{BASE_URL}/mecanicos/")
-    return response.json() if response.status_code == 200 else None
\ No newline at end of file
+    return _get_list("/mecanicos/")
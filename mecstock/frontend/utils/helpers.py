@@ -19,4 +19,27 @@ def validate_email(email):
     return re.match(email_regex, email) is not None
 
 def format_date(date):
-    return date.strftime("%d/%m/%Y") if date else "N/A"
\ No newline at end of file
+    return date.strftime("%d/%m/%Y") if date else "N/A"
+
+def to_json_value(value):
+    """Convert numpy/pandas scalars coming from a DataFrame into plain Python values"""
+    return value.item() if hasattr(value, 'item') else value
+
+def collect_editor_changes(edited_df, original_df, pk, fields, delete_column='delete'):
+    """
+    Diff an st.data_editor result against the DataFrame it was built from.
+    Returns (upserts, deletes): partial updates holding only the changed fields, and the
+    primary keys of rows marked for deletion, ready for a single /bulk/ request.
+    """
+    originals = original_df.set_index(pk)
+    upserts, deletes = [], []
+    for _, row in edited_df.iterrows():
+        row_id = to_json_value(row[pk])
+        if row.get(delete_column, False):
+            deletes.append(row_id)
+            continue
+        original_row = originals.loc[row[pk]]
+        changed = {field: to_json_value(row[field]) for field in fields if row[field] != original_row[field]}
+        if changed:
+            upserts.append({pk: row_id, **changed})
+    return upserts, deletes